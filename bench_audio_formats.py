@@ -0,0 +1,76 @@
+import sys
+import os
+import glob
+import tempfile
+import time
+
+import numpy as np
+import soundfile as sf
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
+
+# (label, extension, format, subtype)
+FORMATS = [
+    ("WAV PCM_16", ".wav", "WAV", "PCM_16"),
+    ("FLAC", ".flac", "FLAC", "PCM_16"),
+    ("Ogg Vorbis", ".ogg", "OGG", "VORBIS"),
+    ("Ogg Opus", ".opus", "OGG", "OPUS"),
+]
+
+def synthetic_phrase(samplerate=22050, seconds=2.0):
+    """Speech-like test signal: a gliding harmonic tone with syllable envelope and noise."""
+    t = np.arange(int(samplerate * seconds)) / samplerate
+    f0 = 120 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / samplerate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 3 * t), 0, None)
+    rng = np.random.default_rng(0)
+    signal = 0.3 * voiced * envelope + 0.02 * rng.standard_normal(len(t))
+    return (signal / np.max(np.abs(signal)) * 0.8).astype(np.float32)
+
+def load_inputs(paths):
+    if not paths:
+        return [(synthetic_phrase(), 22050)]
+    inputs = []
+    for path in paths:
+        data, sr = sf.read(path, dtype="float32", always_2d=True)
+        inputs.append((data.mean(axis=1), sr))
+    return inputs
+
+def bench(inputs, repeats=20):
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'Format':<12} {'Size (KiB)':>11} {'Ratio':>7} {'Decode (ms)':>12}")
+        baseline = None
+        for label, ext, fmt, subtype in FORMATS:
+            total_bytes = 0
+            paths = []
+            try:
+                for i, (samples, sr) in enumerate(inputs):
+                    if subtype == "OPUS" and sr not in (8000, 12000, 16000, 24000, 48000):
+                        # Opus only supports these rates
+                        from aussprachetrainer.playback import resample_linear
+                        samples, sr = resample_linear(samples, sr, 48000), 48000
+                    path = os.path.join(tmp, f"{i}{ext}")
+                    sf.write(path, samples, sr, format=fmt, subtype=subtype)
+                    total_bytes += os.path.getsize(path)
+                    paths.append(path)
+            except Exception as e:
+                print(f"{label:<12} unsupported by this libsndfile ({e})")
+                continue
+
+            start = time.perf_counter()
+            for _ in range(repeats):
+                for path in paths:
+                    sf.read(path, dtype="float32")
+            decode_ms = (time.perf_counter() - start) * 1000 / (repeats * len(paths))
+
+            baseline = baseline or total_bytes
+            print(f"{label:<12} {total_bytes / 1024:>11.1f} {total_bytes / baseline:>7.2f} {decode_ms:>12.2f}")
+
+if __name__ == "__main__":
+    # Usage: python bench_audio_formats.py [audio files...]
+    # Without arguments, try the persistent history audio, else a synthetic phrase.
+    files = sys.argv[1:] or sorted(glob.glob(os.path.expanduser("~/.local/share/aussprachetrainer/audio/*.wav")))[:200]
+    print(f"Benchmarking {len(files) or 'synthetic'} input(s)")
+    bench(load_inputs(files))
@@ -0,0 +1,74 @@
+import sys
+import os
+import argparse
+import tempfile
+import time
+
+# Add src to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
+
+from aussprachetrainer.kokoro_engine import MODEL_FILE, VOICES_FILE, kokoro_class
+from aussprachetrainer.onnx_session import SessionSettings, create_session
+
+PHRASES = [
+    "Guten Morgen, wie geht es Ihnen?",
+    "Die Aussprache des Buchstabens R ist in Österreich anders als in Norddeutschland.",
+    "Eichhörnchen",
+]
+
+def settings_grid(cores: int):
+    threads = sorted({1, max(1, cores // 2), cores})
+    for level in ("basic", "extended", "all"):
+        for intra in threads:
+            yield SessionSettings(intra_op_threads=intra, inter_op_threads=1, graph_optimization=level)
+
+def time_load(model_path: str, settings: SessionSettings, cache_dir: str):
+    start = time.perf_counter()
+    session = create_session(model_path, settings, cache_dir)
+    return session, time.perf_counter() - start
+
+def real_time_factor(session, voices_path: str, repeats: int) -> float:
+    """Synthesis time / audio duration over PHRASES (lower is faster; < 1 is faster than real time)."""
+    kokoro = kokoro_class().from_session(session, voices_path)
+    kokoro.create("Hallo", voice="de_male", speed=1.0, lang="de")  # warm-up
+    synth = 0.0
+    audio = 0.0
+    for _ in range(repeats):
+        for phrase in PHRASES:
+            start = time.perf_counter()
+            samples, sample_rate = kokoro.create(phrase, voice="de_male", speed=1.0, lang="de")
+            synth += time.perf_counter() - start
+            audio += len(samples) / sample_rate
+    return synth / audio
+
+def main():
+    parser = argparse.ArgumentParser(description="Load time and real-time factor of onnxruntime settings (CPU).")
+    parser.add_argument("--models-dir", default=os.path.expanduser("~/.local/share/aussprachetrainer/models"))
+    parser.add_argument("--model", help="Any .onnx file; only load times are measured unless it is Kokoro")
+    parser.add_argument("--repeats", type=int, default=2)
+    args = parser.parse_args()
+
+    model_path = args.model or os.path.join(args.models_dir, MODEL_FILE)
+    voices_path = os.path.join(args.models_dir, VOICES_FILE)
+    if not os.path.exists(model_path):
+        print(f"Model not found: {model_path} (download Kokoro in the app or pass --model)")
+        return 1
+    measure_rtf = args.model is None and kokoro_class() is not None and hasattr(kokoro_class(), "from_session")
+    if not measure_rtf:
+        print("Real-time factor needs kokoro-onnx >= 0.4 and the Kokoro model; measuring load times only")
+
+    import onnxruntime  # keep the import out of the first measurement
+    cores = os.cpu_count() or 1
+    print(f"{os.path.basename(model_path)} on {cores} CPU(s)")
+    print(f"{'Level':<9} {'Intra':>5} {'Cold load (s)':>14} {'Cached load (s)':>16} {'RTF':>7}")
+    for settings in settings_grid(cores):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            _, cold = time_load(model_path, settings, cache_dir)
+            session, warm = time_load(model_path, settings, cache_dir)
+            rtf = f"{real_time_factor(session, voices_path, args.repeats):>7.3f}" if measure_rtf else f"{'-':>7}"
+        print(f"{settings.graph_optimization:<9} {settings.intra_op_threads:>5} {cold:>14.3f} {warm:>16.3f} {rtf}")
+    return 0
+
+if __name__ == "__main__":
+    # Usage: python bench_onnx_sessions.py [--model path.onnx] [--repeats N]
+    sys.exit(main())
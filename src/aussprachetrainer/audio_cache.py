@@ -0,0 +1,190 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+class AudioCache:
+    """Persistent, content-addressed store for synthesized audio.
+
+    Files are named by a sha256 digest of everything that affects the audio
+    (normalised text, engine, voice, dialect, speed, engine/model version), so
+    identical requests hit the cache across restarts. The index lives in
+    SQLite and is mirrored in memory in LRU order, giving O(1) lookups and
+    eviction once the cache exceeds max_bytes. Hits only touch the in-memory
+    order; their access times reach the index in batches (flush()), so a
+    replay never waits on a SQLite write.
+
+    A read_only cache (used by batch workers) shares the directory but never
+    writes the index or evicts: new entries are collected in pending for the
+    owning process to commit().
+    """
+
+    BUSY_TIMEOUT = 30.0  # seconds to wait for another process's write lock
+    FLUSH_EVERY = 64  # cache hits between writes of their access times
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = 512 * 1024 * 1024, read_only: bool = False):
+        if cache_dir is None:
+            cache_dir = os.path.expanduser("~/.local/share/aussprachetrainer/cache")
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index_path = os.path.join(cache_dir, "index.db")
+        self.max_bytes = max_bytes
+        self.read_only = read_only
+        self.pending: List[Tuple[str, str]] = []
+        # key -> last access not yet written to the index
+        self._touched: Dict[str, float] = {}
+        self._lock = threading.RLock()
+        # key -> (path, size), least recently used first
+        self._entries: "OrderedDict[str, Tuple[str, int]]" = OrderedDict()
+        self.total_bytes = 0
+        if not read_only:
+            self._init_db()
+        self._load_index()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.index_path, timeout=self.BUSY_TIMEOUT)
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.commit()
+
+    def _load_index(self):
+        if self.read_only and not os.path.exists(self.index_path):
+            return
+        with self._connect() as conn:
+            rows = conn.execute("SELECT key, path, size FROM entries ORDER BY last_access ASC").fetchall()
+        stale = []
+        for key, path, size in rows:
+            if os.path.exists(path):
+                self._entries[key] = (path, size)
+                self.total_bytes += size
+            else:
+                stale.append((key,))
+        if stale and not self.read_only:
+            with self._connect() as conn:
+                conn.executemany("DELETE FROM entries WHERE key = ?", stale)
+                conn.commit()
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        return unicodedata.normalize("NFC", " ".join(text.split()))
+
+    @classmethod
+    def make_key(cls, text: str, engine: str, voice: str = None, dialect: str = None,
+                 speed: float = 1.0, version: str = None) -> str:
+        """Stable digest of a synthesis request (unlike hash(), not salted per process)."""
+        payload = json.dumps([cls.normalize_text(text), engine, voice or "", dialect or "",
+                              round(float(speed), 3), version or ""], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, ext: str) -> str:
+        """Where the audio for key should be written before commit()."""
+        shard = os.path.join(self.cache_dir, key[:2])
+        os.makedirs(shard, exist_ok=True)
+        path = os.path.join(shard, key + ext)
+        # An unindexed leftover may be hard-linked into history storage;
+        # unlink it so engines writing in place cannot modify that copy.
+        if os.path.exists(path):
+            os.remove(path)
+        return path
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached file for key, marking it recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            path, _ = entry
+            if not os.path.exists(path):
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            if self.read_only:
+                return path
+            self._touched[key] = time.time()
+            if len(self._touched) >= self.FLUSH_EVERY:
+                self.flush()
+        return path
+
+    def flush(self):
+        """Write access times recorded by get() to the index."""
+        with self._lock:
+            if not self._touched:
+                return
+            touched = [(at, key) for key, at in self._touched.items()]
+            self._touched.clear()
+            with self._connect() as conn:
+                conn.executemany("UPDATE entries SET last_access = ? WHERE key = ?", touched)
+                conn.commit()
+
+    def commit(self, key: str, path: str) -> str:
+        """Register a file written at path (normally path_for(key, ext)) and evict if over budget."""
+        size = os.path.getsize(path)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (path, size)
+            self.total_bytes += size
+            if self.read_only:
+                self.pending.append((key, path))
+                return path
+            # Writing anyway: bring the index's LRU order up to date first
+            self._touched.pop(key, None)
+            self.flush()
+            with self._connect() as conn:
+                conn.execute("INSERT OR REPLACE INTO entries (key, path, size, last_access) VALUES (?, ?, ?, ?)",
+                             (key, path, size, time.time()))
+                conn.commit()
+            self._evict()
+        return path
+
+    def remove(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            try:
+                os.remove(entry[0])
+            except OSError:
+                pass
+            self._drop(key)
+
+    def _drop(self, key: str):
+        path, size = self._entries.pop(key)
+        self._touched.pop(key, None)
+        self.total_bytes -= size
+        if self.read_only:
+            return
+        with self._connect() as conn:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            conn.commit()
+
+    def _evict(self):
+        # Keep the newest entry even if it alone exceeds the budget
+        while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            print(f"DEBUG: Evicting cached audio {key}")
+            self.remove(key)
+
+    def take_pending(self) -> List[Tuple[str, str]]:
+        """(key, path) of entries committed since the last call, for the owning process to index."""
+        with self._lock:
+            pending, self.pending = self.pending, []
+        return pending
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,159 @@
+from typing import List, Optional
+
+import numpy as np
+
+def _fade_in(n: int) -> np.ndarray:
+    # Raised-cosine ramp; fade_in + fade_out == 1 at every sample
+    return (0.5 - 0.5 * np.cos(np.pi * (np.arange(n) + 0.5) / n)).astype(np.float32)
+
+class Crossfader:
+    """Joins audio segments with a short raised-cosine overlap.
+
+    push() returns the samples that are final so far, holding back the last
+    `overlap` samples to blend with the next segment; flush() returns the
+    rest. Streaming playback and whole-file concatenation produce identical
+    output.
+    """
+
+    def __init__(self, overlap: int):
+        self.overlap = max(0, int(overlap))
+        self._tail: Optional[np.ndarray] = None
+
+    def push(self, samples: np.ndarray) -> np.ndarray:
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        parts = []
+        if self._tail is not None and len(self._tail):
+            n = min(len(self._tail), len(samples))
+            parts.append(self._tail[:len(self._tail) - n])
+            if n:
+                fade = _fade_in(n)
+                parts.append(self._tail[len(self._tail) - n:] * (1 - fade) + samples[:n] * fade)
+            samples = samples[n:]
+        keep = min(self.overlap, len(samples))
+        parts.append(samples[:len(samples) - keep])
+        self._tail = samples[len(samples) - keep:]
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+    def flush(self) -> np.ndarray:
+        tail = self._tail if self._tail is not None else np.zeros(0, dtype=np.float32)
+        self._tail = None
+        return tail
+
+def crossfade_concat(segments: List[np.ndarray], overlap: int) -> np.ndarray:
+    """Concatenate segments in order, overlapping neighbours by `overlap` samples."""
+    fader = Crossfader(overlap)
+    parts = [fader.push(s) for s in segments]
+    parts.append(fader.flush())
+    return np.concatenate(parts)
+
+def _stretch_window(sample_rate: int) -> int:
+    # ~46 ms frames: long enough to resolve the voice's harmonics
+    return 1 << int(np.round(np.log2(0.046 * sample_rate)))
+
+def _lock_phases(phase: np.ndarray, magnitude: np.ndarray, analysis_phase: np.ndarray) -> np.ndarray:
+    """Identity phase locking: bins keep their analysis phase offset to the nearest spectral peak.
+
+    Without it, each bin's phase drifts on its own and the partials smear
+    (the "phasiness" of a plain phase vocoder), most audibly when slowing down.
+    """
+    bins = np.arange(magnitude.shape[1])
+    peaks = np.zeros(magnitude.shape, dtype=bool)
+    peaks[:, 1:-1] = (magnitude[:, 1:-1] > magnitude[:, :-2]) & (magnitude[:, 1:-1] >= magnitude[:, 2:])
+    below = np.maximum.accumulate(np.where(peaks, bins, -1), axis=1)
+    above = np.minimum.accumulate(np.where(peaks, bins, len(bins))[:, ::-1], axis=1)[:, ::-1]
+    use_above = (below < 0) | ((above < len(bins)) & (above - bins < bins - below))
+    nearest = np.where(use_above, above, below)
+    nearest = np.where((nearest < 0) | (nearest >= len(bins)), bins, nearest)
+    rows = np.arange(len(phase))[:, None]
+    return phase[rows, nearest] + analysis_phase - analysis_phase[rows, nearest]
+
+def time_stretch(samples: np.ndarray, speed: float, sample_rate: int = 22050) -> np.ndarray:
+    """Change tempo by `speed` (0.5 = half speed) without changing pitch.
+
+    Phase vocoder: the STFT is resampled along time, each bin's phase is
+    advanced by its measured instantaneous frequency (locked to the nearest
+    peak), and the frames are overlap-added back. All frames are processed
+    at once; the only loop is over the four overlapping hop offsets.
+    """
+    x = np.asarray(samples, dtype=np.float32).reshape(-1)
+    n_fft = _stretch_window(sample_rate)
+    if speed <= 0:
+        raise ValueError("speed must be positive")
+    if abs(speed - 1.0) < 1e-3 or len(x) < n_fft:
+        return x.copy()
+    hop = n_fft // 4
+    window = np.hanning(n_fft + 1)[:-1].astype(np.float32)
+
+    # Analysis frames centred on multiples of hop
+    pad = n_fft // 2
+    padded = np.pad(x, (pad, pad + n_fft))
+    frames = np.lib.stride_tricks.sliding_window_view(padded, n_fft)[::hop]
+    spec = np.fft.rfft(frames * window, axis=1)
+
+    # Fractional analysis positions for each output frame
+    steps = np.arange(0, len(spec) - 1, speed)
+    idx = steps.astype(int)
+    frac = (steps - idx)[:, None]
+    magnitude = (1 - frac) * np.abs(spec[idx]) + frac * np.abs(spec[idx + 1])
+
+    # Phase advance per hop = expected advance + wrapped deviation
+    omega = 2 * np.pi * hop * np.arange(spec.shape[1]) / n_fft
+    delta = np.angle(spec[idx + 1]) - np.angle(spec[idx]) - omega
+    delta -= 2 * np.pi * np.round(delta / (2 * np.pi))
+    advance = omega + delta
+    phase = np.angle(spec[0]) + np.concatenate([np.zeros((1, spec.shape[1])), np.cumsum(advance[:-1], axis=0)])
+    phase = _lock_phases(phase, magnitude, np.angle(spec[idx]))
+
+    out = np.fft.irfft(magnitude * np.exp(1j * phase), n=n_fft, axis=1).astype(np.float32) * window
+
+    # Overlap-add, normalised by the summed squared window
+    count = len(out)
+    blocks = out.reshape(count, n_fft // hop, hop)
+    weight = (window ** 2).reshape(n_fft // hop, hop)
+    y = np.zeros(hop * (count + n_fft // hop), dtype=np.float32)
+    norm = np.zeros_like(y)
+    for r in range(n_fft // hop):
+        y[r * hop:(r + count) * hop] += blocks[:, r, :].reshape(-1)
+        norm[r * hop:(r + count) * hop] += np.tile(weight[r], count)
+    y /= np.maximum(norm, 1e-3)
+    length = int(round(len(x) / speed))
+    return y[pad:pad + length]
+
+def _frame_power(samples: np.ndarray, frame: int) -> np.ndarray:
+    """Mean square of each complete frame."""
+    count = len(samples) // frame
+    return np.mean(np.square(samples[:count * frame].reshape(count, frame), dtype=np.float64), axis=1)
+
+def trim_silence(samples: np.ndarray, sample_rate: int, threshold_db: float = -40.0, pad_ms: float = 20.0,
+                 leading: bool = True, trailing: bool = True) -> np.ndarray:
+    """Cut leading/trailing audio quieter than threshold_db below the loudest 10 ms frame.
+
+    pad_ms of the quiet part is kept so consonant onsets aren't clipped.
+    Audio with no frame above the threshold is returned unchanged.
+    """
+    x = np.asarray(samples, dtype=np.float32).reshape(-1)
+    frame = max(1, sample_rate // 100)
+    power = _frame_power(x, frame)
+    if not len(power) or power.max() <= 0:
+        return x
+    active = np.flatnonzero(power > power.max() * 10 ** (threshold_db / 10))
+    pad = int(sample_rate * pad_ms / 1000)
+    start = max(0, active[0] * frame - pad) if leading else 0
+    end = min(len(x), (active[-1] + 1) * frame + pad) if trailing else len(x)
+    return x[start:end]
+
+def normalize_loudness(samples: np.ndarray, sample_rate: int, target_db: float = -20.0,
+                       peak: float = 0.97, gate_db: float = -40.0) -> np.ndarray:
+    """Scale so the RMS of the voiced frames is target_db dBFS, never pushing the peak above `peak`.
+
+    Frames more than gate_db below the loudest are ignored, so pauses
+    don't make a sparse phrase come out louder than a dense one.
+    """
+    x = np.asarray(samples, dtype=np.float32).reshape(-1)
+    power = _frame_power(x, max(1, sample_rate // 100))
+    if not len(power) or power.max() <= 0:
+        return x
+    voiced = power[power > power.max() * 10 ** (gate_db / 10)]
+    gain = 10 ** (target_db / 20) / np.sqrt(voiced.mean())
+    gain = min(gain, peak / float(np.max(np.abs(x))))
+    return x * np.float32(gain)
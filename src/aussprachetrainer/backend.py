@@ -1,107 +1,28 @@
 import subprocess
 import os
 import tempfile
-import pyttsx3
 import shutil
+import hashlib
 import sqlite3
 import threading
 import time
-import numpy as np
-import sounddevice as sd
-import speech_recognition as sr
+import queue
 import socket
-from gtts import gTTS
-try:
-    from kokoro_onnx import Kokoro
-except ImportError:
-    Kokoro = None
 import re
-from typing import List, Dict, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
 from rapidfuzz import distance
 from aussprachetrainer.database import HistoryManager
-
-class PronunciationBackend:
-    def __init__(self):
-        # Initialize offline TTS engine
-        self.engine = pyttsx3.init()
-        # History Manager
-        self.db = HistoryManager()
-        
-        # Persistent audio directory
-        self.audio_dir = os.path.expanduser("~/.local/share/aussprachetrainer/audio")
-        os.makedirs(self.audio_dir, exist_ok=True)
-        
-        # Session audio dir (temporary)
-        self.session_dir = tempfile.mkdtemp(prefix="aussprachetrainer_")
-        
-        # Piper models directory
-        self.models_dir = os.path.expanduser("~/.local/share/aussprachetrainer/models")
-        os.makedirs(self.models_dir, exist_ok=True)
-        
-        # Dialect state
-        self.dialect = "de-DE" # Standard German, de-AT, de-CH
-        
-        # Recording state
-        self.recording = False
-        self.recorded_frames = []
-        self.fs = 44100 # Change to 44.1kHz for better compatibility
-        self.last_audio_path = None
-
-    def set_dialect(self, code: str):
-        self.dialect = code
-
-    def _get_espeak_voice(self) -> str:
-        mapping = {"de-DE": "de", "de-AT": "de-at", "de-CH": "de-ch"}
-        return mapping.get(self.dialect, "de")
-        
-    def __del__(self):
-        if hasattr(self, 'session_dir') and os.path.exists(self.session_dir):
-            try: shutil.rmtree(self.session_dir)
-            except: pass
-
-    def get_voices(self) -> List[Dict[str, str]]:
-        try:
-            voices = self.engine.getProperty('voices')
-            voice_list = []
-            for v in voices:
-                is_german = 'german' in v.name.lower() or 'de' in v.languages or 'de-de' in v.id.lower() or 'de-at' in v.id.lower() or 'de-ch' in v.id.lower()
-                if is_german:
-                    voice_list.append({'id': v.id, 'name': v.name})
-            return voice_list
-        except: return []
-
-    def check_internet(self) -> bool:
-        """Check if internet connection is available"""
-        try:
-            socket.create_connection(("8.8.8.8", 53), timeout=2)
-            return True
-        except OSError:
-            return False
-
-    def get_online_voices(self) -> List[Dict[str, str]]:
-        """Get available gTTS voices/accents for German"""
-        return [
-            {'id': 'de', 'name': 'German (Standard)'},
-            {'id': 'de-at', 'name': 'German (Austria)'},
-            {'id': 'de-ch', 'name': 'German (Switzerland)'},
-        ]
-
-    def get_offline_voices(self) -> List[Dict[str, str]]:
-        """Get available Kokoro, Piper and espeak-ng voices for German"""
-        voices = [
-            # Kokoro Neural Voices (Highest Quality)
-            {'id': 'kokoro:de_male', 'name': 'Kokoro German (Male)'},
-            {'id': 'kokoro:de_female', 'name': 'Kokoro German (Female)'},
-            # Piper Neural Voices (High Quality)
-            {'id': 'piper:de_DE-thorsten-high', 'name': 'Piper Thorsten (High)'},
-            {'id': 'piper:de_DE-thorsten-medium', 'name': 'Piper Thorsten (Medium)'},
-            {'id': 'piper:de_DE-karlsson-low', 'name': 'Piper Karlsson (Low)'},
-            # Espeak-ng fallback voices
-            {'id': 'de', 'name': 'espeak German (Standard)'},
-            {'id': 'de+m3', 'name': 'espeak German (Male 3)'},
-            {'id': 'de+f2', 'name': 'espeak German (Female 2)'},
-        ]
-        return voices
+from aussprachetrainer.audio_cache import AudioCache
+from aussprachetrainer.kokoro_engine import get_kokoro_engine, kokoro_installed
+from aussprachetrainer.piper_worker import PiperWorkerPool
+from aussprachetrainer.onnx_session import SessionSettings
+from aussprachetrainer.downloads import DownloadManager, format_progress, kokoro_tasks, piper_tasks
+from aussprachetrainer.sentences import split_sentences
+from aussprachetrainer.transcode import AudioTranscoder
+from aussprachetrainer.jobs import JobScheduler, PRIORITY_LOW
+from aussprachetrainer.connectivity import ConnectivityMonitor
 
 class GermanIPAProcessor:
     @staticmethod
@@ -183,11 +104,11 @@ class GermanIPAProcessor:
         return ipa.strip()
 
 class PronunciationBackend:
-    def __init__(self):
-        # Initialize offline TTS engine
-        self.engine = pyttsx3.init()
-        # History Manager
-        self.db = HistoryManager()
+    def __init__(self, audio_cache: Optional[AudioCache] = None, history: bool = True):
+        # pyttsx3 engine, only needed to list system voices (see engine)
+        self._engine = None
+        # History Manager (None for synthesis-only backends such as batch workers)
+        self.db = HistoryManager() if history else None
         
         # Persistent audio directory
         self.audio_dir = os.path.expanduser("~/.local/share/aussprachetrainer/audio")
@@ -196,18 +117,102 @@ class PronunciationBackend:
         # Session audio dir (temporary)
         self.session_dir = tempfile.mkdtemp(prefix="aussprachetrainer_")
         
+        # Content-addressed synthesis cache (survives restarts)
+        self.audio_cache = audio_cache if audio_cache is not None else AudioCache()
+        self._espeak_version = None
+        
         # Piper models directory
         self.models_dir = os.path.expanduser("~/.local/share/aussprachetrainer/models")
         os.makedirs(self.models_dir, exist_ok=True)
+        # Resumable, checksummed model downloads
+        self.downloads = DownloadManager(self.models_dir)
         
         # Dialect state
         self.dialect = "de-DE" # Standard German, de-AT, de-CH
         
         # Recording state
         self.recording = False
-        self.recorded_frames = []
-        self.fs = 44100 # Change to 44.1kHz for better compatibility
+        self.fs = 16000 # The recognisers' native rate; takes recorded at another device rate are resampled to it
+        # int16 capture buffer, reused across takes (see start_recording)
+        self.capture = None
+        # Voice activity detection: stop after trailing silence and trim the take
+        self.vad = None
+        self.auto_stop = True
+        self.vad_silence_ms = 800
+        # Called once (from the audio thread) when the VAD ends a take
+        self.on_auto_stop = None
         self.last_audio_path = None
+        # Takes go to ASR from memory; a WAV copy is only written when asked for
+        self.save_recordings = False
+        self.recordings_dir = os.path.expanduser("~/.local/share/aussprachetrainer/recordings")
+        self.last_recording_path = None
+        # Warm pocketsphinx decoders by model paths. offline_asr_mode is lm (open
+        # vocabulary); grammar and keyword constrain decoding to the target and are opt-in
+        self._sphinx = {}
+        self._sphinx_lock = threading.Lock()
+        self.offline_asr_mode = "lm"
+        # Seconds from request to first sample on the device (streaming path)
+        self.last_time_to_first_sample = None
+
+        # Long-lived piper processes, one per voice model
+        self.piper_workers = PiperWorkerPool(workers_per_model=max(1, min(2, (os.cpu_count() or 1) // 2)))
+
+        # In-process playback with decoded-PCM cache (see playback)
+        self._playback = None
+        self._streaming_player = None
+
+        # History audio is re-encoded to FLAC in the background
+        self.compress_audio = True
+        self.transcoder = AudioTranscoder(self._on_audio_transcoded)
+        # Serialises history writes with swapping in transcoded files
+        self._storage_lock = threading.Lock()
+
+        # Reachability for Auto mode, probed in the background once started
+        self.connectivity = ConnectivityMonitor()
+        # gTTS request timeout (s)
+        self.online_timeout = 15
+
+        # Bounded workers for generate/assess; newer requests supersede older ones
+        self.jobs = JobScheduler(max_workers=2)
+
+        # Striped locks so prefetch and the user never synthesize the same request twice
+        self._key_locks = [threading.RLock() for _ in range(64)]
+        self._segment_locks = [threading.RLock() for _ in range(64)]
+        # Overlap between sentences synthesized separately
+        self.crossfade_ms = 10
+        # Every voice is trimmed and brought to the same loudness before caching
+        self.postprocess_audio = True
+        self.target_loudness_db = -20.0
+        # Pause between separately synthesized (and trimmed) sentences
+        self.sentence_pause_ms = 250
+        # Threads synthesizing sentences ahead (None: as many as the engine can use)
+        self.segment_threads: Optional[int] = None
+        # Tempo for playback (1.0 = as synthesized); other speeds are time-stretched copies
+        self.playback_speed = 1.0
+        # (dialect, text) -> IPA, least recently used first
+        self._ipa_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._ipa_cache_size = 2000
+        self._ipa_lock = threading.Lock()
+
+    # Heavy dependencies (numpy, sounddevice, pyttsx3, ...) load on first use so the window opens quickly
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            import pyttsx3
+            self._engine = pyttsx3.init()
+        return self._engine
+
+    @property
+    def playback(self):
+        if self._playback is None:
+            from aussprachetrainer.playback import PlaybackManager
+            self._playback = PlaybackManager()
+        return self._playback
+
+    @playback.setter
+    def playback(self, manager):
+        self._playback = manager
 
     def set_dialect(self, code: str):
         self.dialect = code
@@ -221,6 +226,16 @@ class PronunciationBackend:
             try: shutil.rmtree(self.session_dir)
             except: pass
 
+    def shutdown(self):
+        """Stop background engine processes."""
+        self.jobs.shutdown()
+        self.connectivity.stop()
+        self.piper_workers.shutdown()
+        if self._playback is not None:
+            self._playback.close()
+        self.transcoder.shutdown()
+        self.audio_cache.flush()
+
     def get_voices(self) -> List[Dict[str, str]]:
         try:
             voices = self.engine.getProperty('voices')
@@ -233,12 +248,10 @@ class PronunciationBackend:
         except: return []
 
     def check_internet(self) -> bool:
-        """Check if internet connection is available"""
-        try:
-            socket.create_connection(("8.8.8.8", 53), timeout=2)
-            return True
-        except OSError:
-            return False
+        """Check if internet connection is available (cached by the connectivity monitor)."""
+        if not self.connectivity.known:
+            return self.connectivity.check_now()
+        return self.connectivity.is_online
 
     def get_online_voices(self) -> List[Dict[str, str]]:
         """Get available gTTS voices/accents for German"""
@@ -266,6 +279,9 @@ class PronunciationBackend:
         return voices
 
     def get_ipa(self, text: str) -> str:
+        cached = self._cached_ipa(text)
+        if cached is not None:
+            return cached
         try:
             voice = self._get_espeak_voice()
             result = subprocess.run(
@@ -273,60 +289,420 @@ class PronunciationBackend:
                 capture_output=True, text=True, check=True
             )
             raw_ipa = result.stdout.strip()
-            return GermanIPAProcessor.process(raw_ipa, text)
+            ipa = GermanIPAProcessor.process(raw_ipa, text)
+            self._remember_ipa(text, ipa)
+            return ipa
         except Exception as e:
             print(f"DEBUG: get_ipa failed: {e}")
             return ""
 
+    def _cached_ipa(self, text: str) -> Optional[str]:
+        key = (self.dialect, " ".join(text.split()))
+        with self._ipa_lock:
+            ipa = self._ipa_cache.get(key)
+            if ipa is not None:
+                self._ipa_cache.move_to_end(key)
+            return ipa
+
+    def _remember_ipa(self, text: str, ipa: str):
+        if not ipa:
+            return
+        with self._ipa_lock:
+            self._ipa_cache[(self.dialect, " ".join(text.split()))] = ipa
+            while len(self._ipa_cache) > self._ipa_cache_size:
+                self._ipa_cache.popitem(last=False)
+
+    @staticmethod
+    def _file_version(path: str) -> str:
+        try:
+            st = os.stat(path)
+            return f"{st.st_size}-{int(st.st_mtime)}"
+        except OSError:
+            return "missing"
+
+    def _get_espeak_version(self) -> str:
+        if self._espeak_version is None:
+            try:
+                result = subprocess.run(['espeak-ng', '--version'], capture_output=True, text=True)
+                self._espeak_version = result.stdout.strip()
+            except Exception:
+                self._espeak_version = ""
+        return self._espeak_version
+
+    def _engine_version(self, online: bool, voice_id: str) -> Tuple[str, str]:
+        """(engine, version) of whatever would synthesize this request.
+
+        Model files are versioned by size and mtime, so downloading a model
+        (or replacing it) invalidates audio produced by a fallback engine.
+        """
+        if online:
+            try:
+                from importlib.metadata import version
+                return "gtts", version("gTTS")
+            except Exception:
+                return "gtts", ""
+        if voice_id and voice_id.startswith("kokoro:"):
+            return "kokoro", self._file_version(get_kokoro_engine(self.models_dir).model_path)
+        if voice_id and voice_id.startswith("piper:"):
+            return "piper", self._file_version(os.path.join(self.models_dir, f"{voice_id.split(':')[1]}.onnx"))
+        return "espeak-ng", self._get_espeak_version()
+
+    def _audio_cache_key(self, text: str, online: bool, voice_id: str, online_voice: str) -> str:
+        engine, version = self._engine_version(online, voice_id)
+        voice = online_voice if online else voice_id
+        return AudioCache.make_key(text, engine, voice, self.dialect, speed=1.0, version=version)
+
+    def _key_lock(self, key: str, paragraph: bool = False) -> threading.RLock:
+        # Multi-sentence requests lock a separate set, so a paragraph can wait
+        # on its sentences' locks (taken by pool threads) without deadlocking.
+        locks = self._key_locks if paragraph else self._segment_locks
+        return locks[int(key[:8], 16) % len(locks)]
+
+    def is_cached(self, text: str, online: bool = False, voice_id: str = None, online_voice: str = None) -> bool:
+        """True if both audio and IPA for this request are already available."""
+        key = self._audio_cache_key(text, online, voice_id, online_voice)
+        return self.audio_cache.get(key) is not None and self._cached_ipa(text) is not None
+
+    def _audio_cache_path(self, key: str, online: bool) -> str:
+        return self.audio_cache.path_for(key, ".mp3" if online else ".wav")
+
+    def _is_espeak_voice(self, voice_id: str = None) -> bool:
+        return not (voice_id and (voice_id.startswith("kokoro:") or voice_id.startswith("piper:")))
+
+    def generate_with_ipa(self, text: str, online: bool = False, voice_id: str = None, online_voice: str = None) -> Tuple[str, Optional[str]]:
+        """Return (ipa, audio_path) for text.
+
+        For single-sentence espeak requests both come from one espeak-ng run;
+        otherwise IPA comes from a separate get_ipa call.
+        """
+        key = self._audio_cache_key(text, online, voice_id, online_voice)
+        multi = not online and len(split_sentences(text)) > 1
+        with self._key_lock(key, paragraph=multi):
+            if not online and not multi and self._is_espeak_voice(voice_id) and self.audio_cache.get(key) is None:
+                v = voice_id if voice_id else self._get_espeak_voice() + "+m3"
+                # Only share the run if the audio voice speaks the dialect we transcribe
+                if v.split("+")[0] == self._get_espeak_voice():
+                    print(f"DEBUG: Generating audio and IPA for '{text}' in one espeak run, voice_id={voice_id}")
+                    try:
+                        filepath, ipa = self._generate_offline_with_ipa(text, self._audio_cache_path(key, online), v)
+                        filepath = self._postprocess_file(filepath, key)
+                        self.audio_cache.commit(key, filepath)
+                        self._remember_ipa(text, ipa)
+                        return ipa, filepath
+                    except Exception as e:
+                        print(f"DEBUG: Combined espeak run failed: {e}")
+                        return self.get_ipa(text), None
+
+            ipa = self.get_ipa(text)
+            return ipa, self.generate_audio(text, online=online, voice_id=voice_id, online_voice=online_voice)
+
     def generate_audio(self, text: str, online: bool = False, voice_id: str = None, online_voice: str = None) -> str:
         print(f"DEBUG: Generating audio for '{text}', online={online}, voice_id={voice_id}")
-        ext = ".mp3" if online else ".wav"
-        # Include voice in hash for caching
-        cache_key = f"{text}_{online}_{voice_id}_{online_voice}"
-        filename = f"audio_{hash(cache_key)}{ext}"
-        filepath = os.path.join(self.session_dir, filename)
+        key = self._audio_cache_key(text, online, voice_id, online_voice)
+        sentences = [] if online else split_sentences(text)
+        with self._key_lock(key, paragraph=len(sentences) > 1):
+            cached = self.audio_cache.get(key)
+            if cached:
+                return cached
+            filepath = self._audio_cache_path(key, online)
+
+            try:
+                segmented = False
+                if online: 
+                    self._generate_online(text, filepath, online_voice)
+                else: 
+                    # Long inputs: sentences in parallel, each cached on its own
+                    segmented = len(sentences) > 1 and self._generate_segmented(sentences, filepath, voice_id)
+                    if segmented:
+                        pass
+                    elif voice_id and voice_id.startswith("kokoro:"):
+                        filepath = self._generate_kokoro(text, filepath, voice_id)
+                    elif voice_id and voice_id.startswith("piper:"):
+                        filepath = self._generate_piper(text, filepath, voice_id.split(":")[1])
+                    else:
+                        filepath = self._generate_offline(text, filepath, voice_id)
+                # Segmented output is joined from sentences that were already post-processed
+                if not segmented:
+                    filepath = self._postprocess_file(filepath, key)
+                print(f"DEBUG: Audio generated at {filepath}")
+                self.audio_cache.commit(key, filepath)
+            except Exception as e:
+                print(f"DEBUG: Audio generation failed: {e}")
+                if online:
+                    # Don't keep choosing online in Auto mode until a probe succeeds
+                    self.connectivity.mark_offline()
+                return None
         
-        if os.path.exists(filepath):
-            return filepath
+        return filepath
+
+    def _engine_concurrency(self, voice_id: str = None) -> int:
+        """How many sentences of this voice can usefully be synthesized at once."""
+        if voice_id and voice_id.startswith("kokoro:"):
+            # One model instance; onnxruntime already spreads each call over the cores
+            return 1
+        if voice_id and voice_id.startswith("piper:"):
+            return self.piper_workers.workers_per_model
+        return os.cpu_count() or 1
 
+    def _segment_samples(self, sentence: str, voice_id: str):
+        """Audio for one sentence from the per-sentence cache, synthesizing it on a miss."""
+        import soundfile as sf
+        key = self._audio_cache_key(sentence, False, voice_id, None)
+        with self._key_lock(key):
+            cached = self.audio_cache.get(key)
+            if cached:
+                samples, sample_rate = sf.read(cached, dtype="float32", always_2d=True)
+                return samples[:, 0], sample_rate
+            samples, sample_rate = self._synthesize_segment(sentence, voice_id)
+            samples = self._postprocess(samples, sample_rate)
+            path = self._audio_cache_path(key, False)
+            sf.write(path, samples, sample_rate, subtype="PCM_16")
+            self.audio_cache.commit(key, path)
+            return samples, sample_rate
+
+    def _iter_segments(self, sentences: List[str], voice_id: str):
+        """Yield (samples, sample_rate) per sentence in order, synthesizing ahead in parallel.
+
+        Every sentence but the last is followed by sentence_pause_ms of silence.
+        """
+        import numpy as np
+        workers = max(1, min(len(sentences), self.segment_threads or self._engine_concurrency(voice_id)))
+        pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="segment")
         try:
-            if online: 
-                self._generate_online(text, filepath, online_voice)
-            else: 
-                if voice_id and voice_id.startswith("kokoro:"):
-                    filepath = self._generate_kokoro(text, filepath, voice_id)
-                elif voice_id and voice_id.startswith("piper:"):
-                    filepath = self._generate_piper(text, filepath, voice_id.split(":")[1])
-                else:
-                    filepath = self._generate_offline(text, filepath, voice_id)
-            print(f"DEBUG: Audio generated at {filepath}")
+            futures = [pool.submit(self._segment_samples, s, voice_id) for s in sentences]
+            for i, future in enumerate(futures):
+                samples, sample_rate = future.result()
+                if i < len(futures) - 1 and self.sentence_pause_ms > 0:
+                    pause = np.zeros(int(sample_rate * self.sentence_pause_ms / 1000), dtype=np.float32)
+                    samples = np.concatenate([samples, pause])
+                yield samples, sample_rate
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _generate_segmented(self, sentences: List[str], filepath: str, voice_id: str) -> bool:
+        """Write text as separately cached sentences joined with a short crossfade.
+
+        Returns False (leaving the caller to synthesize in one piece) if any
+        sentence fails.
+        """
+        import soundfile as sf
+        from aussprachetrainer.playback import resample_linear
+        from aussprachetrainer.audio_processing import crossfade_concat
+        try:
+            segments = []
+            rate = None
+            for samples, sample_rate in self._iter_segments(sentences, voice_id):
+                rate = rate or sample_rate
+                # A fallback engine may have produced a different rate
+                segments.append(resample_linear(samples, sample_rate, rate))
+            audio = crossfade_concat(segments, int(rate * self.crossfade_ms / 1000))
+            sf.write(filepath, audio, rate, subtype="PCM_16")
+            return True
         except Exception as e:
-            print(f"DEBUG: Audio generation failed: {e}")
-            return None
-        
-        self.last_audio_path = filepath
-        return filepath
+            print(f"DEBUG: Sentence-parallel synthesis failed: {e}, synthesizing in one piece")
+            return False
+
+    def _postprocess(self, samples, sample_rate: int):
+        """Trim leading/trailing silence and normalise loudness (if enabled)."""
+        if not self.postprocess_audio:
+            return samples
+        from aussprachetrainer.audio_processing import normalize_loudness, trim_silence
+        return normalize_loudness(trim_silence(samples, sample_rate), sample_rate, self.target_loudness_db)
+
+    def _postprocess_file(self, filepath: str, key: str) -> str:
+        """Post-process a synthesized file before it is cached. Returns the WAV to cache.
+
+        Decoded online MP3s are stored as WAV rather than re-encoded lossily.
+        On any failure the file is kept as synthesized.
+        """
+        if not self.postprocess_audio or not filepath:
+            return filepath
+        try:
+            import soundfile as sf
+            samples, sample_rate = sf.read(filepath, dtype="float32", always_2d=True)
+            processed = self._postprocess(samples.mean(axis=1), sample_rate)
+            out = filepath if filepath.endswith(".wav") else self.audio_cache.path_for(key, ".wav")
+            sf.write(out, processed, sample_rate, subtype="PCM_16")
+            if out != filepath:
+                os.remove(filepath)
+            return out
+        except Exception as e:
+            print(f"DEBUG: Post-processing {os.path.basename(filepath)} failed: {e}")
+            return filepath
+
+    def can_stream(self, voice_id: str = None) -> bool:
+        """True if voice_id is a neural voice whose audio can be played while it is synthesized."""
+        from aussprachetrainer.playback import StreamingPlayer
+        if not StreamingPlayer.is_available() or not voice_id:
+            return False
+        if voice_id.startswith("kokoro:"):
+            return get_kokoro_engine(self.models_dir).is_available()
+        if voice_id.startswith("piper:"):
+            return os.path.exists(os.path.join(self.models_dir, f"{voice_id.split(':')[1]}.onnx"))
+        return False
+
+    def _synthesize_segment(self, text: str, voice_id: str):
+        """Synthesize one sentence in memory. Returns (float32 samples, sample_rate)."""
+        import numpy as np
+        import soundfile as sf
+        if voice_id and voice_id.startswith("kokoro:"):
+            samples, sample_rate = get_kokoro_engine(self.models_dir).create(text, voice_id=voice_id, speed=1.0)
+        else:
+            fd, seg_path = tempfile.mkstemp(suffix=".wav", prefix="segment_", dir=self.session_dir)
+            os.close(fd)
+            try:
+                if voice_id and voice_id.startswith("piper:"):
+                    model_path = os.path.join(self.models_dir, f"{voice_id.split(':')[1]}.onnx")
+                    self.piper_workers.synthesize(model_path, text, seg_path)
+                else:
+                    self._generate_offline(text, seg_path, voice_id)
+                samples, sample_rate = sf.read(seg_path, dtype="float32")
+            finally:
+                os.remove(seg_path)
+        return np.asarray(samples, dtype=np.float32).reshape(-1), sample_rate
+
+    def generate_audio_streaming(self, text: str, voice_id: str) -> Optional[str]:
+        """Synthesize sentence by sentence and play each one as soon as it is ready.
+
+        Sentences are synthesized ahead in parallel and cached individually;
+        the joined WAV is written alongside playback so the cache and history
+        get the same file as generate_audio. Blocks until playback has finished.
+        """
+        import soundfile as sf
+        from aussprachetrainer.playback import StreamingPlayer
+        from aussprachetrainer.audio_processing import Crossfader
+        key = self._audio_cache_key(text, False, voice_id, None)
+        sentences = split_sentences(text) or [text]
+        # Held throughout so a prefetch of the same request is reused, not repeated
+        with self._key_lock(key, paragraph=True):
+            cached = self.audio_cache.get(key)
+            if cached:
+                self.play_file(cached)
+                return cached
+            # A single sentence is its own segment cache entry
+            filepath = self._audio_cache_path(key, False) if len(sentences) > 1 else None
+
+            start = time.perf_counter()
+            self.stop_playback()
+            player = StreamingPlayer(self.playback)
+            self._streaming_player = player
+            writer = None
+            fader = None
+            try:
+                for samples, sample_rate in self._iter_segments(sentences, voice_id):
+                    if fader is None:
+                        fader = Crossfader(int(sample_rate * self.crossfade_ms / 1000))
+                        if filepath:
+                            writer = sf.SoundFile(filepath, "w", samplerate=sample_rate, channels=1, subtype="PCM_16")
+                    ready = fader.push(samples)
+                    player.feed(ready, sample_rate)
+                    if writer is not None:
+                        writer.write(ready)
+                rest = fader.flush()
+                player.feed(rest, sample_rate)
+                if writer is not None:
+                    writer.write(rest)
+                    writer.close()
+                    self.audio_cache.commit(key, filepath)
+                else:
+                    filepath = self.audio_cache.get(key)
+            except Exception as e:
+                print(f"DEBUG: Streaming synthesis failed: {e}, falling back to file playback")
+                player.stop()
+                if writer is not None:
+                    writer.close()
+                if filepath and os.path.exists(filepath):
+                    os.remove(filepath)
+                filepath = self.generate_audio(text, online=False, voice_id=voice_id)
+                self.play_file(filepath)
+                return filepath
+            try:
+                player.finish(wait=True)
+            except Exception as e:
+                # The output stream never opened; the file is complete, so play that
+                print(f"DEBUG: Streaming playback failed: {e}, playing the file instead")
+                self.play_file(filepath)
+                return filepath
+
+            if player.first_sample_time is not None:
+                self.last_time_to_first_sample = player.first_sample_time - start
+                print(f"DEBUG: Time to first sample: {self.last_time_to_first_sample * 1000:.0f} ms")
+            return filepath
 
     def copy_to_persistent(self, session_audio_path: str) -> str:
-        """Copy audio file from session directory to persistent storage.
-        Returns the persistent path, or None if copy fails."""
+        """Store audio in persistent storage as a content-addressed blob.
+
+        The blob is named by the sha256 of the file's bytes, so the same audio
+        is stored once however many history entries reference it (the
+        database keeps the reference counts). The blob is hard-linked to the
+        source where possible, so nothing is copied; across filesystems it
+        falls back to a copy. Returns the blob path, or None on failure.
+        """
         if not session_audio_path or not os.path.exists(session_audio_path):
             return None
         
         try:
-            filename = os.path.basename(session_audio_path)
-            persistent_path = os.path.join(self.audio_dir, filename)
+            digest = hashlib.sha256()
+            with open(session_audio_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 16), b""):
+                    digest.update(chunk)
+            ext = os.path.splitext(session_audio_path)[1]
+            base = os.path.join(self.audio_dir, digest.hexdigest())
+            # The blob keeps its name when transcoded, so look for both forms
+            for existing in (base + ".flac", base + ext):
+                if os.path.exists(existing):
+                    print(f"DEBUG: Audio already in persistent storage: {existing}")
+                    return existing
+            persistent_path = base + ext
             
-            # Copy file to persistent storage
-            import shutil
-            shutil.copy2(session_audio_path, persistent_path)
+            tmp_path = persistent_path + ".tmp"
+            try:
+                os.link(session_audio_path, tmp_path)
+            except OSError:
+                shutil.copy2(session_audio_path, tmp_path)
+            os.replace(tmp_path, persistent_path)
             
-            print(f"DEBUG: Copied audio to persistent storage: {persistent_path}")
+            print(f"DEBUG: Stored audio in persistent storage: {persistent_path}")
             return persistent_path
         except Exception as e:
             print(f"DEBUG: Failed to copy audio to persistent storage: {e}")
             return None
 
+    def store_history_entry(self, text: str, ipa: str, filepath: str, mode: str, voice_id: str) -> str:
+        """Persist generated audio and record it in history. Returns the stored path."""
+        with self._storage_lock:
+            persistent_path = self.copy_to_persistent(filepath)
+            if not persistent_path:
+                persistent_path = filepath  # Fallback to session path
+            self.db.add_entry(text, ipa, persistent_path, mode, voice_id)
+        if self.compress_audio and persistent_path != filepath:
+            self.transcoder.submit(persistent_path)
+        return persistent_path
+
+    def _on_audio_transcoded(self, old_path: str, new_path: str):
+        with self._storage_lock:
+            # If every entry using it was deleted while transcoding, the
+            # original is already gone and the new file is the orphan
+            stale = old_path if self.db.replace_audio_path(old_path, new_path) else new_path
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        if self._playback is not None:
+            self._playback.evict(old_path)
+
+    def set_onnx_settings(self, settings: SessionSettings):
+        """Thread/optimization settings for in-process neural voices, used from their next load."""
+        get_kokoro_engine(self.models_dir).session_settings = settings
+
+    def prepare_voice(self, voice_id: str):
+        """Warm up the engine behind voice_id and release engines no longer in use."""
+        kokoro = get_kokoro_engine(self.models_dir)
+        if voice_id and voice_id.startswith("kokoro:"):
+            kokoro.warm_up_async(voice_id)
+        else:
+            kokoro.release()
+
     def is_piper_available(self) -> bool:
         """Check if any Piper models are present."""
         if not os.path.exists(self.models_dir): return False
@@ -337,83 +713,73 @@ class PronunciationBackend:
         piper_supported = ["de_DE-thorsten-high", "de_DE-thorsten-medium", "de_DE-karlsson-low"]
         missing = []
         for m in piper_supported:
-            if not os.path.exists(os.path.join(self.models_dir, f"{m}.onnx")):
+            # Partial (.part) or truncated files don't count
+            if not (self.downloads.is_present(f"{m}.onnx") and self.downloads.is_present(f"{m}.onnx.json")):
                 missing.append(f"piper:{m}")
         
         # Kokoro
-        if not os.path.exists(os.path.join(self.models_dir, "kokoro-v0_19.onnx")):
+        if not self.downloads.is_present("kokoro-v0_19.onnx"):
             missing.append("kokoro:model")
-        if not os.path.exists(os.path.join(self.models_dir, "voices.json")):
+        if not self.downloads.is_present("voices.json"):
             missing.append("kokoro:voices")
             
         return missing
 
+    def download_models(self, model_ids: List[str], progress_callback=None) -> bool:
+        """Download the files behind model ids (as returned by get_missing_models) concurrently.
+
+        progress_callback receives status messages with byte-level progress.
+        """
+        tasks = []
+        for model_id in model_ids:
+            if model_id.startswith("piper:"):
+                tasks += piper_tasks(self.models_dir, model_id.split(":", 1)[1])
+            elif model_id.startswith("kokoro:"):
+                tasks += kokoro_tasks(self.models_dir)
+        # Unique by destination (kokoro:model and kokoro:voices share one file set)
+        tasks = list({t.dest: t for t in tasks if not self.downloads.is_present(os.path.basename(t.dest))}.values())
+        if not tasks:
+            return True
+
+        def on_progress(done, total, name):
+            if progress_callback and name:
+                progress_callback(format_progress(done, total, name))
+
+        results = self.downloads.download(tasks, on_progress)
+        failed = [os.path.basename(dest) for dest, error in results.items() if error]
+        if failed:
+            if progress_callback: progress_callback(f"Failed: {', '.join(failed)}")
+            return False
+        return True
+
     def download_kokoro_model(self, progress_callback=None):
         """Download Kokoro ONNX model and voices.json."""
-        # Note: These URLs need to be valid. Kokoro-82M on HuggingFace is common.
-        # This is a placeholder for actual Kokoro model URLs.
-        files = {
-            "kokoro-v0_19.onnx": "https://huggingface.co/hexgrad/Kokoro-82M/resolve/main/kokoro-v0_19.onnx",
-            "voices.json": "https://huggingface.co/hexgrad/Kokoro-82M/resolve/main/voices.json"
-        }
-        
-        for f, url in files.items():
-            dest = os.path.join(self.models_dir, f)
-            if not os.path.exists(dest):
-                print(f"DEBUG: Downloading {url} to {dest}")
-                if progress_callback: progress_callback(f"Downloading {f}...")
-                try:
-                    subprocess.run(['curl', '-L', '-o', dest, url], check=True)
-                except Exception as e:
-                    print(f"DEBUG: Failed to download {f}: {e}")
-                    if progress_callback: progress_callback(f"Failed: {f}")
-                    return False
+        if not self.download_models(["kokoro:model"], progress_callback):
+            return False
         if progress_callback: progress_callback("Kokoro ready!")
         return True
 
     def download_piper_model(self, model_name: str, progress_callback=None):
         """Download a piper model and its config."""
-        base_url = "https://github.com/rhasspy/piper-voices/releases/download/v1.0.0/"
-        files = [f"{model_name}.onnx", f"{model_name}.onnx.json"]
-        
-        for f in files:
-            url = base_url + f
-            dest = os.path.join(self.models_dir, f)
-            if not os.path.exists(dest):
-                print(f"DEBUG: Downloading {url} to {dest}")
-                if progress_callback: progress_callback(f"Downloading {f}...")
-                try:
-                    subprocess.run(['curl', '-L', '-o', dest, url], check=True)
-                except Exception as e:
-                    print(f"DEBUG: Failed to download {f}: {e}")
-                    if progress_callback: progress_callback(f"Failed: {f}")
-                    return False
+        if not self.download_models([f"piper:{model_name}"], progress_callback):
+            return False
         if progress_callback: progress_callback("Voice ready!")
         return True
 
     def _generate_kokoro(self, text: str, filepath: str, voice_id: str) -> str:
         """Generate audio using Kokoro neural TTS."""
-        if Kokoro is None:
+        if not kokoro_installed():
             print("DEBUG: kokoro-onnx not installed")
             return self._generate_piper(text, filepath, "de_DE-thorsten-medium")
             
-        model_path = os.path.join(self.models_dir, "kokoro-v0_19.onnx")
-        voice_path = os.path.join(self.models_dir, "voices.json")
-        
-        if not os.path.exists(model_path):
-            print(f"DEBUG: Kokoro model not found at {model_path}")
+        kokoro = get_kokoro_engine(self.models_dir)
+        if not os.path.exists(kokoro.model_path):
+            print(f"DEBUG: Kokoro model not found at {kokoro.model_path}")
             return self._generate_piper(text, filepath, "de_DE-thorsten-medium")
 
         try:
-            kokoro = Kokoro(model_path, voice_path)
-            # Kokoro voice IDs are like 'de_male' or 'de_female'
-            # We map our voice_id to kokoro's
-            v_map = {
-                "kokoro:de_male": "de_male",
-                "kokoro:de_female": "de_female"
-            }
-            v = v_map.get(voice_id, "de_male")
-            samples, sample_rate = kokoro.create(text, voice=v, speed=1.0, lang="de")
+            # Reuses the warm process-wide model instead of reloading it per call
+            samples, sample_rate = kokoro.create(text, voice_id=voice_id, speed=1.0)
             
             import soundfile as sf
             sf.write(filepath, samples, sample_rate)
@@ -430,13 +796,10 @@ class PronunciationBackend:
             print(f"DEBUG: Piper model {model_name} not found, falling back to espeak")
             return self._generate_offline(text, filepath)
         
-        cmd = ['piper', '-m', model_path, '-f', filepath]
-        print(f"DEBUG: Running Piper TTS: {' '.join(cmd)}")
+        print(f"DEBUG: Running Piper TTS with model {model_name}")
         try:
-            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
-            proc.communicate(input=text.encode('utf-8'))
-            if proc.returncode != 0:
-                raise Exception(f"Piper failed with return code {proc.returncode}")
+            # The worker keeps the model loaded between utterances
+            self.piper_workers.synthesize(model_path, text, filepath)
         except Exception as e:
             print(f"DEBUG: Piper failed: {e}, falling back to espeak")
             return self._generate_offline(text, filepath)
@@ -460,23 +823,159 @@ class PronunciationBackend:
             raise Exception(f"espeak-ng failed: {result.stderr}")
         return filepath
 
+    def _generate_offline_with_ipa(self, text: str, filepath: str, voice_id: str = None) -> Tuple[str, str]:
+        """Write the espeak-ng WAV and return (filepath, ipa) from the same process."""
+        if not filepath.endswith('.wav'): filepath = filepath.replace('.mp3', '.wav')
+        v = voice_id if voice_id else self._get_espeak_voice() + "+m3"
+        # --ipa prints the phonemes to stdout while -w writes the audio
+        cmd = ['espeak-ng', '-v', v, '-s', '150', '-p', '50', '-a', '100', '--ipa', '-w', filepath, text]
+        print(f"DEBUG: Running offline TTS with IPA: {' '.join(cmd)}")
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            print(f"DEBUG: espeak-ng failed: {result.stderr}")
+            raise Exception(f"espeak-ng failed: {result.stderr}")
+        raw_ipa = result.stdout.strip()
+        return filepath, GermanIPAProcessor.process(raw_ipa, text)
+
     def _generate_online(self, text: str, filepath: str, voice_accent: str = None):
         print(f"DEBUG: Running online TTS (gTTS) with accent={voice_accent}")
+        from gtts import gTTS
         # Use specified accent/tld or default to 'de'
         tld = voice_accent if voice_accent else 'de'
         # gTTS uses tld parameter for different accents
         if tld == 'de-at':
-            gTTS(text=text, lang='de', tld='at').save(filepath)
+            tts = gTTS(text=text, lang='de', tld='at', timeout=self.online_timeout)
         elif tld == 'de-ch':
-            gTTS(text=text, lang='de', tld='ch').save(filepath)
+            tts = gTTS(text=text, lang='de', tld='ch', timeout=self.online_timeout)
         else:
-            gTTS(text=text, lang='de').save(filepath)
+            tts = gTTS(text=text, lang='de', timeout=self.online_timeout)
+        # Write to a temp name so a cancelled race never leaves a partial MP3 in the cache
+        tmp_path = filepath + ".part"
+        tts.save(tmp_path)
+        os.replace(tmp_path, filepath)
+
+    def generate_hedged(self, text: str, online_voice: str = None, offline_voice_id: str = None,
+                        budget: float = 1.5) -> Tuple[Optional[str], bool]:
+        """Online synthesis with an offline hedge. Returns (audio_path, used_online).
+
+        The online request starts first; if it has not succeeded within
+        budget seconds (or fails sooner), offline synthesis starts alongside
+        it and whichever succeeds first wins. The loser keeps running and
+        lands in the audio cache, so it is ready next time.
+        """
+        cached = self.audio_cache.get(self._audio_cache_key(text, True, None, online_voice))
+        if cached:
+            return cached, True
+
+        results: "queue.Queue[Tuple[bool, Optional[str]]]" = queue.Queue()
+        def run(online: bool):
+            try:
+                path = self.generate_audio(text, online=online, voice_id=None if online else offline_voice_id,
+                                           online_voice=online_voice if online else None)
+            except Exception as e:
+                print(f"DEBUG: Hedged {'online' if online else 'offline'} synthesis failed: {e}")
+                path = None
+            results.put((online, path))
+
+        start = time.perf_counter()
+        threading.Thread(target=run, args=(True,), daemon=True).start()
+        pending = 1
+        try:
+            online, path = results.get(timeout=budget)
+            pending -= 1
+            if path:
+                return path, True
+            print("DEBUG: Online synthesis failed, using offline voice")
+        except queue.Empty:
+            print(f"DEBUG: Online synthesis exceeded {budget * 1000:.0f} ms budget, starting offline hedge")
+
+        threading.Thread(target=run, args=(False,), daemon=True).start()
+        pending += 1
+        while pending:
+            online, path = results.get()
+            pending -= 1
+            if path:
+                print(f"DEBUG: Hedged synthesis won by {'online' if online else 'offline'} "
+                      f"after {(time.perf_counter() - start) * 1000:.0f} ms")
+                return path, online
+        return None, False
+
+    def stop_playback(self):
+        """Stop anything currently playing, including a streaming generation."""
+        if self._playback is not None:
+            self._playback.stop()
+        if self._streaming_player is not None:
+            self._streaming_player.stop()
+            self._streaming_player = None
+
+    def speed_variant(self, filepath: str, speed: float) -> str:
+        """filepath played at speed (pitch unchanged), stretched once and then served from the audio cache."""
+        if abs(speed - 1.0) < 1e-3:
+            return filepath
+        stat = os.stat(filepath)
+        key = AudioCache.make_key(os.path.abspath(filepath), "stretch", speed=speed,
+                                  version=f"{stat.st_size}:{stat.st_mtime_ns}")
+        with self._key_lock(key):
+            cached = self.audio_cache.get(key)
+            if cached:
+                return cached
+            import soundfile as sf
+            from aussprachetrainer.audio_processing import time_stretch
+            samples, sample_rate = sf.read(filepath, dtype="float32", always_2d=True)
+            stretched = time_stretch(samples.mean(axis=1), speed, sample_rate)
+            path = self.audio_cache.path_for(key, ".wav")
+            sf.write(path, stretched, sample_rate, subtype="PCM_16")
+            self.audio_cache.commit(key, path)
+            print(f"DEBUG: Created {speed}x variant of {os.path.basename(filepath)}")
+            return path
+
+    def _at_playback_speed(self, filepath: str) -> str:
+        try:
+            return self.speed_variant(filepath, self.playback_speed)
+        except Exception as e:
+            print(f"DEBUG: Time-stretch failed ({e}), playing at normal speed")
+            return filepath
+
+    def play_file_async(self, filepath: str):
+        """Start playing filepath and return immediately; cancels the current clip."""
+        if not filepath or not os.path.exists(filepath):
+            print(f"DEBUG: Cannot play file, path invalid or not found: {filepath}")
+            return
+        if self._streaming_player is not None:
+            self._streaming_player.stop()
+            self._streaming_player = None
+        if abs(self.playback_speed - 1.0) >= 1e-3:
+            # Stretching a new variant takes a moment; keep it off the caller's (UI) thread
+            threading.Thread(target=lambda: self._start_playback(self._at_playback_speed(filepath)), daemon=True).start()
+        else:
+            self._start_playback(filepath)
+
+    def _start_playback(self, filepath: str):
+        if self.playback.is_available():
+            def on_error(e):
+                print(f"DEBUG: In-process playback failed ({e}), using external player")
+                self._play_file_external(filepath)
+            self.playback.play(filepath, on_error=on_error)
+        else:
+            threading.Thread(target=self._play_file_external, args=(filepath,), daemon=True).start()
 
     def play_file(self, filepath: str):
+        """Play filepath and block until it has finished."""
         if not filepath or not os.path.exists(filepath):
             print(f"DEBUG: Cannot play file, path invalid or not found: {filepath}")
             return
-        
+        filepath = self._at_playback_speed(filepath)
+        if self.playback.is_available():
+            try:
+                samples, sample_rate = self.playback.load(filepath)
+                self.playback.play_samples(samples, sample_rate)
+                self.playback.wait()
+                return
+            except Exception as e:
+                print(f"DEBUG: In-process playback failed ({e}), using external player")
+        self._play_file_external(filepath)
+
+    def _play_file_external(self, filepath: str):
         # Try both ffplay/paplay if aplay fails or for better compatibility
         if filepath.endswith('.wav'):
             # Some systems might prefer paplay or play (sox)
@@ -495,50 +994,131 @@ class PronunciationBackend:
     # --- Recording & Assessment ---
 
     def start_recording(self):
-        self.recording = True
-        self.recorded_frames = []
-        def callback(indata, frames, time, status):
-            if status:
-                print(f"DEBUG: Recording status: {status}")
-            if self.recording:
-                self.recorded_frames.append(indata.copy())
-        
         try:
-            # Open stream
-            self.stream = sd.InputStream(samplerate=self.fs, channels=1, callback=callback)
+            import sounddevice as sd
+            try:
+                # PortAudio delivers int16 at 16 kHz, so usually no conversion either
+                self._open_input(sd, self.fs)
+            except Exception as e:
+                native = int(sd.query_devices(kind="input")["default_samplerate"])
+                if native == self.fs:
+                    raise
+                # Some devices only run at their own rate; stop_capture resamples the take once
+                print(f"DEBUG: Input device rejected {self.fs} Hz ({e}), recording at {native} Hz")
+                self._open_input(sd, native)
             self.stream.start()
         except Exception as e:
             print(f"DEBUG: Failed to start recording stream: {e}")
             self.recording = False
             raise e
 
-    def stop_recording(self) -> str:
+    def _open_input(self, sd, rate: int):
+        from aussprachetrainer.capture import CaptureBuffer, VoiceActivityDetector
+        if self.capture is None or self.capture.sample_rate != rate:
+            self.capture = CaptureBuffer(rate)
+        self.capture.clear()
+        capture = self.capture
+        vad = self.vad = VoiceActivityDetector(rate, silence_ms=self.vad_silence_ms)
+        self.recording = True
+        def callback(indata, frames, time, status):
+            if status:
+                print(f"DEBUG: Recording status: {status}")
+            if self.recording:
+                # Copied straight into the preallocated buffer
+                capture.write(indata)
+                if not vad.ended and vad.push(indata) and self.auto_stop and self.on_auto_stop:
+                    print(f"DEBUG: VAD: speech ended, auto-stopping after {vad.processed / rate:.2f}s")
+                    try:
+                        self.on_auto_stop()
+                    except Exception as e:
+                        print(f"DEBUG: Auto-stop callback failed: {e}")
+
+        self.stream = sd.InputStream(samplerate=rate, channels=1, dtype="int16", callback=callback)
+
+    def stop_capture(self):
+        """Stop the microphone and return the take as in-memory sr.AudioData (None if empty).
+
+        Nothing touches the disk here. With save_recordings on, a WAV copy is
+        written by a low-priority job after the take is handed over.
+        """
         self.recording = False
         if hasattr(self, 'stream'):
             self.stream.stop()
             self.stream.close()
         
-        if not self.recorded_frames:
+        if self.capture is None or not len(self.capture):
             print("DEBUG: No frames recorded")
             return None
         
-        audio_data = np.concatenate(self.recorded_frames, axis=0)
-        temp_wav = os.path.join(self.session_dir, "recorded.wav")
-        import wave
-        with wave.open(temp_wav, 'wb') as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2) # 16-bit
-            wf.setframerate(self.fs)
-            wf.writeframes((audio_data * 32767).astype(np.int16).tobytes())
-        return temp_wav
-
-    def assess_pronunciation(self, target_text: str, audio_path: str, online: bool = True) -> Dict:
-        if not audio_path: return {"error": "No audio"}
+        audio_data = self.capture.view()  # int16, no copy
+        rate = self.capture.sample_rate
+        # Only send the speech (plus a little padding) to ASR
+        segment = self.vad.segment() if self.vad is not None else None
+        if segment and not self.capture.wrapped:
+            start, end = segment
+            print(f"DEBUG: VAD: trimmed take to {start / rate:.2f}-{end / rate:.2f}s of {len(audio_data) / rate:.2f}s")
+            audio_data = audio_data[start:end]
+        if rate != self.fs:
+            # Recorded at the device's own rate: convert the trimmed take once, for ASR and saving alike
+            import numpy as np
+            from aussprachetrainer.playback import resample_linear
+            resampled = resample_linear(audio_data.astype(np.float32), rate, self.fs)
+            audio_data = np.rint(resampled).astype(np.int16)
+        import speech_recognition as sr
+        # tobytes() is the one copy, so the buffer is free for the next take
+        take = sr.AudioData(audio_data.tobytes(), self.fs, 2)
+        if self.save_recordings:
+            path = os.path.join(self.recordings_dir, time.strftime("take_%Y%m%d_%H%M%S.wav"))
+            self.jobs.submit("save_take", lambda job: self.save_take(take, path), priority=PRIORITY_LOW, supersede=False)
+        return take
+
+    def save_take(self, take, path: str) -> Optional[str]:
+        """Write an sr.AudioData take to path as a 16-bit mono WAV."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            import wave
+            tmp = path + ".tmp"
+            with wave.open(tmp, 'wb') as wf:
+                wf.setnchannels(1)
+                wf.setsampwidth(take.sample_width)
+                wf.setframerate(take.sample_rate)
+                wf.writeframes(take.frame_data)
+            os.replace(tmp, path)
+            self.last_recording_path = path
+            print(f"DEBUG: Saved recording to {path}")
+            return path
+        except Exception as e:
+            print(f"DEBUG: Failed to save recording: {e}")
+            return None
+
+    def stop_recording(self) -> str:
+        """Stop the microphone and write the take to recorded.wav (for callers that want a file)."""
+        save, self.save_recordings = self.save_recordings, False
+        try:
+            take = self.stop_capture()
+        finally:
+            self.save_recordings = save
+        if take is None:
+            return None
+        return self.save_take(take, os.path.join(self.session_dir, "recorded.wav"))
+
+    def _audio_data(self, audio):
+        """sr.AudioData for a take that is either already in memory or a WAV path."""
+        import speech_recognition as sr
+        if isinstance(audio, sr.AudioData):
+            return audio
+        with sr.AudioFile(audio) as source:
+            return sr.Recognizer().record(source)
+
+    def assess_pronunciation(self, target_text: str, audio, online: bool = True) -> Dict:
+        """Score a take against target_text. audio is an sr.AudioData from stop_capture or a WAV path."""
+        if not audio: return {"error": "No audio"}
         
         recognized_text = ""
         try:
-            if online: recognized_text = self._transcribe_online(audio_path)
-            else: recognized_text = self._transcribe_offline(audio_path)
+            audio = self._audio_data(audio)
+            if online: recognized_text = self._transcribe_online(audio)
+            else: recognized_text = self._transcribe_offline(audio, target_text)
         except Exception as e:
             return {"error": f"ASR failed: {e}"}
             
@@ -553,9 +1133,14 @@ class PronunciationBackend:
         target_ipa = self.get_ipa(target_text)
         actual_ipa = self.get_ipa(recognized_text)
         
+        phonemes = []
         if target_ipa and actual_ipa:
-            # We use normalized Levenshtein on IPA strings for stricter phonetic assessment
-            ipa_score = distance.Levenshtein.normalized_similarity(target_ipa, actual_ipa)
+            # Phoneme segments aligned with articulatory-feature costs, so /b/ for /p/
+            # costs less than /a/ for /p/ and a diacritic is not a whole character
+            from aussprachetrainer.phonemes import align
+            alignment = align(target_ipa, actual_ipa)
+            ipa_score = alignment.score
+            phonemes = [op._asdict() for op in alignment.ops]
             # Weighted combine: IPA counts more for "strictness"
             combined_score = (0.3 * text_score) + (0.7 * ipa_score)
         else:
@@ -566,28 +1151,60 @@ class PronunciationBackend:
             "actual": recognized_text,
             "score": int(combined_score * 100),
             "target_ipa": target_ipa,
-            "actual_ipa": actual_ipa
+            "actual_ipa": actual_ipa,
+            # Per-segment ops (match/sub/del/ins) with spans into target_ipa / actual_ipa
+            "phonemes": phonemes
         }
 
-    def _transcribe_online(self, audio_path: str) -> str:
+    def _transcribe_online(self, audio) -> str:
+        import speech_recognition as sr
         r = sr.Recognizer()
-        with sr.AudioFile(audio_path) as source:
-            audio = r.record(source)
+        audio = self._audio_data(audio)
         try:
             return r.recognize_google(audio, language=self.dialect)
         except:
             return ""
 
-    def _transcribe_offline(self, audio_path: str) -> str:
-        r = sr.Recognizer()
-        with sr.AudioFile(audio_path) as source:
-            audio = r.record(source)
+    def get_sphinx_decoder(self):
+        """The warm pocketsphinx decoder for the current dialect, loaded on first use."""
+        from aussprachetrainer.offline_asr import SphinxDecoder, sphinx_model_paths, speech_recognition_data_dir
+        search_dirs = [os.path.join(self.models_dir, "pocketsphinx"), speech_recognition_data_dir()]
+        paths = sphinx_model_paths([self.dialect, self.dialect.split('-')[0]], [d for d in search_dirs if d])
+        if paths is None:
+            raise FileNotFoundError(f"no pocketsphinx model for {self.dialect}")
+        with self._sphinx_lock:
+            # Keyed by model, so dialects sharing one model share the decoder
+            decoder = self._sphinx.get(paths)
+            if decoder is None:
+                start = time.perf_counter()
+                decoder = self._sphinx[paths] = SphinxDecoder(paths)
+                print(f"DEBUG: Loaded pocketsphinx model for {self.dialect} in {time.perf_counter() - start:.2f}s")
+            return decoder
+
+    def prepare_offline_asr(self):
+        """Load the offline recogniser ahead of the first assessment."""
+        try:
+            self.get_sphinx_decoder()
+        except Exception as e:
+            print(f"DEBUG: Offline ASR not available: {e}")
+
+    def _transcribe_offline(self, audio, target_text: Optional[str] = None) -> str:
+        audio = self._audio_data(audio)
         try:
-            lang = self.dialect.split('-')[0]
-            return r.recognize_pocketsphinx(audio, language=lang)
-        except sr.UnknownValueError:
-            return "[Offline ASR: No speech detected or not understood]"
-        except sr.RequestError as e:
+            decoder = self.get_sphinx_decoder()
+        except FileNotFoundError:
             return f"[Offline ASR: Pocketsphinx error (missing {self.dialect} model?)]"
+        except ImportError:
+            return "[Offline ASR: pocketsphinx is not installed]"
+        except Exception as e:
+            return f"[Offline ASR failed: {str(e)}]"
+        try:
+            raw = audio.get_raw_data(convert_rate=16000, convert_width=2)
+            mode = self.offline_asr_mode if target_text else "lm"
+            text = decoder.decode(raw, target_text, mode)
+            if text is None and mode != "lm":
+                # Nothing matched the target: let the open vocabulary say what was heard
+                text = decoder.decode(raw)
+            return text or "[Offline ASR: No speech detected or not understood]"
         except Exception as e:
             return f"[Offline ASR failed: {str(e)}]"
@@ -0,0 +1,158 @@
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Set, Tuple
+
+DIALECTS = ["de-DE", "de-AT", "de-CH"]
+
+# Backend owned by each pool worker, created once so its engine stays warm
+_backend = None
+
+def load_phrases(path: str) -> List[str]:
+    """One phrase per line; blank lines and '#' comments are skipped.
+
+    Tab-separated decks (e.g. Anki exports) use their first column.
+    Duplicates are dropped, keeping the first occurrence.
+    """
+    phrases: List[str] = []
+    seen: Set[str] = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            phrase = " ".join(line.split("\t")[0].split())
+            if not phrase or phrase.startswith("#") or phrase in seen:
+                continue
+            seen.add(phrase)
+            phrases.append(phrase)
+    return phrases
+
+class BatchProgress:
+    """Append-only log of finished phrases, so an interrupted run can resume."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+
+    def mark(self, phrase: str):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(phrase + "\n")
+        self.done.add(phrase)
+
+def _init_worker(dialect: str, voice_id: Optional[str], workers: int = 1):
+    global _backend
+    from aussprachetrainer.audio_cache import AudioCache
+    from aussprachetrainer.backend import PronunciationBackend
+    from aussprachetrainer.onnx_session import SessionSettings
+    # The parent owns index.db and the history; workers hand their new cache entries back with each result
+    _backend = PronunciationBackend(audio_cache=AudioCache(read_only=True), history=False)
+    _backend.set_dialect(dialect)
+    # Parallelism comes from the process pool; threads per worker would oversubscribe
+    _backend.segment_threads = 1
+    _backend.piper_workers.workers_per_model = 1
+    _backend.set_onnx_settings(SessionSettings(intra_op_threads=max(1, (os.cpu_count() or 1) // max(1, workers))))
+    if voice_id:
+        _backend.prepare_voice(voice_id)
+
+def _synthesize(phrase: str, online: bool, voice_id: Optional[str], online_voice: Optional[str]
+                ) -> Tuple[str, str, Optional[str], Optional[str], List[Tuple[str, str]]]:
+    """Runs in a pool worker. Returns (phrase, ipa, audio_path, error, new cache entries)."""
+    try:
+        ipa, path = _backend.generate_with_ipa(phrase, online=online, voice_id=voice_id, online_voice=online_voice)
+        result = phrase, ipa, path, None if path else "synthesis failed"
+    except Exception as e:
+        result = phrase, "", None, str(e)
+    return result + (_backend.audio_cache.take_pending(),)
+
+def run_batch(phrases: List[str], progress: BatchProgress, executor: Executor,
+              store: Optional[Callable[[str, str, str], None]] = None,
+              online: bool = False, voice_id: Optional[str] = None, online_voice: Optional[str] = None,
+              report_every: int = 25, cache=None) -> dict:
+    """Synthesize every phrase not yet in progress, calling store(phrase, ipa, path) for each result.
+
+    Cache entries written by the workers are committed to cache (an AudioCache) here.
+    """
+    todo = [p for p in phrases if p not in progress.done]
+    stats = {"total": len(phrases), "skipped": len(phrases) - len(todo), "done": 0, "failed": 0, "elapsed": 0.0}
+    if stats["skipped"]:
+        print(f"Resuming: {stats['skipped']} of {len(phrases)} phrases already done")
+    start = time.perf_counter()
+    futures = [executor.submit(_synthesize, p, online, voice_id, online_voice) for p in todo]
+    for i, future in enumerate(as_completed(futures), 1):
+        phrase, ipa, path, error, entries = future.result()
+        if cache is not None:
+            for key, entry_path in entries:
+                if os.path.exists(entry_path):
+                    cache.commit(key, entry_path)
+        if error:
+            stats["failed"] += 1
+            print(f"FAILED: {phrase}: {error}")
+        else:
+            if store:
+                store(phrase, ipa, path)
+            progress.mark(phrase)
+            stats["done"] += 1
+        if i % report_every == 0 or i == len(todo):
+            elapsed = time.perf_counter() - start
+            rate = i / elapsed if elapsed > 0 else 0.0
+            eta = (len(todo) - i) / rate if rate else 0.0
+            print(f"[{i}/{len(todo)}] {rate:.1f} phrases/s, ETA {eta:.0f}s")
+    stats["elapsed"] = time.perf_counter() - start
+    return stats
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="aussprachetrainer batch",
+                                     description="Generate audio and IPA for every phrase in a file.")
+    parser.add_argument("input", help="Text file with one word or phrase per line")
+    parser.add_argument("--voice", default="de+m3", help="Offline voice id (e.g. de+m3, piper:<model>, kokoro:<voice>)")
+    parser.add_argument("--online", action="store_true", help="Use Google TTS instead of an offline voice")
+    parser.add_argument("--online-voice", default="de", help="gTTS language/accent when --online is set")
+    parser.add_argument("--dialect", default="de-DE", choices=DIALECTS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--progress", help="Progress file (default: <input>.progress)")
+    parser.add_argument("--restart", action="store_true", help="Ignore previous progress")
+    parser.add_argument("--no-history", action="store_true", help="Only fill the audio cache")
+    args = parser.parse_args(argv)
+
+    phrases = load_phrases(args.input)
+    progress_path = args.progress or args.input + ".progress"
+    if args.restart and os.path.exists(progress_path):
+        os.remove(progress_path)
+    progress = BatchProgress(progress_path)
+
+    from aussprachetrainer.audio_cache import AudioCache
+    from aussprachetrainer.config import ConfigManager
+    # History and the cache index are written from this process only, so workers never contend for the DBs
+    cache = AudioCache(max_bytes=int(ConfigManager().get("audio_cache_mb") or 512) * 1024 * 1024)
+    store = None
+    backend = None
+    if not args.no_history:
+        from aussprachetrainer.backend import PronunciationBackend
+        backend = PronunciationBackend(audio_cache=cache)
+        voice = args.online_voice if args.online else args.voice
+        store = lambda phrase, ipa, path: backend.store_history_entry(phrase, ipa, path, "Batch", voice)
+
+    voice_id = None if args.online else args.voice
+    print(f"Generating {len(phrases)} phrases with {args.workers} workers")
+    # spawn: workers build their own engines instead of inheriting this process's threads
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=ctx,
+                             initializer=_init_worker, initargs=(args.dialect, voice_id, args.workers)) as executor:
+        stats = run_batch(phrases, progress, executor, store=store, online=args.online,
+                          voice_id=voice_id, online_voice=args.online_voice if args.online else None,
+                          cache=cache)
+
+    if backend is not None:
+        backend.transcoder.join()
+        backend.shutdown()
+    rate = stats["done"] / stats["elapsed"] if stats["elapsed"] > 0 else 0.0
+    print(f"Done: {stats['done']} generated, {stats['skipped']} skipped, {stats['failed']} failed "
+          f"in {stats['elapsed']:.1f}s ({rate:.1f} phrases/s)")
+    return 1 if stats["failed"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
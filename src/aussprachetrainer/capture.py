@@ -0,0 +1,286 @@
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Native rate of the speech recognisers (Google, pocketsphinx)
+CAPTURE_RATE = 16000
+
+class CaptureBuffer:
+    """Pre-allocated int16 store for microphone blocks.
+
+    write() copies each block into the buffer in place, converting from
+    float if needed, so the audio callback allocates nothing. The buffer
+    doubles when full, up to max_seconds. After that it becomes a ring that
+    overwrites the oldest audio. view() returns the take without copying,
+    unless the ring has wrapped.
+    """
+
+    def __init__(self, sample_rate: int = CAPTURE_RATE, initial_seconds: float = 10.0, max_seconds: float = 300.0):
+        self.sample_rate = sample_rate
+        self.max_samples = int(max_seconds * sample_rate)
+        self._buf = np.zeros(min(int(initial_seconds * sample_rate), self.max_samples), dtype=np.int16)
+        self._scratch = np.zeros(0, dtype=np.float32)
+        self._pos = 0
+        self._wrapped = False
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        return len(self._buf)
+
+    @property
+    def wrapped(self) -> bool:
+        """True once the ring has overwritten the start of the take."""
+        return self._wrapped
+
+    def __len__(self) -> int:
+        return self.capacity if self._wrapped else self._pos
+
+    @property
+    def duration(self) -> float:
+        return len(self) / self.sample_rate
+
+    def clear(self):
+        """Start a new take, keeping the allocation."""
+        with self._lock:
+            self._pos = 0
+            self._wrapped = False
+
+    def _grow(self, needed: int):
+        size = min(max(needed, 2 * len(self._buf)), self.max_samples)
+        if size <= len(self._buf):
+            return
+        grown = np.zeros(size, dtype=np.int16)
+        grown[:self._pos] = self._buf[:self._pos]
+        self._buf = grown
+
+    def _store(self, dest: np.ndarray, block: np.ndarray):
+        if block.dtype == np.int16:
+            dest[...] = block
+            return
+        # float in [-1, 1]: clip into the scratch buffer, then scale straight into dest
+        if len(self._scratch) < len(block):
+            self._scratch = np.zeros(len(block), dtype=np.float32)
+        scratch = self._scratch[:len(block)]
+        np.clip(block, -1.0, 1.0, out=scratch)
+        np.multiply(scratch, 32767, out=dest, casting="unsafe")
+
+    def write(self, block: np.ndarray):
+        """Append one mono block (int16, or float in [-1, 1]); safe to call from the audio callback."""
+        if block.ndim > 1:
+            block = block[:, 0]
+        with self._lock:
+            if self._pos + len(block) > len(self._buf) and not self._wrapped:
+                self._grow(self._pos + len(block))
+            size = len(self._buf)
+            end = self._pos + len(block)
+            if end <= size:
+                self._store(self._buf[self._pos:end], block)
+                self._pos = end
+                if end == size and size >= self.max_samples:
+                    # Full at the cap: from now on the oldest audio is overwritten
+                    self._pos = 0
+                    self._wrapped = True
+            elif len(block) >= size:
+                # Longer than the whole ring: only the newest audio survives
+                self._store(self._buf, block[len(block) - size:])
+                self._pos = 0
+                self._wrapped = True
+            else:
+                first = size - self._pos
+                self._store(self._buf[self._pos:], block[:first])
+                self._store(self._buf[:len(block) - first], block[first:])
+                self._pos = len(block) - first
+                self._wrapped = True
+
+    def view(self) -> np.ndarray:
+        """The take so far, oldest sample first.
+
+        A view into the buffer (valid until the next write or clear) unless
+        the ring has wrapped, in which case it is reassembled into a copy.
+        """
+        with self._lock:
+            if not self._wrapped:
+                return self._buf[:self._pos]
+            return np.concatenate([self._buf[self._pos:], self._buf[:self._pos]])
+
+class VoiceActivityDetector:
+    """Streaming energy + zero-crossing VAD, fed the same blocks as CaptureBuffer.
+
+    Each block is cut into 10 ms frames and scored in one vectorised pass.
+    A frame is voiced when its energy is `margin_db` above the running noise
+    floor, or, for quiet fricatives like /s/ and /f/, when it is at least
+    `fricative_margin_db` above the floor and crosses zero often.
+    Speech starts after `min_speech_ms` of consecutive voiced frames. The
+    take has ended once `silence_ms` of unvoiced audio follows it.
+
+    Like CaptureBuffer, push() works in scratch arrays allocated on the first
+    block (and regrown only if a longer block arrives), so the audio callback
+    allocates nothing block-sized.
+    """
+
+    def __init__(self, sample_rate: int = CAPTURE_RATE, silence_ms: float = 800.0, min_speech_ms: float = 60.0,
+                 margin_db: float = 12.0, fricative_margin_db: float = 6.0, fricative_zcr: float = 0.3,
+                 min_energy_db: float = -55.0):
+        self.sample_rate = sample_rate
+        self.frame = max(1, sample_rate // 100)
+        self.silence_frames = max(1, int(silence_ms / 10))
+        self.min_speech_frames = max(1, int(min_speech_ms / 10))
+        self.margin_db = margin_db
+        self.fricative_margin_db = fricative_margin_db
+        self.fricative_zcr = fricative_zcr
+        self.min_energy_db = min_energy_db
+        self._buf = np.zeros(0, dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self.noise_floor: Optional[float] = None
+        self.processed = 0  # samples consumed, in complete frames
+        self.speech_start: Optional[int] = None
+        self.speech_end: Optional[int] = None
+        self.ended = False
+        self._run = 0
+        self._run_start = 0
+        self._rest = 0  # samples short of a whole frame, kept at the start of _buf
+
+    def _reserve(self, samples: int):
+        """Grow the scratch arrays to hold samples, keeping the leftover partial frame."""
+        samples = max(samples, 2 * len(self._buf))
+        frames = samples // self.frame
+        buf = np.zeros(samples, dtype=np.float32)
+        buf[:self._rest] = self._buf[:self._rest]
+        self._buf = buf
+        self._signs = np.zeros(frames * self.frame, dtype=bool)
+        self._crossings = np.zeros(frames * max(1, self.frame - 1), dtype=bool)
+        self._energy = np.zeros(frames, dtype=np.float32)
+        self._zcr = np.zeros(frames, dtype=np.float32)
+        self._voiced = np.zeros(frames, dtype=bool)
+        self._mask = np.zeros(frames, dtype=bool)
+        self._index = np.arange(frames, dtype=np.int64)
+        self._last_gap = np.zeros(frames, dtype=np.int64)
+        self._last_end = np.zeros(frames, dtype=np.int64)
+        self._run_length = np.zeros(frames, dtype=np.int64)
+        self._silence = np.zeros(frames, dtype=np.int64)
+
+    def _score(self, frames: np.ndarray) -> np.ndarray:
+        count = len(frames)
+        energy, zcr = self._energy[:count], self._zcr[:count]
+        voiced, mask = self._voiced[:count], self._mask[:count]
+        np.einsum("ij,ij->i", frames, frames, out=energy)
+        energy *= 1.0 / self.frame
+        energy += 1e-10
+        np.log10(energy, out=energy)
+        energy *= 10
+        signs = np.signbit(frames, out=self._signs[:frames.size].reshape(frames.shape))
+        if self.frame > 1:
+            crossings = self._crossings[:count * (self.frame - 1)].reshape(count, self.frame - 1)
+            np.not_equal(signs[:, 1:], signs[:, :-1], out=crossings)
+            np.sum(crossings, axis=1, dtype=np.float32, out=zcr)
+            zcr *= 1.0 / (self.frame - 1)
+        else:
+            zcr[:] = 0
+        if self.noise_floor is None:
+            self.noise_floor = float(energy.min())
+        floor = self.noise_floor
+        np.greater(zcr, self.fricative_zcr, out=voiced)
+        np.greater(energy, floor + self.fricative_margin_db, out=mask)
+        voiced &= mask
+        np.greater(energy, floor + self.margin_db, out=mask)
+        voiced |= mask
+        np.greater(energy, self.min_energy_db, out=mask)
+        voiced &= mask
+        # The floor drops at once and rises slowly through unvoiced frames,
+        # so it follows the room rather than the speaker
+        quiet = count - int(np.count_nonzero(voiced))
+        if quiet:
+            quiet_mean = (float(energy.sum()) - float(np.sum(energy, where=voiced))) / quiet
+            floor += (quiet_mean - floor) * (1 - 0.95 ** quiet)
+        self.noise_floor = min(floor, float(energy.min()))
+        return voiced
+
+    def push(self, block: np.ndarray) -> bool:
+        """Feed one mono block (int16, or float in [-1, 1]). Returns True once the utterance has ended."""
+        if self.ended:
+            return True
+        x = np.asarray(block).reshape(len(block), -1)[:, 0]
+        size = self._rest + len(x)
+        if size > len(self._buf):
+            # Room for a leftover partial frame too, so equal blocks never regrow
+            self._reserve(size + self.frame)
+        dest = self._buf[self._rest:size]
+        np.copyto(dest, x, casting="unsafe")
+        if x.dtype == np.int16:
+            dest *= 1.0 / 32768.0
+        count = size // self.frame
+        if not count:
+            self._rest = size
+            return False
+        used = count * self.frame
+        voiced = self._score(self._buf[:used].reshape(count, self.frame))
+        self._track(voiced)
+        # Keep the partial frame for the next block (never overlaps: it is shorter than a frame)
+        self._rest = size - used
+        self._buf[:self._rest] = self._buf[used:size]
+        self.processed += used
+        return self.ended
+
+    def _track(self, voiced: np.ndarray):
+        """Advance the speech/silence state over one block of frame decisions, without a per-frame loop."""
+        count = len(voiced)
+        index = self._index[:count]
+        if not self._run:
+            self._run_start = self.processed
+        # Most recent unvoiced frame at or before each frame; -1 while the run
+        # carried in from the previous block goes on (a prefix, as it only grows)
+        last_gap = self._last_gap[:count]
+        np.copyto(last_gap, index)
+        last_gap[voiced] = -1
+        np.maximum.accumulate(last_gap, out=last_gap)
+        carried = int(np.searchsorted(last_gap, 0))
+        # Voiced frames whose run has lasted min_speech_frames extend the speech
+        run = self._run_length[:count]
+        np.subtract(index, last_gap, out=run)
+        run[:carried] += self._run
+        speaking = self._mask[:count]
+        np.greater_equal(run, self.min_speech_frames, out=speaking)
+        speaking &= voiced
+        # Unvoiced frames since the speech last extended; the first to reach
+        # silence_frames ends the take
+        last_end = self._last_end[:count]
+        last_end[:] = -1
+        np.copyto(last_end, index, where=speaking)
+        np.maximum.accumulate(last_end, out=last_end)
+        silence = self._silence[:count]
+        np.subtract(index, last_end, out=silence)
+        before = int(np.searchsorted(last_end, 0))
+        if self.speech_end is None:
+            silence[:before] = 0
+        else:
+            silence[:before] += (self.processed - self.speech_end) // self.frame
+        silence[voiced] = 0
+        stop = int(np.argmax(silence))
+        stopped = silence[stop] >= self.silence_frames
+        if stopped:
+            stop = int(np.argmax(silence >= self.silence_frames))
+        talked = speaking[:stop + 1] if stopped else speaking
+        if talked.any():
+            if self.speech_start is None:
+                first = int(np.argmax(talked))
+                gap = int(last_gap[first])
+                self.speech_start = self._run_start if gap < 0 else self.processed + (gap + 1) * self.frame
+            last = len(talked) - 1 - int(np.argmax(talked[::-1]))
+            self.speech_end = self.processed + (last + 1) * self.frame
+        if stopped:
+            self.ended = True
+            return
+        if carried < count:
+            self._run_start = self.processed + (int(last_gap[-1]) + 1) * self.frame
+        self._run = int(run[-1])
+
+    def segment(self, pad_ms: float = 150.0) -> Optional[Tuple[int, int]]:
+        """(start, end) sample bounds of the detected speech plus padding, or None if there was none."""
+        if self.speech_start is None:
+            return None
+        pad = int(self.sample_rate * pad_ms / 1000)
+        return max(0, self.speech_start - pad), min(self.processed + self._rest, self.speech_end + pad)
@@ -26,7 +26,25 @@ class ConfigManager:
             "window_width": 1100,
             "window_height": 700,
             "window_x": 100,
-            "window_y": 100
+            "window_y": 100,
+            "audio_cache_mb": 512,
+            "compress_audio": True,
+            "prefetch_cpu_budget": 0.25,
+            "prefetch_online": False,
+            "connectivity_target": "8.8.8.8:53",
+            "connectivity_ttl": 30,
+            "hedge_budget_ms": 1500,
+            "onnx_intra_threads": 0,
+            "onnx_inter_threads": 1,
+            "onnx_graph_optimization": "all",
+            "onnx_cache_optimized": True,
+            "playback_speed": 1.0,
+            "normalize_audio": True,
+            "target_loudness_db": -20.0,
+            "vad_auto_stop": True,
+            "vad_silence_ms": 800,
+            "save_recordings": False,
+            "offline_asr_mode": "lm"
         }
         self.settings = self.defaults.copy()
         self.load()
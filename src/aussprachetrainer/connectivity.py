@@ -0,0 +1,108 @@
+import socket
+import threading
+import time
+from typing import Callable, Optional, Tuple
+
+def parse_target(target: str, default_port: int = 53) -> Tuple[str, int]:
+    """"host:port" (or just "host") -> (host, port)."""
+    host, sep, port = target.strip().rpartition(":")
+    if not sep or not port.isdigit():
+        return target.strip(), default_port
+    return host.strip("[]"), int(port)
+
+class ConnectivityMonitor:
+    """Background reachability check so callers never wait on the network.
+
+    A daemon thread probes host:port with a TCP connect. While online it
+    re-checks every `ttl` seconds; while offline it retries after
+    `retry_interval`, doubling up to `max_backoff`. is_online is just the
+    last result. on_change(online) is called from the monitor thread
+    whenever the state flips.
+    """
+
+    def __init__(self, host: str = "8.8.8.8", port: int = 53, timeout: float = 2.0, ttl: float = 30.0,
+                 retry_interval: float = 5.0, max_backoff: float = 60.0,
+                 on_change: Optional[Callable[[bool], None]] = None):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.ttl = ttl
+        self.retry_interval = retry_interval
+        self.max_backoff = max_backoff
+        self.on_change = on_change
+        self._online: Optional[bool] = None
+        self.last_checked: Optional[float] = None
+        self._backoff = retry_interval
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_online(self) -> bool:
+        """Last known state; False until the first probe has finished."""
+        return bool(self._online)
+
+    @property
+    def known(self) -> bool:
+        return self._online is not None
+
+    def probe(self) -> bool:
+        try:
+            with socket.create_connection((self.host, self.port), timeout=self.timeout):
+                return True
+        except OSError:
+            return False
+
+    def check_now(self) -> bool:
+        """Probe synchronously and update the cached state."""
+        self._set(self.probe())
+        return self.is_online
+
+    def mark_offline(self):
+        """Record a failed network request without waiting for the next probe."""
+        self._set(False)
+        self.refresh()
+
+    def refresh(self):
+        """Probe again soon instead of waiting out the TTL/backoff."""
+        self._wake.set()
+
+    def next_interval(self) -> float:
+        return self.ttl if self._online else self._backoff
+
+    def _set(self, online: bool):
+        with self._lock:
+            changed = online != self._online
+            self._online = online
+            self.last_checked = time.monotonic()
+            if online:
+                self._backoff = self.retry_interval
+            elif not changed:
+                self._backoff = min(self._backoff * 2, self.max_backoff)
+        if changed:
+            print(f"DEBUG: Connectivity changed: {'online' if online else 'offline'}")
+            if self.on_change:
+                try:
+                    self.on_change(online)
+                except Exception as e:
+                    print(f"DEBUG: Connectivity callback failed: {e}")
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            # Clear before probing: a refresh() during the probe keeps the
+            # event set, so the wait below returns at once instead of sleeping
+            self._wake.clear()
+            self.check_now()
+            self._wake.wait(self.next_interval())
@@ -44,20 +44,97 @@ class HistoryManager:
                 if col not in existing_columns:
                     print(f"DEBUG: Adding missing column {col} to history table")
                     conn.execute(f"ALTER TABLE history ADD COLUMN {col} {definition}")
+
+            # Reference counts for audio files shared between history entries
+            has_refs = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'audio_refs'"
+            ).fetchone()
+            if not has_refs:
+                conn.execute("""
+                    CREATE TABLE audio_refs (
+                        path TEXT PRIMARY KEY,
+                        refcount INTEGER NOT NULL
+                    )
+                """)
+                # Migration: count references held by existing entries
+                conn.execute("""
+                    INSERT INTO audio_refs (path, refcount)
+                    SELECT audio_path, COUNT(*) FROM history
+                    WHERE audio_path IS NOT NULL GROUP BY audio_path
+                """)
             
             conn.commit()
 
+    def _retain_audio(self, conn: sqlite3.Connection, path: str):
+        if not path:
+            return
+        conn.execute(
+            "INSERT INTO audio_refs (path, refcount) VALUES (?, 1) "
+            "ON CONFLICT(path) DO UPDATE SET refcount = refcount + 1",
+            (path,)
+        )
+
+    def _release_audio(self, conn: sqlite3.Connection, paths: List[str]) -> List[str]:
+        """Drop one reference per path; returns the paths that are no longer referenced."""
+        freed = []
+        for path in paths:
+            if not path:
+                continue
+            conn.execute("UPDATE audio_refs SET refcount = refcount - 1 WHERE path = ?", (path,))
+            row = conn.execute("SELECT refcount FROM audio_refs WHERE path = ?", (path,)).fetchone()
+            if row is None or row[0] <= 0:
+                conn.execute("DELETE FROM audio_refs WHERE path = ?", (path,))
+                freed.append(path)
+        return freed
+
+    @staticmethod
+    def _remove_files(paths: List[str]):
+        for path in paths:
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except Exception as e:
+                print(f"DEBUG: Failed to remove audio file {path}: {e}")
+
+    def audio_refcount(self, path: str) -> int:
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute("SELECT refcount FROM audio_refs WHERE path = ?", (path,)).fetchone()
+            return row[0] if row else 0
+
     def add_entry(self, text: str, ipa: str, audio_path: str, mode: str, voice_id: str):
         with sqlite3.connect(self.db_path) as conn:
             # Deduplication: Delete existing entry with the same text
             # This ensures that duplicates are removed and the "fresh" one is at the top
+            old_paths = [row[0] for row in conn.execute("SELECT audio_path FROM history WHERE text = ?", (text,))]
             conn.execute("DELETE FROM history WHERE text = ?", (text,))
             
             conn.execute(
                 "INSERT INTO history (text, ipa, audio_path, mode, voice_id) VALUES (?, ?, ?, ?, ?)",
                 (text, ipa, audio_path, mode, voice_id)
             )
+            # Take the new reference first so re-practising a phrase keeps its blob
+            self._retain_audio(conn, audio_path)
+            freed = self._release_audio(conn, old_paths)
+            conn.commit()
+        self._remove_files(freed)
+
+    def replace_audio_path(self, old_path: str, new_path: str) -> int:
+        """Point every entry using old_path at new_path, moving its references.
+
+        Returns the number of entries updated."""
+        with sqlite3.connect(self.db_path) as conn:
+            updated = conn.execute("UPDATE history SET audio_path = ? WHERE audio_path = ?",
+                                   (new_path, old_path)).rowcount
+            row = conn.execute("SELECT refcount FROM audio_refs WHERE path = ?", (old_path,)).fetchone()
+            if row:
+                conn.execute("DELETE FROM audio_refs WHERE path = ?", (old_path,))
+                conn.execute(
+                    "INSERT INTO audio_refs (path, refcount) VALUES (?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET refcount = refcount + excluded.refcount",
+                    (new_path, row[0])
+                )
             conn.commit()
+            return updated
 
     def get_history(self, search_query: str = None) -> List[Dict]:
         with sqlite3.connect(self.db_path) as conn:
@@ -73,25 +150,23 @@ class HistoryManager:
             return [dict(row) for row in cursor.fetchall()]
 
     def delete_entry(self, entry_id: int):
-        # We might want to delete the audio file too, but let's stick to DB for now
+        """Delete an entry and its audio file once no other entry references it."""
         with sqlite3.connect(self.db_path) as conn:
+            paths = [row[0] for row in conn.execute("SELECT audio_path FROM history WHERE id = ?", (entry_id,))]
             conn.execute("DELETE FROM history WHERE id = ?", (entry_id,))
+            freed = self._release_audio(conn, paths)
             conn.commit()
+        self._remove_files(freed)
 
     def clear_history(self):
-        # First, remove all audio files associated with history
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT audio_path FROM history WHERE audio_path IS NOT NULL")
-            for row in cursor.fetchall():
-                try:
-                    if os.path.exists(row[0]):
-                        os.remove(row[0])
-                except Exception as e:
-                    print(f"DEBUG: Failed to remove audio file {row[0]}: {e}")
-            
-            # Then clear the table
+            cursor = conn.execute("SELECT DISTINCT audio_path FROM history WHERE audio_path IS NOT NULL")
+            paths = [row[0] for row in cursor.fetchall()]
             conn.execute("DELETE FROM history")
+            conn.execute("DELETE FROM audio_refs")
             conn.commit()
+        # Then remove all audio files associated with history
+        self._remove_files(paths)
 
     def cleanup_orphaned_audio(self, audio_dir: str):
         """Remove audio files from audio_dir that are not referenced in the database."""
@@ -0,0 +1,249 @@
+import hashlib
+import http.client
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# Hugging Face rather than the GitHub release, so the .onnx files come with their LFS sha256
+PIPER_BASE_URL = "https://huggingface.co/rhasspy/piper-voices/resolve/v1.0.0/"
+KOKORO_FILES = {
+    "kokoro-v0_19.onnx": "https://huggingface.co/hexgrad/Kokoro-82M/resolve/main/kokoro-v0_19.onnx",
+    "voices.json": "https://huggingface.co/hexgrad/Kokoro-82M/resolve/main/voices.json"
+}
+# Pinned checksums (filename -> sha256). A file with a pin must match it, on
+# download and when found on disk without a manifest entry. Files without one
+# are checked against the sha256 Hugging Face publishes for LFS files (see
+# remote_sha256). Either way the digest is recorded in the local manifest.
+KNOWN_SHA256: Dict[str, str] = {}
+
+MANIFEST_FILE = "manifest.json"
+PART_SUFFIX = ".part"
+
+class ChecksumError(Exception):
+    pass
+
+class DownloadTask(NamedTuple):
+    url: str
+    dest: str
+    sha256: Optional[str] = None
+
+# progress(done_bytes, total_bytes, current_file); total is 0 while unknown
+ProgressCallback = Callable[[int, int, str], None]
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _server_sha256(response) -> Optional[str]:
+    # Hugging Face serves LFS files with their sha256 as the linked ETag
+    etag = (response.headers.get("X-Linked-Etag") or "").strip('"').lower()
+    return etag if len(etag) == 64 and all(c in "0123456789abcdef" for c in etag) else None
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+def remote_sha256(url: str, timeout: float = 30.0) -> Optional[str]:
+    """sha256 the server publishes for url, if any.
+
+    Hugging Face only sends X-Linked-Etag on the redirect to the LFS storage,
+    which urlopen would follow (and lose the header), so this is a HEAD
+    request that stops at the first response.
+    """
+    request = urllib.request.Request(url, method="HEAD", headers={"User-Agent": "aussprachetrainer"})
+    try:
+        with urllib.request.build_opener(_NoRedirect).open(request, timeout=timeout) as response:
+            return _server_sha256(response)
+    except urllib.error.HTTPError as e:
+        # The unfollowed redirect surfaces as an HTTPError carrying its headers
+        return _server_sha256(e) if 300 <= e.code < 400 else None
+
+class ModelManifest:
+    """sha256 and size of every completed download, stored next to the models.
+
+    A listed file counts as present only while its size matches (and its
+    digest matches the pin, if there is one), so anything truncated or
+    replaced outside the manager is fetched again. An unlisted file, e.g. from
+    before the manifest existed, is hashed once and recorded; only a file
+    that contradicts its pin is downloaded again.
+    """
+
+    def __init__(self, models_dir: str):
+        self.path = os.path.join(models_dir, MANIFEST_FILE)
+        self._lock = threading.Lock()
+        self.entries: Dict[str, Dict] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def record(self, filename: str, sha256: str, size: int):
+        with self._lock:
+            self.entries[filename] = {"sha256": sha256, "size": size}
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=2)
+            os.replace(tmp, self.path)
+
+    def is_complete(self, path: str) -> bool:
+        if not os.path.exists(path):
+            return False
+        name = os.path.basename(path)
+        pinned = KNOWN_SHA256.get(name)
+        entry = self.entries.get(name)
+        if entry is None:
+            digest = file_sha256(path)
+            if pinned is not None and digest != pinned:
+                print(f"DEBUG: {name} does not match its pinned sha256, fetching again")
+                return False
+            self.record(name, digest, os.path.getsize(path))
+            return True
+        if pinned is not None and entry["sha256"] != pinned:
+            return False
+        return os.path.getsize(path) == entry["size"]
+
+class DownloadManager:
+    """Concurrent, resumable model downloads.
+
+    Each file streams into <dest>.part. An interrupted transfer resumes from
+    the bytes already on disk with an HTTP Range request. The file is moved
+    into place with os.replace only after its sha256 matches. Progress is
+    reported in bytes, summed across all files of one download() call and
+    throttled to `report_interval` seconds.
+    """
+
+    def __init__(self, models_dir: str, max_workers: int = 3, chunk_size: int = 256 * 1024,
+                 timeout: float = 30.0, retries: int = 3, report_interval: float = 0.1):
+        self.models_dir = models_dir
+        self.manifest = ModelManifest(models_dir)
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.retries = retries
+        self.report_interval = report_interval
+
+    def is_present(self, filename: str) -> bool:
+        return self.manifest.is_complete(os.path.join(self.models_dir, filename))
+
+    def download(self, tasks: List[DownloadTask], progress: Optional[ProgressCallback] = None) -> Dict[str, Optional[str]]:
+        """Fetch tasks concurrently. Returns {dest: None on success, else the error}."""
+        state = {"done": 0, "total": 0, "reported": 0.0}
+        lock = threading.Lock()
+
+        def report(delta_done: int, delta_total: int, name: str, force: bool = False):
+            with lock:
+                state["done"] += delta_done
+                state["total"] += delta_total
+                now = time.monotonic()
+                if not progress or (not force and now - state["reported"] < self.report_interval):
+                    return
+                state["reported"] = now
+                done, total = state["done"], state["total"]
+            try:
+                progress(done, total, name)
+            except Exception as e:
+                print(f"DEBUG: Download progress callback failed: {e}")
+
+        def run(task: DownloadTask) -> Optional[str]:
+            try:
+                self.fetch(task, report)
+                return None
+            except Exception as e:
+                print(f"DEBUG: Failed to download {task.url}: {e}")
+                return str(e)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_workers, len(tasks) or 1)),
+                                thread_name_prefix="download") as pool:
+            results = dict(zip([t.dest for t in tasks], pool.map(run, tasks)))
+        report(0, 0, "", force=True)
+        return results
+
+    def fetch(self, task: DownloadTask, report: Callable[..., None] = lambda *a, **k: None):
+        """Download one file to task.dest, resuming a previous partial transfer."""
+        name = os.path.basename(task.dest)
+        if self.manifest.is_complete(task.dest):
+            return
+        part = task.dest + PART_SUFFIX
+        expected = task.sha256 or KNOWN_SHA256.get(name)
+        if not expected:
+            try:
+                expected = remote_sha256(task.url, self.timeout)
+            except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+                print(f"DEBUG: {name}: could not look up the published sha256 ({e})")
+        counted_total = False
+        attempt = 0
+        while True:
+            offset = os.path.getsize(part) if os.path.exists(part) else 0
+            request = urllib.request.Request(task.url, headers={"User-Agent": "aussprachetrainer"})
+            if offset:
+                request.add_header("Range", f"bytes={offset}-")
+            try:
+                with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                    if offset and response.status != 206:
+                        # Server ignored the range: start over
+                        print(f"DEBUG: {name}: server does not support resume, restarting")
+                        if counted_total:
+                            report(-offset, 0, name)
+                        offset = 0
+                    expected = expected or _server_sha256(response)
+                    length = int(response.headers.get("Content-Length") or 0)
+                    if not counted_total:
+                        report(offset, offset + length if length else 0, name)
+                        counted_total = True
+                    received = 0
+                    with open(part, "ab" if offset else "wb") as f:
+                        for chunk in iter(lambda: response.read(self.chunk_size), b""):
+                            f.write(chunk)
+                            received += len(chunk)
+                            report(len(chunk), 0, name)
+                    # read(n) returns b"" instead of raising when the connection drops early
+                    if length and received < length:
+                        raise http.client.IncompleteRead(b"", length - received)
+                break
+            except urllib.error.HTTPError as e:
+                if e.code == 416 and offset:
+                    # Range starts at the end: the part file is already complete
+                    break
+                raise
+            except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+                attempt += 1
+                if attempt > self.retries:
+                    raise
+                print(f"DEBUG: {name}: transfer interrupted ({e}), resuming (attempt {attempt})")
+                time.sleep(min(2 ** attempt, 10) * 0.1)
+
+        digest = file_sha256(part)
+        if expected and digest != expected.lower():
+            os.remove(part)
+            raise ChecksumError(f"{name}: sha256 mismatch (expected {expected}, got {digest})")
+        size = os.path.getsize(part)
+        os.replace(part, task.dest)
+        self.manifest.record(name, digest, size)
+        print(f"DEBUG: Downloaded {name} ({size} bytes, sha256 {digest[:12]})")
+
+def piper_url(model_name: str, filename: str) -> str:
+    """piper-voices path of a file, e.g. de/de_DE/thorsten/high/ for de_DE-thorsten-high."""
+    locale, voice, quality = model_name.split("-", 2)
+    return f"{PIPER_BASE_URL}{locale.split('_')[0]}/{locale}/{voice}/{quality}/{filename}"
+
+def piper_tasks(models_dir: str, model_name: str) -> List[DownloadTask]:
+    files = [f"{model_name}.onnx", f"{model_name}.onnx.json"]
+    return [DownloadTask(piper_url(model_name, f), os.path.join(models_dir, f)) for f in files]
+
+def kokoro_tasks(models_dir: str) -> List[DownloadTask]:
+    return [DownloadTask(url, os.path.join(models_dir, f)) for f, url in KOKORO_FILES.items()]
+
+def format_progress(done: int, total: int, name: str) -> str:
+    mb = 1024 * 1024
+    if total:
+        return f"Downloading {name}: {done / mb:.1f} / {total / mb:.1f} MB ({100 * done // total}%)"
+    return f"Downloading {name}: {done / mb:.1f} MB"
@@ -11,6 +11,11 @@ from .backend import PronunciationBackend
 from .vim_editor import VimEditor
 from .autocomplete import GermanSuggester
 from .config import ConfigManager
+from .ipa_preview import LiveIPAPreview
+from .prefetch import PrefetchPool, PrefetchRequest
+from .jobs import PRIORITY_HIGH, PRIORITY_LOW
+from .connectivity import parse_target
+from .onnx_session import SessionSettings
 from .text_engine_wrapper import TextEngine, ACTION_BOLD, ACTION_ITALIC, ACTION_UNDER, ACTION_UNDO, ACTION_REDO, ACTION_SELECT_ALL, ACTION_DELETE_WORD, ACTION_DELETE_WORD_BACK
 
 # Dialect mapping
@@ -20,6 +25,13 @@ DIALECTS = {
     "Switzerland": "de-CH"
 }
 
+PLAYBACK_SPEEDS = {
+    "0.5x": 0.5,
+    "0.75x": 0.75,
+    "1x": 1.0,
+    "1.25x": 1.25
+}
+
 # Premium "Mocha-inspired" Theme
 # No Clown Fiesta Theme (Dark)
 THEME = {
@@ -157,6 +169,36 @@ class App(ctk.CTk):
         self.online_voice = self.config.get("online_voice") or "de"
         self.offline_voice = self.config.get("offline_voice") or "de+m3"
         self.backend = PronunciationBackend()
+        self.backend.audio_cache.max_bytes = int(self.config.get("audio_cache_mb") or 512) * 1024 * 1024
+        self.backend.compress_audio = bool(self.config.get("compress_audio"))
+        self.backend.playback_speed = float(self.config.get("playback_speed") or 1.0)
+        self.backend.postprocess_audio = bool(self.config.get("normalize_audio"))
+        self.backend.target_loudness_db = float(self.config.get("target_loudness_db") or -20.0)
+        self.backend.auto_stop = bool(self.config.get("vad_auto_stop"))
+        self.backend.vad_silence_ms = int(self.config.get("vad_silence_ms") or 800)
+        self.backend.on_auto_stop = lambda: self.after(0, self._finish_recording)
+        self.backend.save_recordings = bool(self.config.get("save_recordings"))
+        self.backend.offline_asr_mode = self.config.get("offline_asr_mode") or "lm"
+        self.backend.set_onnx_settings(SessionSettings(
+            intra_op_threads=int(self.config.get("onnx_intra_threads") or 0),
+            inter_op_threads=int(self.config.get("onnx_inter_threads") or 1),
+            graph_optimization=self.config.get("onnx_graph_optimization") or "all",
+            cache_optimized=bool(self.config.get("onnx_cache_optimized"))))
+        # Job results reach the Tk thread in one coalesced after() per burst
+        self.backend.jobs.set_dispatcher(lambda drain: self.after(0, drain))
+        # Auto mode reads a cached online flag instead of probing per click
+        monitor = self.backend.connectivity
+        monitor.host, monitor.port = parse_target(self.config.get("connectivity_target") or "8.8.8.8:53")
+        monitor.ttl = float(self.config.get("connectivity_ttl") or 30)
+        monitor.on_change = lambda online: self.after(0, lambda: self._show_connectivity(online))
+        monitor.start()
+        self.hedge_budget_ms = int(self.config.get("hedge_budget_ms") or 0)
+        # Pre-synthesize likely next phrases; the highlighted suggestion beats history
+        self.prefetch = PrefetchPool(self.backend, ["suggestion", "history"],
+                                     cpu_budget=float(self.config.get("prefetch_cpu_budget") or 0),
+                                     allow_online=bool(self.config.get("prefetch_online")))
+        self.prefetch_history_count = 10
+        self._history_texts = []
         self.suggester = GermanSuggester()
         self.text_engine = TextEngine()
         
@@ -212,6 +254,12 @@ class App(ctk.CTk):
         # Autocomplete debounce time in ms
         self.autocomplete_debounce_ms = 600
 
+        # Live IPA preview state
+        self.ipa_preview = LiveIPAPreview(self.backend)
+        self.ipa_preview_timer = None
+        self.ipa_preview_debounce_ms = 150
+        self._ipa_preview_text = None
+
         self._create_sidebar()
         
         # Undo/Redo State for History Search
@@ -239,7 +287,7 @@ class App(ctk.CTk):
         # Global Bindings
         self.bind('<Control-Return>', lambda e: self.generate())
         self.bind('<Alt-r>', lambda e: self.toggle_recording())
-        self.bind('<Control-p>', lambda e: self.backend.play_file(self.backend.last_audio_path) if hasattr(self.backend, "last_audio_path") else None)
+        self.bind('<Control-p>', lambda e: self.backend.play_file_async(self.backend.last_audio_path) if hasattr(self.backend, "last_audio_path") else None)
         self.bind('<Control-h>', lambda e: self.toggle_history_panel())
         self.bind('<F11>', lambda e: self.toggle_fullscreen())
         self.bind('<Escape>', lambda e: self._handle_escape(e))
@@ -249,6 +297,11 @@ class App(ctk.CTk):
         self.history_index = -1
         self.history_items = []
 
+        # Load neural voice models in the background once the window is up
+        self.after(1000, lambda: self.backend.prepare_voice(self.offline_voice))
+        if self.connection_mode != "Online":
+            self._warm_offline_asr()
+
     def _fix_font_permissions(self):
         """Ensure font files are writable by the current user to avoid CTk errors."""
         font_dir = os.path.expanduser("~/.fonts")
@@ -428,26 +481,33 @@ class App(ctk.CTk):
                                     fg_color=THEME["bg"], hover_color=THEME["border"], border_width=1, border_color=THEME["muted"])
         self.dl_btn.grid(row=0, column=1, padx=(5, 0))
 
+        # Playback Speed (time-stretched from the cached audio, any engine)
+        ctk.CTkLabel(self.sidebar, text="Playback Speed", anchor="w", font=ctk.CTkFont(size=11), text_color=THEME["muted"]).grid(row=16, column=0, padx=25, pady=(5, 0), sticky="w")
+        self.speed_option = ctk.CTkSegmentedButton(self.sidebar, values=list(PLAYBACK_SPEEDS.keys()), command=self._on_speed_change)
+        speed_name = next((n for n, v in PLAYBACK_SPEEDS.items() if v == self.backend.playback_speed), "1x")
+        self.speed_option.set(speed_name)
+        self.speed_option.grid(row=17, column=0, padx=20, pady=(0, 15), sticky="ew")
+
         # Fullscreen Toggle
         self.fs_button = ctk.CTkButton(self.sidebar, text="Toggle Fullscreen", 
                                         fg_color=THEME["bg"], hover_color=THEME["border"],
                                         border_width=1, border_color=THEME["muted"],
                                         text_color=THEME["fg"],
                                         command=self.toggle_fullscreen)
-        self.fs_button.grid(row=16, column=0, padx=20, pady=(15, 10), sticky="ew")
+        self.fs_button.grid(row=18, column=0, padx=20, pady=(15, 10), sticky="ew")
         
         # System Info Section
-        SectionHeader(self.sidebar, "System Info").grid(row=17, column=0, sticky="ew")
+        SectionHeader(self.sidebar, "System Info").grid(row=19, column=0, sticky="ew")
         
         self.token_label = ctk.CTkLabel(self.sidebar, text="Tokens Remaining: ∞", 
                                         font=ctk.CTkFont(size=12, weight="bold"), text_color=THEME["green"])
-        self.token_label.grid(row=18, column=0, padx=25, pady=(10, 0), sticky="w")
+        self.token_label.grid(row=20, column=0, padx=25, pady=(10, 0), sticky="w")
         
         self.api_info = ctk.CTkLabel(self.sidebar, text="API: Local / Google (Free)\nKey: [NOT REQUIRED]\nRecording: Alt+r", 
                                        font=ctk.CTkFont(size=11), justify="left", text_color=THEME["muted"])
-        self.api_info.grid(row=19, column=0, padx=25, pady=(5, 20), sticky="w")
+        self.api_info.grid(row=21, column=0, padx=25, pady=(5, 20), sticky="w")
 
-        for i in range(20):
+        for i in range(22):
             self.sidebar.grid_rowconfigure(i, weight=0)
         # Let the empty space at bottom expand if any, or spread it?
         # User said "proportional uniform division of sections"
@@ -469,15 +529,20 @@ class App(ctk.CTk):
         self.input_text = VimEditor(self.main_frame, on_submit=self.generate,
                                     on_key_release=self._on_key_release,
                                     height=150, fg_color=THEME["sidebar_bg"])
-        self.input_text.grid(row=1, column=0, sticky="nsew", pady=10, padx=20)
+        self.input_text.grid(row=1, column=0, sticky="nsew", pady=(10, 0), padx=20)
         self.input_text.focus_set()
         
         # (Tkinter tags are not applicable to the Canvas-based VimEditor,
         # but Zep handles its own syntax highlighting logic if needed.)
         
+        # Live IPA preview (updated while typing)
+        self.ipa_preview_label = ctk.CTkLabel(self.main_frame, text="", anchor="w", justify="left",
+                                              font=ctk.CTkFont(family="Courier", size=14), text_color=THEME["blue"])
+        self.ipa_preview_label.grid(row=2, column=0, sticky="ew", pady=(2, 0), padx=25)
+        
         # Action Buttons
         btn_frame = ctk.CTkFrame(self.main_frame, fg_color="transparent")
-        btn_frame.grid(row=2, column=0, sticky="ew", pady=10, padx=20)
+        btn_frame.grid(row=3, column=0, sticky="ew", pady=10, padx=20)
         btn_frame.grid_columnconfigure((0,1), weight=1)
 
         self.generate_button = ctk.CTkButton(btn_frame, text="Speak & IPA", 
@@ -494,21 +559,32 @@ class App(ctk.CTk):
         
         # IPA Output
         self.ipa_card = ctk.CTkFrame(self.main_frame, fg_color=THEME["sidebar_bg"], border_width=1, border_color=THEME["border"])
-        self.ipa_card.grid(row=3, column=0, sticky="ew", pady=10, padx=20)
+        self.ipa_card.grid(row=4, column=0, sticky="ew", pady=10, padx=20)
         self.ipa_display = ctk.CTkLabel(self.ipa_card, text="[ IPA ]", font=ctk.CTkFont(family="Courier", size=24), text_color=THEME["accent"])
         self.ipa_display.pack(padx=10, pady=20, fill="x")
         
         # Assessment Output
         self.assess_card = ctk.CTkFrame(self.main_frame, fg_color=THEME["sidebar_bg"], border_width=1, border_color=THEME["border"])
-        self.assess_card.grid(row=4, column=0, sticky="ew", pady=10, padx=20)
+        self.assess_card.grid(row=5, column=0, sticky="ew", pady=10, padx=20)
         self.assess_label = ctk.CTkLabel(self.assess_card, text="Pronunciation Score: --%", font=ctk.CTkFont(size=16, weight="bold"), text_color=THEME["fg"])
         self.assess_label.pack(padx=10, pady=10)
         self.transcription_label = ctk.CTkLabel(self.assess_card, text="You said: ...", text_color=THEME["muted"])
         self.transcription_label.pack(padx=10, pady=(0, 10))
+        # Target phonemes coloured by how they were said (filled by _show_phoneme_feedback)
+        import tkinter as tk
+        self.phoneme_view = tk.Text(self.assess_card, height=1, font=("Courier", 18),
+                                    bg=THEME["sidebar_bg"], fg=THEME["fg"], bd=0, highlightthickness=0,
+                                    padx=0, pady=0, wrap="word", cursor="xterm",
+                                    selectbackground=THEME["accent"], selectforeground="#11111b")
+        self.phoneme_view.tag_config("match", foreground=THEME["green"])
+        self.phoneme_view.tag_config("sub", foreground=THEME["accent"], underline=True)
+        self.phoneme_view.tag_config("del", foreground=THEME["red"], overstrike=True)
+        self.phoneme_view.tag_config("ins", foreground=THEME["red"], offset=6)
+        self.phoneme_view.configure(state="disabled")
         
         # Status
         self.status_label = ctk.CTkLabel(self.main_frame, text="Ready", text_color=THEME["muted"])
-        self.status_label.grid(row=5, column=0, sticky="w", padx=20, pady=(0, 10))
+        self.status_label.grid(row=6, column=0, sticky="w", padx=20, pady=(0, 10))
 
     def _create_history_panel(self):
         self.history_frame = ctk.CTkFrame(self, width=350, fg_color=THEME["sidebar_bg"], corner_radius=0)
@@ -577,12 +653,32 @@ class App(ctk.CTk):
         code = DIALECTS.get(dialect_name, "de-DE")
         self.backend.set_dialect(code)
         self.config.set("dialect", dialect_name)
+        # Dialect is part of the preview cache key, so force a refresh
+        self._ipa_preview_text = None
+        self._schedule_ipa_preview()
         self.status_label.configure(text=f"Switched to {dialect_name}", text_color=THEME["green"])
 
+    def _on_speed_change(self, speed_name):
+        self.backend.playback_speed = PLAYBACK_SPEEDS.get(speed_name, 1.0)
+        self.config.set("playback_speed", self.backend.playback_speed)
+        self.status_label.configure(text=f"Playback speed {speed_name}", text_color=THEME["green"])
+
+    def _show_connectivity(self, online: bool):
+        if self.mode_switch.get() == "Auto":
+            self.status_label.configure(text=f"Auto: {'Online' if online else 'Offline'}", text_color="orange")
+
+    def _warm_offline_asr(self):
+        # Pocketsphinx takes a while to load; do it before the first assessment
+        self.backend.jobs.submit("warm_asr", lambda job: self.backend.prepare_offline_asr(), priority=PRIORITY_LOW)
+
     def _on_mode_change(self, mode):
+        if mode != "Online":
+            self._warm_offline_asr()
         if mode == "Auto":
             self.auto_switch_mode = True
             self.config.set("auto_switch_mode", True)
+            self.backend.connectivity.refresh()
+            self._show_connectivity(self.backend.connectivity.is_online)
         else:
             self.auto_switch_mode = False
             self.config.set("auto_switch_mode", False)
@@ -597,6 +693,7 @@ class App(ctk.CTk):
         voice_id = self.offline_voice_map.get(voice_name, "de")
         self.offline_voice = voice_id
         self.config.set("offline_voice", voice_id)
+        self.backend.prepare_voice(voice_id)
         
         # Check if it's a Piper voice and if it's missing
         if voice_id.startswith("piper:"):
@@ -616,17 +713,17 @@ class App(ctk.CTk):
             
         def do_dl():
             self.after(0, lambda: self.dl_btn.configure(state="disabled"))
-            for m in missing:
-                if m.startswith("piper:"):
-                    self.backend.download_piper_model(m.split(":")[1], 
-                                                     lambda msg: self.after(0, lambda m=msg: self.status_label.configure(text=m)))
-                elif m.startswith("kokoro:"):
-                    self.backend.download_kokoro_model(lambda msg: self.after(0, lambda m=msg: self.status_label.configure(text=m)))
+            # All missing files download in parallel; interrupted ones resume next time
+            ok = self.backend.download_models(missing,
+                                              lambda msg: self.after(0, lambda m=msg: self.status_label.configure(text=m)))
             
             self.after(0, lambda: self.dl_btn.configure(state="normal"))
             self.after(0, lambda: self._refresh_offline_voices())
             from tkinter import messagebox
-            self.after(0, lambda: messagebox.showinfo("Voices", "Voices downloaded successfully! You can now select them."))
+            if ok:
+                self.after(0, lambda: messagebox.showinfo("Voices", "Voices downloaded successfully! You can now select them."))
+            else:
+                self.after(0, lambda: messagebox.showerror("Voices", "Some voices failed to download. Click ⬇️ again to resume."))
                 
         threading.Thread(target=do_dl, daemon=True).start()
 
@@ -701,6 +798,8 @@ class App(ctk.CTk):
         """Handle window close event - save state and exit."""
         self._save_window_geometry()
         self._save_pane_widths()
+        self.prefetch.shutdown()
+        self.backend.shutdown()
         self.destroy()
     
 
@@ -720,46 +819,66 @@ class App(ctk.CTk):
         offline_voice_id = self.offline_voice_map.get(self.offline_voice_option.get(), "de+m3")
         
         self.status_label.configure(text="Generating...", text_color="blue")
+        # A new request replaces the one being heard
+        self.backend.stop_playback()
         
-        def work():
+        def work(job):
+            # Foreground generation gets the CPU; prefetch waits
+            self.prefetch.suspend()
             try:
                 # Determine mode/connection in thread to avoid freezing
                 is_online = False
                 if mode_setting == "Auto":
+                    # Instant: answered from the background connectivity monitor
                     try: is_online = self.backend.check_internet()
                     except: is_online = False
-                    self.after(0, lambda: self.status_label.configure(text=f"Auto: {'Online' if is_online else 'Offline'}", text_color="orange"))
+                    job.post(lambda: self.status_label.configure(text=f"Auto: {'Online' if is_online else 'Offline'}", text_color="orange"))
                 else:
                     is_online = mode_setting == "Online"
 
-                ipa = self.backend.get_ipa(text)
-                filepath = self.backend.generate_audio(text, online=is_online, 
-                                                      voice_id=offline_voice_id if not is_online else None,
-                                                      online_voice=online_voice_id if is_online else None)
+                # Streaming plays as synthesized, so other speeds go through the file path
+                streaming = (not is_online and self.backend.playback_speed == 1.0
+                             and self.backend.can_stream(offline_voice_id))
+                if streaming:
+                    # Neural voices start playing after the first sentence is synthesized
+                    ipa = self.backend.get_ipa(text)
+                    job.post(lambda: self.ipa_display.configure(text=ipa))
+                    filepath = self.backend.generate_audio_streaming(text, offline_voice_id)
+                elif is_online and self.hedge_budget_ms > 0:
+                    # Slow network: the offline voice takes over after the latency budget
+                    ipa = self.backend.get_ipa(text)
+                    filepath, is_online = self.backend.generate_hedged(text, online_voice_id, offline_voice_id,
+                                                                       budget=self.hedge_budget_ms / 1000)
+                else:
+                    ipa, filepath = self.backend.generate_with_ipa(text, online=is_online,
+                                                                   voice_id=offline_voice_id if not is_online else None,
+                                                                   online_voice=online_voice_id if is_online else None)
+                if job.is_cancelled():
+                    # A newer generate superseded this one; its result is cached but not shown
+                    return
                 if filepath:
-                    # Copy to persistent storage for history
-                    persistent_path = self.backend.copy_to_persistent(filepath)
-                    if not persistent_path:
-                        persistent_path = filepath  # Fallback to session path
-                    
-                    self.backend.db.add_entry(text, ipa, persistent_path, mode_setting, 
-                                            online_voice_id if is_online else offline_voice_id)
+                    # Link into persistent storage for history (one blob per distinct audio)
+                    self.backend.store_history_entry(text, ipa, filepath, mode_setting,
+                                                     online_voice_id if is_online else offline_voice_id)
                     # Learn new words for autocomplete
                     for word in text.split():
                         self.suggester.add_to_history(word)
                     
-                    self.after(0, lambda: self.ipa_display.configure(text=ipa))
-                    self.after(0, self._refresh_history)
+                    job.post(lambda: setattr(self.backend, "last_audio_path", filepath))
+                    job.post(lambda: self.ipa_display.configure(text=ipa))
+                    job.post(self._refresh_history)
                     # Play file in this background thread
-                    self.backend.play_file(filepath)
+                    if not streaming:
+                        self.backend.play_file(filepath)
                 else:
-                    self.after(0, lambda: self.status_label.configure(text="Generation Failed", text_color="red"))
+                    job.post(lambda: self.status_label.configure(text="Generation Failed", text_color="red"))
             except Exception as e:
                 print(f"DEBUG: GUI Generate Thread Error: {e}")
-                self.after(0, lambda: self.status_label.configure(text="Error occurred", text_color="red"))
+                job.post(lambda: self.status_label.configure(text="Error occurred", text_color="red"))
             finally:
-                self.after(0, lambda: self.status_label.configure(text="Ready", text_color="gray"))
-        threading.Thread(target=work, daemon=True).start()
+                self.prefetch.resume()
+                job.post(lambda: self.status_label.configure(text="Ready", text_color="gray"))
+        self.backend.jobs.submit("generate", work, priority=PRIORITY_HIGH)
 
     def toggle_recording(self):
         if not self.backend.recording:
@@ -770,24 +889,30 @@ class App(ctk.CTk):
             except Exception as e:
                 self.status_label.configure(text=f"Mic Error: {e}", text_color="red")
         else:
-            wav_path = self.backend.stop_recording()
-            self.record_button.configure(text="Start Recording", fg_color="#338833")
-            
-            if not wav_path:
-                self.status_label.configure(text="No audio recorded", text_color="red")
-                return
+            self._finish_recording()
 
-            self.status_label.configure(text="Assessing...", text_color="blue")
-            target = self.input_text.get_text().strip()
-            online = self.mode_switch.get() == "Online"
-            
-            def assess():
-                try:
-                    result = self.backend.assess_pronunciation(target, wav_path, online=online)
-                    self.after(0, lambda: self._show_assessment(result))
-                except Exception as e:
-                    self.after(0, lambda: self.status_label.configure(text=f"ASR Error: {e}", text_color="red"))
-            threading.Thread(target=assess, daemon=True).start()
+    def _finish_recording(self):
+        # Reached from the button and from VAD auto-stop; whichever comes second is a no-op
+        if not self.backend.recording:
+            return
+        take = self.backend.stop_capture()
+        self.record_button.configure(text="Start Recording", fg_color="#338833")
+        
+        if take is None:
+            self.status_label.configure(text="No audio recorded", text_color="red")
+            return
+
+        self.status_label.configure(text="Assessing...", text_color="blue")
+        target = self.input_text.get_text().strip()
+        online = self.mode_switch.get() == "Online"
+        
+        def assess(job):
+            try:
+                result = self.backend.assess_pronunciation(target, take, online=online)
+                job.post(lambda: self._show_assessment(result))
+            except Exception as e:
+                job.post(lambda: self.status_label.configure(text=f"ASR Error: {e}", text_color="red"))
+        self.backend.jobs.submit("assess", assess, priority=PRIORITY_HIGH)
 
     def _show_assessment(self, result):
         if "error" in result:
@@ -809,8 +934,29 @@ class App(ctk.CTk):
                 text = f"You said: \"{actual}\""
             
             self.transcription_label.configure(text=text)
+        self._show_phoneme_feedback(result.get("phonemes") or [])
         self.status_label.configure(text="Ready", text_color="gray")
 
+    def _show_phoneme_feedback(self, ops: List[Dict]):
+        """Render the target phoneme by phoneme: green when right, underlined when
+        substituted, struck through when missing, raised red for extra sounds."""
+        view = self.phoneme_view
+        view.configure(state="normal")
+        view.delete("1.0", "end")
+        if not ops:
+            view.configure(state="disabled")
+            view.pack_forget()
+            return
+        word = ops[0]["word"]
+        for op in ops:
+            if op["word"] != word:
+                view.insert("end", " ")
+                word = op["word"]
+            symbol = op["actual"] if op["op"] == "ins" else op["target"]
+            view.insert("end", symbol, op["op"])
+        view.configure(state="disabled", height=min(4, 1 + len(ops) // 40))
+        view.pack(padx=10, pady=(0, 10), fill="x")
+
     def _refresh_history(self):
         query = self.search_entry.get()
         entries = self.backend.db.get_history(search_query=query if query else None)
@@ -819,7 +965,7 @@ class App(ctk.CTk):
         
         for e in entries:
             HistoryItem(self.history_scroll, e['id'], e['text'], e['ipa'], e['audio_path'],
-                        self.backend.play_file, self._delete_entry, self._handle_history_click, self.font_size, self.font_family).pack(fill="x", pady=2, padx=5)
+                        self.backend.play_file_async, self._delete_entry, self._handle_history_click, self.font_size, self.font_family).pack(fill="x", pady=2, padx=5)
 
     def _confirm_clear_history(self):
         # Simple confirmation using a mock dialog or status update since CTk doesn't have a built-in confirm
@@ -938,6 +1084,7 @@ class App(ctk.CTk):
     # --- Autocomplete Hooks ---
     def _on_key_release(self, event):
         """Trigger autocomplete on key release instantly."""
+        self._schedule_ipa_preview()
         # Navigation in suggestions
         if (event.state & 0x4): # Control
             if event.keysym == "n":
@@ -956,6 +1103,30 @@ class App(ctk.CTk):
         # Trigger instantly via C engine lookup (no timer)
         self._trigger_autocomplete()
 
+    # --- Live IPA Preview ---
+    def _schedule_ipa_preview(self):
+        """Debounce preview updates so fast typing only transcribes once."""
+        if self.ipa_preview_timer:
+            self.after_cancel(self.ipa_preview_timer)
+        self.ipa_preview_timer = self.after(self.ipa_preview_debounce_ms, self._update_ipa_preview)
+
+    def _update_ipa_preview(self):
+        self.ipa_preview_timer = None
+        try:
+            text = self.input_text.get_text()
+        except: return
+        if text == self._ipa_preview_text:
+            return
+        self._ipa_preview_text = text
+        if not text.strip():
+            self.ipa_preview.cancel()
+            self.ipa_preview_label.configure(text="")
+            return
+        self.ipa_preview.request(text, lambda ipa: self.after(0, lambda: self._show_ipa_preview(ipa)))
+
+    def _show_ipa_preview(self, ipa):
+        self.ipa_preview_label.configure(text=f"/{ipa}/" if ipa else "")
+
     def _trigger_autocomplete(self):
         # Only trigger in INSERT mode
         try:
@@ -1033,6 +1204,7 @@ class App(ctk.CTk):
         # Live update text as we navigate
         word = self.suggestions[self.suggestion_index]
         self.input_text.replace_current_word(word)
+        self._prefetch_texts("suggestion", [self.input_text.get_text().strip()])
         return "break"
 
     def _select_suggestion(self):
@@ -1091,6 +1263,27 @@ class App(ctk.CTk):
     def _highlight_history_item(self):
         for i, item in enumerate(self.history_items):
             item.configure(border_color=THEME["accent"] if i == self.history_index else THEME["border"])
+        self._prefetch_history()
+
+    def _prefetch_request(self, text: str) -> PrefetchRequest:
+        """What generate() would request for text with the current settings."""
+        if self.mode_switch.get() == "Online":
+            return PrefetchRequest(text, True, None, self.online_voice_map.get(self.online_voice_option.get(), "de"))
+        return PrefetchRequest(text, False, self.offline_voice_map.get(self.offline_voice_option.get(), "de+m3"))
+
+    def _prefetch_texts(self, group: str, texts: List[str]):
+        try:
+            self.prefetch.set_targets(group, [self._prefetch_request(t) for t in texts])
+        except Exception as e:
+            print(f"DEBUG: Prefetch scheduling failed: {e}")
+
+    def _prefetch_history(self):
+        """Highlighted history entry first, then the top (visible) entries."""
+        texts = self._history_texts[:self.prefetch_history_count]
+        index = getattr(self, "history_index", -1)
+        if 0 <= index < len(self._history_texts):
+            texts = [self._history_texts[index]] + texts
+        self._prefetch_texts("history", texts)
 
     def _refresh_history(self):
         query = self.search_entry.get()
@@ -1100,9 +1293,11 @@ class App(ctk.CTk):
         
         for entry in entries:
             item = HistoryItem(self.history_scroll, entry['id'], entry['text'], entry['ipa'], entry['audio_path'],
-                               self.backend.play_file, self._delete_entry, self.input_text.set_text, self.font_size, self.font_family)
+                               self.backend.play_file_async, self._delete_entry, self.input_text.set_text, self.font_size, self.font_family)
             item.pack(fill="x", pady=5, padx=5)
             self.history_items.append(item)
+        self._history_texts = [entry['text'] for entry in entries]
+        self._prefetch_history()
         
         self.search_entry.bind("<KeyPress-j>", self._on_history_key)
         self.search_entry.bind("<KeyPress-k>", self._on_history_key)
@@ -1223,6 +1418,7 @@ class App(ctk.CTk):
     def _close_suggestions(self, event=None):
         if self.suggestion_window: self.suggestion_window.withdraw()
         self.suggestions = []
+        self._prefetch_texts("suggestion", [])
 
 if __name__ == "__main__":
     app = App()
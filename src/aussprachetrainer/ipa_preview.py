@@ -0,0 +1,101 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+WORD_RE = re.compile(r"[\w'-]+")
+
+
+class LiveIPAPreview:
+    """Incremental IPA transcription of the editor text.
+
+    Each word is transcribed on its own and cached per dialect, so after a
+    keystroke only the new or edited words hit espeak. Work runs on a single
+    background thread; a request that is superseded by a newer one is
+    abandoned and its result is never delivered.
+    """
+
+    def __init__(self, backend, cache_size: int = 5000):
+        self.backend = backend
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+        self._cond = threading.Condition()
+        self._pending = None  # (generation, text, callback)
+        self._generation = 0
+        self._worker = None
+
+    @staticmethod
+    def split_words(text: str) -> List[str]:
+        return WORD_RE.findall(text)
+
+    def request(self, text: str, callback: Callable[[str], None]):
+        """Queue text for transcription. callback runs on the worker thread."""
+        with self._cond:
+            self._generation += 1
+            self._pending = (self._generation, text, callback)
+            self._cond.notify()
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+
+    def cancel(self):
+        """Drop any queued or running request."""
+        with self._cond:
+            self._generation += 1
+            self._pending = None
+
+    def _is_current(self, generation: int) -> bool:
+        with self._cond:
+            return generation == self._generation
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                generation, text, callback = self._pending
+                self._pending = None
+
+            ipa = self.transcribe(text, generation)
+            if ipa is None or not self._is_current(generation):
+                continue
+            try:
+                callback(ipa)
+            except Exception as e:
+                print(f"DEBUG: IPA preview callback failed: {e}")
+
+    def transcribe(self, text: str, generation: Optional[int] = None) -> Optional[str]:
+        """Return the IPA for text, reusing cached words.
+
+        Returns None if a newer request arrived while words were still being
+        transcribed.
+        """
+        dialect = self.backend.dialect
+        parts = []
+        for word in self.split_words(text):
+            key = (dialect, word)
+            ipa = self._cache_get(key)
+            if ipa is None:
+                if generation is not None and not self._is_current(generation):
+                    return None
+                ipa = self.backend.get_ipa(word)
+                if ipa:
+                    # An empty result is usually a failed or timed-out espeak call: retry it next time
+                    self._cache_put(key, ipa)
+            if ipa:
+                parts.append(ipa)
+        return " ".join(parts)
+
+    def _cache_get(self, key) -> Optional[str]:
+        with self._cond:
+            ipa = self._cache.get(key)
+            if ipa is not None:
+                self._cache.move_to_end(key)
+            return ipa
+
+    def _cache_put(self, key, ipa: str):
+        with self._cond:
+            self._cache[key] = ipa
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
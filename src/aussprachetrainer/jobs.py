@@ -0,0 +1,152 @@
+import heapq
+import itertools
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# Lower runs first
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 10
+PRIORITY_LOW = 20
+
+class Job:
+    """A unit of work submitted to JobScheduler.
+
+    The job function receives the Job and may poll is_cancelled() between
+    steps. post() hands a callback to the UI thread; it is dropped if the job
+    has been superseded by the time the UI runs it.
+    """
+
+    def __init__(self, scheduler: "JobScheduler", job_id: int, kind: str, priority: int,
+                 fn: Callable[["Job"], Any]):
+        self.scheduler = scheduler
+        self.id = job_id
+        self.kind = kind
+        self.priority = priority
+        self.fn = fn
+        self._cancelled = threading.Event()
+        self.done = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def post(self, callback: Callable[[], None]):
+        self.scheduler.post(callback, job=self)
+
+class JobScheduler:
+    """Bounded worker pool for user-triggered work (generate, assess).
+
+    Jobs run in priority order on at most max_workers threads. Submitting a
+    job with supersede=True cancels every older job of the same kind: pending
+    ones never start, running ones have their posted results discarded, so
+    only the newest request of a kind reaches the UI.
+
+    Results are delivered through one queue. The UI registers a dispatcher
+    (e.g. ``lambda f: tk.after(0, f)``); it is called once per burst of
+    results rather than once per callback, and drain() runs the whole batch.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._ids = itertools.count(1)
+        self._heap: List[Tuple[int, int, Job]] = []
+        self._latest: Dict[str, Job] = {}
+        self._cond = threading.Condition()
+        self._workers: List[threading.Thread] = []
+        self._idle = 0
+        self._closed = False
+        self._results: Deque[Tuple[Optional[Job], Callable[[], None]]] = deque()
+        self._results_lock = threading.Lock()
+        self._drain_scheduled = False
+        self._dispatcher: Optional[Callable[[Callable[[], None]], None]] = None
+
+    def set_dispatcher(self, dispatcher: Callable[[Callable[[], None]], None]):
+        self._dispatcher = dispatcher
+
+    def submit(self, kind: str, fn: Callable[[Job], Any], priority: int = PRIORITY_NORMAL,
+               supersede: bool = True) -> Job:
+        with self._cond:
+            job = Job(self, next(self._ids), kind, priority, fn)
+            if supersede:
+                previous = self._latest.get(kind)
+                if previous is not None:
+                    print(f"DEBUG: Job {previous.id} ({kind}) superseded by {job.id}")
+                    previous.cancel()
+                self._latest[kind] = job
+            heapq.heappush(self._heap, (priority, job.id, job))
+            if len(self._heap) > self._idle and len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._run, daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._cond.notify()
+            return job
+
+    def is_current(self, job: Job) -> bool:
+        """True unless a newer job of the same kind has been submitted."""
+        with self._cond:
+            return self._latest.get(job.kind) in (None, job) and not job.is_cancelled()
+
+    def cancel_kind(self, kind: str):
+        with self._cond:
+            job = self._latest.pop(kind, None)
+        if job is not None:
+            job.cancel()
+
+    def post(self, callback: Callable[[], None], job: Optional[Job] = None):
+        """Queue callback for the UI thread (coalesced into one dispatch per burst)."""
+        with self._results_lock:
+            self._results.append((job, callback))
+            if self._drain_scheduled or self._dispatcher is None:
+                return
+            self._drain_scheduled = True
+        self._dispatcher(self.drain)
+
+    def drain(self):
+        """Run queued callbacks; call on the UI thread."""
+        with self._results_lock:
+            batch = list(self._results)
+            self._results.clear()
+            self._drain_scheduled = False
+        for job, callback in batch:
+            if job is not None and job.is_cancelled():
+                continue
+            try:
+                callback()
+            except Exception as e:
+                print(f"DEBUG: Job callback failed: {e}")
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            for _, _, job in self._heap:
+                job.cancel()
+            self._heap.clear()
+            self._cond.notify_all()
+
+    # --- Workers ---
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._idle += 1
+                while not self._closed and not self._heap:
+                    self._cond.wait()
+                self._idle -= 1
+                if self._closed:
+                    return
+                _, _, job = heapq.heappop(self._heap)
+            if job.is_cancelled():
+                job.done.set()
+                continue
+            try:
+                job.fn(job)
+            except Exception as e:
+                print(f"DEBUG: Job {job.id} ({job.kind}) failed: {e}")
+            finally:
+                job.done.set()
+                with self._cond:
+                    if self._latest.get(job.kind) is job:
+                        del self._latest[job.kind]
@@ -0,0 +1,144 @@
+import importlib.util
+import os
+import threading
+from typing import Optional
+
+from aussprachetrainer.onnx_session import SessionSettings, create_session
+
+# kokoro_onnx pulls in onnxruntime, so it is imported on first use (see kokoro_class)
+Kokoro = None
+
+MODEL_FILE = "kokoro-v0_19.onnx"
+VOICES_FILE = "voices.json"
+
+# Our voice ids -> Kokoro voice names
+VOICE_MAP = {
+    "kokoro:de_male": "de_male",
+    "kokoro:de_female": "de_female"
+}
+
+class KokoroEngine:
+    """A single Kokoro model shared by every generation.
+
+    Loading the ONNX model and voices.json takes seconds, so the instance is
+    created once (lazily or by warm_up_async) and reused until release().
+    All access goes through one lock; Kokoro is not documented as thread-safe.
+    release() never waits for that lock: if the model is busy, whoever holds
+    it drops the model on the way out.
+    """
+
+    def __init__(self, models_dir: str):
+        self.models_dir = models_dir
+        self.model_path = os.path.join(models_dir, MODEL_FILE)
+        self.voices_path = os.path.join(models_dir, VOICES_FILE)
+        # onnxruntime tuning; changes apply the next time the model is loaded
+        self.session_settings = SessionSettings()
+        self.optimized_dir = os.path.join(models_dir, "optimized")
+        self._kokoro = None
+        self._lock = threading.RLock()
+        self._wanted = False
+        self._warm_thread: Optional[threading.Thread] = None
+        self._warm_lock = threading.Lock()  # Short-lived, unlike _lock
+
+    def is_available(self) -> bool:
+        return kokoro_installed() and os.path.exists(self.model_path)
+
+    def is_loaded(self) -> bool:
+        return self._kokoro is not None
+
+    def _load(self):
+        if self._kokoro is None:
+            print(f"DEBUG: Loading Kokoro model from {self.model_path}")
+            cls = kokoro_class()
+            if cls is None:
+                raise RuntimeError("kokoro-onnx is not installed")
+            self._kokoro = None
+            if hasattr(cls, "from_session"):
+                # kokoro-onnx >= 0.4 accepts our own tuned session
+                try:
+                    session = create_session(self.model_path, self.session_settings, self.optimized_dir)
+                    self._kokoro = cls.from_session(session, self.voices_path)
+                except Exception as e:
+                    print(f"DEBUG: Tuned Kokoro session failed ({e}), using defaults")
+            if self._kokoro is None:
+                self._kokoro = cls(self.model_path, self.voices_path)
+        return self._kokoro
+
+    def create(self, text: str, voice_id: str = "kokoro:de_male", speed: float = 1.0):
+        """Synthesize text, loading the model on first use. Returns (samples, sample_rate)."""
+        voice = VOICE_MAP.get(voice_id, "de_male")
+        try:
+            with self._lock:
+                self._wanted = True
+                return self._load().create(text, voice=voice, speed=speed, lang="de")
+        finally:
+            self._drop_if_unwanted()
+
+    def warm_up_async(self, voice_id: str = "kokoro:de_male"):
+        """Load the model and run one dummy inference on a background thread."""
+        if not self.is_available():
+            return
+        with self._warm_lock:
+            self._wanted = True
+            if self._kokoro is not None or (self._warm_thread and self._warm_thread.is_alive()):
+                return
+
+            def warm():
+                try:
+                    with self._lock:
+                        if not self._wanted:
+                            return
+                        self._load().create("Hallo", voice=VOICE_MAP.get(voice_id, "de_male"), speed=1.0, lang="de")
+                    print("DEBUG: Kokoro warmed up")
+                except Exception as e:
+                    print(f"DEBUG: Kokoro warm-up failed: {e}")
+                finally:
+                    self._drop_if_unwanted()
+
+            self._warm_thread = threading.Thread(target=warm, daemon=True)
+            self._warm_thread.start()
+
+    def release(self):
+        """Drop the loaded model so its memory can be reclaimed. Never blocks (called on the UI thread)."""
+        self._wanted = False
+        self._drop_if_unwanted()
+
+    def _drop_if_unwanted(self):
+        # Called by release() and by every lock holder after letting go, so a
+        # release() that found the lock taken is always acted on by the holder
+        if self._wanted or not self._lock.acquire(blocking=False):
+            return
+        try:
+            if not self._wanted and self._kokoro is not None:
+                print("DEBUG: Releasing Kokoro model")
+                self._kokoro = None
+        finally:
+            self._lock.release()
+
+def kokoro_installed() -> bool:
+    """True if kokoro_onnx can be imported, without importing it."""
+    return Kokoro is not None or importlib.util.find_spec("kokoro_onnx") is not None
+
+def kokoro_class():
+    """The kokoro_onnx.Kokoro class, imported on first call; None if not installed."""
+    global Kokoro
+    if Kokoro is None:
+        try:
+            from kokoro_onnx import Kokoro as cls
+        except ImportError:
+            return None
+        Kokoro = cls
+    return Kokoro
+
+_engine = None
+_engine_lock = threading.Lock()
+
+def get_kokoro_engine(models_dir: str) -> KokoroEngine:
+    """Return the process-wide KokoroEngine for models_dir."""
+    global _engine
+    with _engine_lock:
+        if _engine is None or _engine.models_dir != models_dir:
+            if _engine is not None:
+                _engine.release()
+            _engine = KokoroEngine(models_dir)
+        return _engine
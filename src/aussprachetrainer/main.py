@@ -1,6 +1,12 @@
-from aussprachetrainer.gui import App
+import sys
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        # Headless: don't import Tk
+        from aussprachetrainer.batch import main as batch_main
+        sys.exit(batch_main(sys.argv[2:]))
+
+    from aussprachetrainer.gui import App
     app = App()
     app.mainloop()
 
@@ -0,0 +1,141 @@
+import hashlib
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+# "lm": free transcription with the general language model.
+# "grammar": a JSGF grammar that only accepts the target words, their likely
+#   mispronunciations, or dropped words.
+# "keyword": spot the target words (and mispronunciations) anywhere in the take.
+SPHINX_MODES = ("lm", "grammar", "keyword")
+DEFAULT_SEARCH = "_default"
+
+# Spelling-level confusions typical for learners of German. A variant is only
+# offered when the dictionary knows it, so the grammar stays pronounceable.
+LEARNER_SUBSTITUTIONS = [
+    ("ü", "u"), ("ü", "i"), ("ö", "o"), ("ö", "e"), ("ä", "a"), ("ä", "e"),
+    ("ch", "k"), ("ch", "sch"), ("sch", "s"), ("z", "s"), ("w", "v"), ("v", "f"),
+    ("ei", "ie"), ("ie", "ei"), ("eu", "oi"), ("th", "t"), ("ß", "s"),
+]
+
+SphinxPaths = Tuple[str, str, str]  # (acoustic model dir, language model, dictionary)
+
+def sphinx_model_paths(languages: Iterable[str], search_dirs: Iterable[str]) -> Optional[SphinxPaths]:
+    """First complete model for any of languages, in speech_recognition's pocketsphinx-data layout."""
+    for base in search_dirs:
+        for language in languages:
+            root = os.path.join(base, language)
+            paths = (os.path.join(root, "acoustic-model"),
+                     os.path.join(root, "language-model.lm.bin"),
+                     os.path.join(root, "pronounciation-dictionary.dict"))
+            if os.path.isdir(paths[0]) and os.path.isfile(paths[1]) and os.path.isfile(paths[2]):
+                return paths
+    return None
+
+def speech_recognition_data_dir() -> Optional[str]:
+    """speech_recognition's bundled pocketsphinx-data directory, if the package is installed."""
+    from importlib.util import find_spec
+    spec = find_spec("speech_recognition")
+    if spec is None or not spec.origin:
+        return None
+    return os.path.join(os.path.dirname(spec.origin), "pocketsphinx-data")
+
+def target_words(text: str) -> List[str]:
+    return re.findall(r"[^\W\d_]+(?:'[^\W\d_]+)?", text.lower())
+
+def mispronunciations(word: str) -> List[str]:
+    """Spellings of word after one learner substitution (every occurrence of the pattern)."""
+    variants = []
+    for wrong, right in LEARNER_SUBSTITUTIONS:
+        if wrong in word:
+            variant = word.replace(wrong, right)
+            if variant and variant != word and variant not in variants:
+                variants.append(variant)
+    return variants
+
+def build_jsgf(name: str, alternatives: List[List[str]]) -> str:
+    """A grammar for one utterance: each slot is one of its alternatives, or skipped."""
+    slots = " ".join(f"[ ( {' | '.join(words)} ) ]" for words in alternatives)
+    return f"#JSGF V1.0;\ngrammar {name};\npublic <utt> = {slots} ;\n"
+
+class SphinxDecoder:
+    """One warm pocketsphinx decoder, reused for every offline assessment.
+
+    Loading the acoustic model, language model and dictionary is the slow
+    part of recognize_sphinx, and it happens on every call there. Here it
+    happens once. Searches built for a target sentence (grammar or keyword
+    list) are kept too, up to max_searches, so repeating a phrase costs
+    nothing but the decode.
+    """
+
+    def __init__(self, paths: SphinxPaths, max_searches: int = 16, keyword_threshold: float = 1e-10):
+        from pocketsphinx import Decoder
+        hmm, lm, dictionary = paths
+        self.paths = paths
+        self.keyword_threshold = keyword_threshold
+        self.max_searches = max_searches
+        self._decoder = Decoder(hmm=hmm, lm=lm, dict=dictionary, logfn=os.devnull)
+        self._searches: "OrderedDict[str, bool]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def has_word(self, word: str) -> bool:
+        return self._decoder.lookup_word(word) is not None
+
+    def alternatives(self, text: str) -> Optional[List[List[str]]]:
+        """[[word, variant, ...], ...] for text, or None if a target word is out of vocabulary."""
+        slots = []
+        for word in target_words(text):
+            if not self.has_word(word):
+                return None
+            slots.append([word] + [v for v in mispronunciations(word) if self.has_word(v)])
+        return slots or None
+
+    def _search_for(self, text: str, mode: str) -> str:
+        """Name of a search for text in mode, built on first use; DEFAULT_SEARCH if it can't be."""
+        if mode not in ("grammar", "keyword") or not text:
+            return DEFAULT_SEARCH
+        name = f"{mode}_{hashlib.sha1(text.encode('utf-8')).hexdigest()[:12]}"
+        if name in self._searches:
+            self._searches.move_to_end(name)
+            return name
+        slots = self.alternatives(text)
+        if slots is None:
+            print(f"DEBUG: Offline ASR: '{text}' has words outside the dictionary, using the language model")
+            return DEFAULT_SEARCH
+        if mode == "grammar":
+            self._decoder.add_jsgf_string(name, build_jsgf(name, slots))
+        else:
+            self._add_keywords(name, sorted({w for words in slots for w in words}))
+        self._searches[name] = True
+        while len(self._searches) > self.max_searches:
+            old, _ = self._searches.popitem(last=False)
+            self._decoder.remove_search(old)
+        return name
+
+    def _add_keywords(self, name: str, words: List[str]):
+        fd, path = tempfile.mkstemp(suffix=".kws")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.writelines(f"{word} /{self.keyword_threshold:g}/\n" for word in words)
+            self._decoder.add_kws(name, path)
+        finally:
+            os.remove(path)
+
+    def decode(self, raw: bytes, target_text: Optional[str] = None, mode: str = "lm") -> Optional[str]:
+        """Transcribe 16 kHz 16-bit mono PCM. Returns None when nothing was recognised."""
+        with self._lock:
+            search = self._search_for(target_text or "", mode)
+            if self._decoder.current_search() != search:
+                self._decoder.activate_search(search)
+            self._decoder.start_utt()
+            self._decoder.process_raw(raw, False, True)
+            self._decoder.end_utt()
+            hyp = self._decoder.hyp()
+        words = hyp.hypstr.split() if hyp is not None else []
+        if search.startswith("keyword_"):
+            # The spotter can report one word several times over its duration
+            words = [w for i, w in enumerate(words) if i == 0 or w != words[i - 1]]
+        return " ".join(words) or None
@@ -0,0 +1,75 @@
+import hashlib
+import os
+from typing import NamedTuple, Optional
+
+# Config value -> onnxruntime.GraphOptimizationLevel member
+GRAPH_OPTIMIZATION_LEVELS = {
+    "disable": "ORT_DISABLE_ALL",
+    "basic": "ORT_ENABLE_BASIC",
+    "extended": "ORT_ENABLE_EXTENDED",
+    "all": "ORT_ENABLE_ALL",
+}
+
+class SessionSettings(NamedTuple):
+    intra_op_threads: int = 0  # 0: onnxruntime's default, one per physical core
+    inter_op_threads: int = 1
+    graph_optimization: str = "all"
+    cache_optimized: bool = True
+
+def optimized_model_path(model_path: str, settings: SessionSettings, cache_dir: str) -> str:
+    """Where the optimized copy of model_path is kept.
+
+    The name changes with the model file, the onnxruntime version and the
+    optimization level, so a stale copy is never loaded.
+    """
+    import onnxruntime as ort
+    stat = os.stat(model_path)
+    key = f"{os.path.abspath(model_path)}:{stat.st_size}:{stat.st_mtime_ns}:{ort.__version__}:{settings.graph_optimization}"
+    name = os.path.splitext(os.path.basename(model_path))[0]
+    return os.path.join(cache_dir, f"{name}.{settings.graph_optimization}.{hashlib.sha256(key.encode()).hexdigest()[:16]}.ort")
+
+def session_options(settings: SessionSettings, level: Optional[str] = None):
+    import onnxruntime as ort
+    options = ort.SessionOptions()
+    if settings.intra_op_threads > 0:
+        options.intra_op_num_threads = settings.intra_op_threads
+    options.inter_op_num_threads = max(1, settings.inter_op_threads)
+    options.execution_mode = (ort.ExecutionMode.ORT_PARALLEL if settings.inter_op_threads > 1
+                              else ort.ExecutionMode.ORT_SEQUENTIAL)
+    level = level or GRAPH_OPTIMIZATION_LEVELS.get(settings.graph_optimization, "ORT_ENABLE_ALL")
+    options.graph_optimization_level = getattr(ort.GraphOptimizationLevel, level)
+    return options
+
+def create_session(model_path: str, settings: Optional[SessionSettings] = None, cache_dir: Optional[str] = None):
+    """An onnxruntime CPU session for model_path.
+
+    With cache_optimized, the first load saves the optimized graph in ORT
+    format to cache_dir. Later loads read that file with optimization
+    disabled, skipping both the protobuf parse and the graph rewrite.
+    """
+    import onnxruntime as ort
+    settings = settings or SessionSettings()
+    providers = ["CPUExecutionProvider"]
+    if not (settings.cache_optimized and cache_dir and settings.graph_optimization != "disable"):
+        return ort.InferenceSession(model_path, session_options(settings), providers=providers)
+
+    cached = optimized_model_path(model_path, settings, cache_dir)
+    if os.path.exists(cached):
+        try:
+            return ort.InferenceSession(cached, session_options(settings, "ORT_DISABLE_ALL"), providers=providers)
+        except Exception as e:
+            print(f"DEBUG: Optimized model {cached} unusable ({e}), rebuilding")
+            os.remove(cached)
+
+    os.makedirs(cache_dir, exist_ok=True)
+    options = session_options(settings)
+    tmp = cached + ".tmp"
+    options.optimized_model_filepath = tmp
+    options.add_session_config_entry("session.save_model_format", "ORT")
+    session = ort.InferenceSession(model_path, options, providers=providers)
+    try:
+        os.replace(tmp, cached)
+        print(f"DEBUG: Saved optimized model to {cached}")
+    except OSError as e:
+        print(f"DEBUG: Could not save optimized model: {e}")
+    return session
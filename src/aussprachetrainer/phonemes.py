@@ -0,0 +1,258 @@
+import threading
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+# Symbols that belong to the preceding segment rather than starting a new one
+# (combining diacritics are recognised via unicodedata on top of these)
+MODIFIERS = "ːˑʰʲʷˠˀ"
+# Not segments at all: stress, syllable and linking marks, punctuation
+IGNORED = "ˈˌ.‿|-'\",;:!?()[]/"
+
+# Multi-letter segments: affricates and German diphthongs (espeak writes the
+# latter without the non-syllabic mark, GermanIPAProcessor with it)
+MULTI_LETTER = sorted([
+    "pf", "ts", "tʃ", "dʒ", "p͡f", "t͡s", "t͡ʃ", "d͡ʒ",
+    "aɪ̯", "ai̯", "aʊ̯", "au̯", "ɔʏ̯", "ɔɪ̯", "ɔø̯",
+    "aɪ", "aʊ", "ɔʏ", "ɔɪ", "ɔø",
+], key=len, reverse=True)
+
+# Feature vector layout, with the weight of a full difference in each feature
+FEATURES = ["vowel", "place", "stop", "fricative", "nasal", "lateral", "rhotic", "voice",
+            "height", "back", "round", "long", "aspirated", "devoiced", "nonsyllabic", "syllabic"]
+WEIGHTS = np.array([1.0, 0.8, 0.4, 0.4, 0.5, 0.4, 0.4, 0.2,
+                    0.5, 0.3, 0.25, 0.2, 0.1, 0.1, 0.15, 0.15], dtype=np.float32)
+
+# place: 0 bilabial, 1 labiodental, 2 dental, 3 alveolar, 4 postalveolar,
+# 5 palatal, 6 velar, 7 uvular, 8 glottal
+# (place, stop, fricative, nasal, lateral, rhotic, voice)
+CONSONANTS: Dict[str, Tuple[int, int, int, int, int, int, int]] = {
+    "p": (0, 1, 0, 0, 0, 0, 0), "b": (0, 1, 0, 0, 0, 0, 1), "m": (0, 0, 0, 1, 0, 0, 1),
+    "f": (1, 0, 1, 0, 0, 0, 0), "v": (1, 0, 1, 0, 0, 0, 1), "pf": (1, 1, 1, 0, 0, 0, 0),
+    "θ": (2, 0, 1, 0, 0, 0, 0), "ð": (2, 0, 1, 0, 0, 0, 1),
+    "t": (3, 1, 0, 0, 0, 0, 0), "d": (3, 1, 0, 0, 0, 0, 1), "n": (3, 0, 0, 1, 0, 0, 1),
+    "s": (3, 0, 1, 0, 0, 0, 0), "z": (3, 0, 1, 0, 0, 0, 1), "ts": (3, 1, 1, 0, 0, 0, 0),
+    "l": (3, 0, 0, 0, 1, 0, 1), "r": (3, 0, 0, 0, 0, 1, 1), "ɾ": (3, 0, 0, 0, 0, 1, 1),
+    "ʃ": (4, 0, 1, 0, 0, 0, 0), "ʒ": (4, 0, 1, 0, 0, 0, 1),
+    "tʃ": (4, 1, 1, 0, 0, 0, 0), "dʒ": (4, 1, 1, 0, 0, 0, 1),
+    "ç": (5, 0, 1, 0, 0, 0, 0), "j": (5, 0, 0, 0, 0, 0, 1),
+    "k": (6, 1, 0, 0, 0, 0, 0), "g": (6, 1, 0, 0, 0, 0, 1), "ɡ": (6, 1, 0, 0, 0, 0, 1),
+    "ŋ": (6, 0, 0, 1, 0, 0, 1), "x": (6, 0, 1, 0, 0, 0, 0), "w": (0, 0, 0, 0, 0, 0, 1),
+    "χ": (7, 0, 1, 0, 0, 0, 0), "ʁ": (7, 0, 1, 0, 0, 1, 1), "ʀ": (7, 0, 0, 0, 0, 1, 1),
+    "h": (8, 0, 1, 0, 0, 0, 0), "ʔ": (8, 1, 0, 0, 0, 0, 0),
+}
+# (height 0 close .. 6 open, backness 0 front .. 2 back, rounded)
+VOWELS: Dict[str, Tuple[int, int, int]] = {
+    "i": (0, 0, 0), "y": (0, 0, 1), "ɪ": (1, 0, 0), "ʏ": (1, 0, 1), "e": (2, 0, 0), "ø": (2, 0, 1),
+    "ɛ": (4, 0, 0), "œ": (4, 0, 1), "æ": (5, 0, 0), "ə": (3, 1, 0), "ɜ": (4, 1, 0), "ɐ": (5, 1, 0),
+    "a": (6, 1, 0), "ɑ": (6, 2, 0), "u": (0, 2, 1), "ʊ": (1, 2, 1), "o": (2, 2, 1), "ɔ": (4, 2, 1),
+    "ʌ": (4, 2, 0),
+}
+# Deleting or inserting a segment costs 1, except these easily dropped ones
+INDEL_COSTS = {"ʔ": 0.4, "h": 0.8, "ə": 0.8}
+
+class Segment(NamedTuple):
+    symbol: str
+    start: int  # character span in the IPA string
+    end: int
+    word: int
+
+class PhonemeOp(NamedTuple):
+    op: str  # "match", "sub", "del" (target segment not said) or "ins" (extra segment said)
+    target: Optional[str]
+    actual: Optional[str]
+    target_span: Optional[Tuple[int, int]]
+    actual_span: Optional[Tuple[int, int]]
+    word: int
+    cost: float
+
+class Alignment(NamedTuple):
+    score: float  # 1 - distance / max(len(target), len(actual)), as Levenshtein.normalized_similarity
+    distance: float
+    ops: List[PhonemeOp]
+
+def _is_modifier(ch: str) -> bool:
+    return ch in MODIFIERS or unicodedata.combining(ch) > 0
+
+def tokenize_ipa(ipa: str) -> List[Segment]:
+    """Split IPA into phoneme segments, each base symbol with its diacritics.
+
+    Affricates and diphthongs are single segments; stress and syllable
+    marks are dropped. Whitespace separates words. Spans index the
+    NFC-normalised string.
+    """
+    ipa = unicodedata.normalize("NFC", ipa)
+    segments = []
+    word = 0
+    i = 0
+    while i < len(ipa):
+        ch = ipa[i]
+        if ch.isspace():
+            if segments and segments[-1].word == word:
+                word += 1
+            i += 1
+            continue
+        if ch in IGNORED or _is_modifier(ch):
+            # A stray modifier (e.g. after a dropped stress mark) has nothing to attach to
+            i += 1
+            continue
+        start = i
+        for multi in MULTI_LETTER:
+            if ipa.startswith(multi, i):
+                i += len(multi)
+                break
+        else:
+            i += 1
+        while i < len(ipa) and _is_modifier(ipa[i]):
+            i += 1
+        segments.append(Segment(ipa[start:i], start, i, word))
+    return segments
+
+def _base_features(base: str) -> np.ndarray:
+    f = np.zeros(len(FEATURES), dtype=np.float32)
+    if base in CONSONANTS:
+        place, stop, fric, nasal, lateral, rhotic, voice = CONSONANTS[base]
+        f[1:8] = (place / 8, stop, fric, nasal, lateral, rhotic, voice)
+    elif base in VOWELS:
+        height, back, rounded = VOWELS[base]
+        f[0] = 1.0
+        f[7] = 1.0
+        f[8:11] = (height / 6, back / 2, rounded)
+    return f
+
+def segment_features(symbol: str) -> np.ndarray:
+    """Articulatory feature vector of one segment (see FEATURES)."""
+    base = "".join(ch for ch in symbol if not _is_modifier(ch))
+    if base in CONSONANTS or base in VOWELS:
+        f = _base_features(base)
+    else:
+        # Diphthong, or a symbol we have no entry for: mean over its letters
+        parts = [_base_features(ch) for ch in base if ch in CONSONANTS or ch in VOWELS]
+        f = np.mean(parts, axis=0) if parts else np.zeros(len(FEATURES), dtype=np.float32)
+        if base and base[0] in VOWELS:
+            f[0] = 1.0
+    if "ː" in symbol:
+        f[11] = 1.0
+    elif "ˑ" in symbol:
+        f[11] = 0.5
+    if "ʰ" in symbol:
+        f[12] = 1.0
+    if "̥" in symbol or "̊" in symbol:  # voiceless ring below / above
+        f[13] = 1.0
+        f[7] = 0.5
+    if "̯" in symbol and len(base) == 1:  # non-syllabic
+        f[14] = 1.0
+    if "̩" in symbol:  # syllabic
+        f[15] = 1.0
+    return f
+
+class PhonemeInventory:
+    """Integer ids for segment symbols, with a cached substitution-cost matrix.
+
+    Costs are weighted L1 distances between feature vectors, capped at 1,
+    so /b/ vs /p/ is cheap, /b/ vs /a/ is a full substitution, and two
+    spellings whose features are identical cost nothing. Symbols we have
+    no features for only match themselves.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._features = np.zeros((0, len(FEATURES)), dtype=np.float32)
+        self._known = np.zeros(0, dtype=bool)
+        self._costs = np.zeros((0, 0), dtype=np.float32)
+        self._indel = np.zeros(0, dtype=np.float32)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def encode(self, segments: List[Segment]) -> np.ndarray:
+        with self._lock:
+            new = list(dict.fromkeys(s.symbol for s in segments if s.symbol not in self._ids))
+            if new:
+                old = len(self._symbols)
+                for symbol in new:
+                    self._ids[symbol] = len(self._symbols)
+                    self._symbols.append(symbol)
+                self._rebuild(old)
+            return np.fromiter((self._ids[s.symbol] for s in segments), dtype=np.int32, count=len(segments))
+
+    def _rebuild(self, old: int):
+        added = self._symbols[old:]
+        self._features = np.vstack([self._features] + [segment_features(s)[None, :] for s in added])
+        known = [any(ch in CONSONANTS or ch in VOWELS for ch in s) for s in added]
+        self._known = np.concatenate([self._known, np.array(known, dtype=bool)])
+        self._indel = np.concatenate([self._indel, np.array(
+            [INDEL_COSTS.get("".join(ch for ch in s if not _is_modifier(ch)), 1.0) for s in added], dtype=np.float32)])
+        # All pairs at once: |f_a - f_b| . w
+        diff = np.abs(self._features[:, None, :] - self._features[None, :, :]) @ WEIGHTS
+        costs = np.minimum(diff, 1.0).astype(np.float32)
+        unknown = ~(self._known[:, None] & self._known[None, :])
+        costs[unknown] = 1.0
+        np.fill_diagonal(costs, 0.0)
+        self._costs = costs
+
+    def costs(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(substitution matrix, per-symbol insertion/deletion cost), indexed by id."""
+        with self._lock:
+            return self._costs, self._indel
+
+# Shared across assessments so the matrix is only rebuilt when a new symbol appears
+INVENTORY = PhonemeInventory()
+
+def _distance_matrix(sub: np.ndarray, dele: np.ndarray, ins: np.ndarray) -> np.ndarray:
+    """Weighted edit-distance table, one vectorised row at a time.
+
+    Within a row, D[i, j] = min(c[j], D[i, j-1] + ins[j]), where c holds the
+    diagonal and vertical moves. That recurrence unrolls to a running minimum
+    of c[k] - S[k] plus S[j], with S the cumulative insertion cost, so each
+    row is one np.minimum.accumulate instead of a Python loop over columns.
+    """
+    n, m = sub.shape
+    ins_cum = np.concatenate([[0.0], np.cumsum(ins)])
+    d = np.empty((n + 1, m + 1), dtype=np.float64)
+    d[0] = ins_cum
+    for i in range(1, n + 1):
+        c = np.empty(m + 1)
+        c[0] = d[i - 1, 0] + dele[i - 1]
+        np.minimum(d[i - 1, :-1] + sub[i - 1], d[i - 1, 1:] + dele[i - 1], out=c[1:])
+        d[i] = np.minimum.accumulate(c - ins_cum) + ins_cum
+    return d
+
+def align(target_ipa: str, actual_ipa: str, inventory: Optional[PhonemeInventory] = None) -> Alignment:
+    """Align what was said against the target, phoneme by phoneme."""
+    inventory = inventory or INVENTORY
+    target = tokenize_ipa(target_ipa)
+    actual = tokenize_ipa(actual_ipa)
+    a = inventory.encode(target)
+    b = inventory.encode(actual)
+    costs, indel = inventory.costs()
+    sub = costs[np.ix_(a, b)]
+    d = _distance_matrix(sub, indel[a], indel[b])
+
+    ops: List[PhonemeOp] = []
+    i, j = len(a), len(b)
+    while i or j:
+        t = target[i - 1] if i else None
+        s = actual[j - 1] if j else None
+        if i and j and abs(d[i, j] - d[i - 1, j - 1] - sub[i - 1, j - 1]) < 1e-6:
+            cost = float(sub[i - 1, j - 1])
+            ops.append(PhonemeOp("match" if cost == 0 else "sub", t.symbol, s.symbol,
+                                 (t.start, t.end), (s.start, s.end), t.word, cost))
+            i, j = i - 1, j - 1
+        elif i and abs(d[i, j] - d[i - 1, j] - indel[a[i - 1]]) < 1e-6:
+            ops.append(PhonemeOp("del", t.symbol, None, (t.start, t.end), None, t.word, float(indel[a[i - 1]])))
+            i -= 1
+        else:
+            # Attach an insertion to the word of the target segment before it
+            word = target[i - 1].word if i else 0
+            ops.append(PhonemeOp("ins", None, s.symbol, None, (s.start, s.end), word, float(indel[b[j - 1]])))
+            j -= 1
+    ops.reverse()
+
+    distance = float(d[len(a), len(b)])
+    longest = max(len(a), len(b))
+    score = 1.0 - distance / longest if longest else 1.0
+    return Alignment(max(0.0, score), distance, ops)
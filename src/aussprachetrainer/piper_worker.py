@@ -0,0 +1,188 @@
+import json
+import os
+import queue
+import subprocess
+import threading
+import time
+from typing import Dict, List, Optional
+
+class PiperWorker:
+    """A long-lived piper process serving one voice model.
+
+    Requests are JSON lines on stdin ({"text": ..., "output_file": ...});
+    piper answers each with the path of the WAV it wrote. Keeping the process
+    alive means the .onnx model is loaded once instead of per utterance.
+    A crashed process is restarted on the next request, and an idle one is
+    shut down after idle_timeout seconds.
+    """
+
+    def __init__(self, model_path: str, command: Optional[List[str]] = None,
+                 idle_timeout: float = 300.0, request_timeout: float = 60.0):
+        self.model_path = model_path
+        self.command = command or ["piper"]
+        self.idle_timeout = idle_timeout
+        self.request_timeout = request_timeout
+        self.proc: Optional[subprocess.Popen] = None
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._exited = threading.Event()
+        self._lock = threading.Lock()
+        self._idle_timer: Optional[threading.Timer] = None
+        self._last_used = time.monotonic()
+
+    def is_alive(self) -> bool:
+        """Health check: the process is running and its pipes are open."""
+        return (self.proc is not None and self.proc.poll() is None
+                and not self._exited.is_set() and not self.proc.stdin.closed)
+
+    def start(self):
+        cmd = self.command + ["-m", self.model_path, "--json-input",
+                              "--output_dir", os.path.dirname(os.path.abspath(self.model_path))]
+        print(f"DEBUG: Starting Piper worker: {' '.join(cmd)}")
+        self.proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.DEVNULL, text=True, encoding="utf-8", bufsize=1)
+        self._lines = queue.Queue()
+        self._exited = threading.Event()
+        threading.Thread(target=self._read_stdout, args=(self.proc, self._lines, self._exited), daemon=True).start()
+
+    @staticmethod
+    def _read_stdout(proc: subprocess.Popen, lines: "queue.Queue[Optional[str]]", exited: threading.Event):
+        for line in proc.stdout:
+            lines.put(line.strip())
+        # EOF: the process exited
+        exited.set()
+        lines.put(None)
+
+    def synthesize(self, text: str, filepath: str) -> str:
+        """Write text as speech to filepath, restarting piper once if it crashed."""
+        with self._lock:
+            self._cancel_idle_timer()
+            try:
+                try:
+                    return self._request(text, filepath)
+                except (OSError, ValueError, RuntimeError) as e:
+                    # OSError includes BrokenPipeError; ValueError is a write to a closed stdin
+                    print(f"DEBUG: Piper worker failed ({e}), restarting")
+                    self._stop_locked()
+                    try:
+                        return self._request(text, filepath)
+                    except (OSError, ValueError, RuntimeError):
+                        self._stop_locked()
+                        raise
+            finally:
+                self._last_used = time.monotonic()
+                self._schedule_idle_shutdown()
+
+    def _request(self, text: str, filepath: str) -> str:
+        if not self.is_alive():
+            self.start()
+        # Newlines would split the request into several utterances
+        payload = {"text": " ".join(text.split()), "output_file": os.path.abspath(filepath)}
+        self.proc.stdin.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        self.proc.stdin.flush()
+        try:
+            line = self._lines.get(timeout=self.request_timeout)
+        except queue.Empty:
+            raise RuntimeError("Piper worker timed out")
+        if line is None:
+            raise RuntimeError(f"Piper worker exited with code {self.proc.poll()}")
+        if not os.path.exists(filepath):
+            raise RuntimeError(f"Piper reported {line} but {filepath} is missing")
+        return filepath
+
+    def _schedule_idle_shutdown(self):
+        if self.idle_timeout and self.idle_timeout > 0:
+            timer = threading.Timer(self.idle_timeout, self._stop_if_idle)
+            timer.args = (timer,)
+            timer.daemon = True
+            self._idle_timer = timer
+            timer.start()
+
+    def _stop_if_idle(self, timer: threading.Timer):
+        # A timer can fire just as a request takes the lock; decide under that
+        # lock, and only for the latest timer after a full idle period
+        with self._lock:
+            if timer is not self._idle_timer or time.monotonic() - self._last_used < self.idle_timeout:
+                return
+            self._idle_timer = None
+            self._stop_locked()
+
+    def _cancel_idle_timer(self):
+        if self._idle_timer:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+
+    def stop(self):
+        with self._lock:
+            self._cancel_idle_timer()
+            self._stop_locked()
+
+    def _stop_locked(self):
+        if self.proc is None:
+            return
+        print(f"DEBUG: Stopping Piper worker for {os.path.basename(self.model_path)}")
+        try:
+            self.proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            self.proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+
+class PiperWorkerPool:
+    """Up to workers_per_model PiperWorkers per loaded voice model.
+
+    Each request goes to the least busy worker of its model; a further
+    process is only started when all existing ones are busy.
+    """
+
+    def __init__(self, command: Optional[List[str]] = None, idle_timeout: float = 300.0,
+                 workers_per_model: int = 1):
+        self.command = command
+        self.idle_timeout = idle_timeout
+        self.workers_per_model = max(1, workers_per_model)
+        self.workers: Dict[str, List[PiperWorker]] = {}
+        self._busy: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _new_worker(self, model_path: str) -> PiperWorker:
+        worker = PiperWorker(model_path, command=self.command, idle_timeout=self.idle_timeout)
+        self.workers.setdefault(model_path, []).append(worker)
+        self._busy[id(worker)] = 0
+        return worker
+
+    def get(self, model_path: str) -> PiperWorker:
+        with self._lock:
+            workers = self.workers.get(model_path)
+            return workers[0] if workers else self._new_worker(model_path)
+
+    def _acquire(self, model_path: str) -> PiperWorker:
+        with self._lock:
+            workers = self.workers.get(model_path) or []
+            worker = min(workers, key=lambda w: self._busy[id(w)], default=None)
+            if worker is None or (self._busy[id(worker)] and len(workers) < self.workers_per_model):
+                worker = self._new_worker(model_path)
+            self._busy[id(worker)] += 1
+            return worker
+
+    def _release(self, worker: PiperWorker):
+        with self._lock:
+            if id(worker) in self._busy:
+                self._busy[id(worker)] -= 1
+
+    def synthesize(self, model_path: str, text: str, filepath: str) -> str:
+        worker = self._acquire(model_path)
+        try:
+            return worker.synthesize(text, filepath)
+        finally:
+            self._release(worker)
+
+    def shutdown(self):
+        with self._lock:
+            workers = [w for ws in self.workers.values() for w in ws]
+            self.workers.clear()
+            self._busy.clear()
+        for w in workers:
+            w.stop()
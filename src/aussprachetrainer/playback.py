@@ -0,0 +1,324 @@
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Optional, Tuple
+
+import numpy as np
+try:
+    import sounddevice as sd
+except (ImportError, OSError):
+    # OSError: PortAudio library missing
+    sd = None
+
+class StreamingPlayer:
+    """Play audio chunks on the PlaybackManager's stream while later chunks are still being synthesized.
+
+    feed() never blocks. If the output stream cannot be opened the error is
+    kept and re-raised by finish(), so the caller can fall back to file
+    playback. first_sample_time records when the device first pulled a
+    sample, for measuring time-to-first-audio.
+    """
+
+    def __init__(self, manager: "PlaybackManager"):
+        self.manager = manager
+        self.samplerate: Optional[int] = None
+        self.error: Optional[Exception] = None
+        self._generation: Optional[int] = None
+        self._stopped = False
+        self._first_sample_time: Optional[float] = None
+
+    @staticmethod
+    def is_available() -> bool:
+        return sd is not None
+
+    @property
+    def first_sample_time(self) -> Optional[float]:
+        if self._first_sample_time is None and self._generation is not None:
+            self._first_sample_time = self.manager.first_sample_time_of(self._generation)
+        return self._first_sample_time
+
+    def feed(self, samples: np.ndarray, samplerate: int):
+        if self._stopped or self.error is not None:
+            return
+        if self._generation is None:
+            self.samplerate = samplerate
+            try:
+                self._generation = self.manager.begin_stream(samplerate)
+            except Exception as e:
+                print(f"DEBUG: Streaming playback failed: {e}")
+                self.error = e
+                return
+        elif samplerate != self.samplerate:
+            raise ValueError(f"Sample rate changed mid-stream: {self.samplerate} -> {samplerate}")
+        if not self.manager.append(samples, self._generation):
+            self._stopped = True  # Another clip took over the stream
+
+    def finish(self, wait: bool = True):
+        """Signal that no more chunks follow; optionally block until playback ends.
+
+        Raises the error that kept the stream from opening, if any.
+        """
+        if self.error is not None:
+            raise self.error
+        if wait and self._generation is not None:
+            self.manager.wait_for(self._generation)
+            self.first_sample_time  # Snapshot before a later clip resets it
+
+    def stop(self):
+        """Abort playback immediately."""
+        self._stopped = True
+        if self._generation is not None:
+            self.manager.cancel(self._generation)
+
+class PlaybackManager:
+    """In-process player for finished audio files.
+
+    Decoded PCM is kept in an LRU keyed by path, so replays skip both process
+    start-up and decoding. play(), queue() and stop() return immediately;
+    starting a new clip cancels whatever is playing or still being decoded.
+    One output stream is reused for as long as the sample rate stays the same;
+    StreamingPlayer feeds synthesized chunks into the same stream.
+    """
+
+    def __init__(self, cache_bytes: int = 64 * 1024 * 1024):
+        self.cache_bytes = cache_bytes
+        self._cache: "OrderedDict[str, Tuple[np.ndarray, int]]" = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.RLock()
+        self._stream = None
+        self._stream_rate: Optional[int] = None
+        self._stream_lock = threading.Lock()
+        self._current: Optional[np.ndarray] = None
+        self._pos = 0
+        self._pending: Deque[np.ndarray] = deque()
+        self._generation = 0
+        self._first_sample_time: Optional[float] = None
+        self._idle = threading.Event()
+        self._idle.set()
+
+    @staticmethod
+    def is_available() -> bool:
+        return sd is not None
+
+    # --- Decoding ---
+
+    def load(self, path: str) -> Tuple[np.ndarray, int]:
+        """Return (mono float32 samples, sample_rate) for path, decoding at most once."""
+        with self._lock:
+            key = os.path.abspath(path)
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                return entry
+        import soundfile as sf
+        samples, samplerate = sf.read(path, dtype="float32", always_2d=True)
+        samples = np.ascontiguousarray(samples.mean(axis=1) if samples.shape[1] > 1 else samples[:, 0])
+        with self._lock:
+            self._cache[key] = (samples, samplerate)
+            self._cached_bytes += samples.nbytes
+            while self._cached_bytes > self.cache_bytes and len(self._cache) > 1:
+                _, (old, _) = self._cache.popitem(last=False)
+                self._cached_bytes -= old.nbytes
+        return samples, samplerate
+
+    def evict(self, path: str):
+        with self._lock:
+            entry = self._cache.pop(os.path.abspath(path), None)
+            if entry is not None:
+                self._cached_bytes -= entry[0].nbytes
+
+    # --- Control ---
+
+    def play(self, path: str, on_error: Optional[Callable[[Exception], None]] = None):
+        """Start playing path, cancelling the current clip and the queue."""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._pending.clear()
+            self._current = None
+            self._idle.clear()
+        self._decode_then(path, generation, False, on_error)
+
+    def queue(self, path: str, on_error: Optional[Callable[[Exception], None]] = None):
+        """Play path after the current clip (and anything already queued)."""
+        with self._lock:
+            generation = self._generation
+            self._idle.clear()
+        self._decode_then(path, generation, True, on_error)
+
+    def play_samples(self, samples: np.ndarray, samplerate: int):
+        """Play an in-memory buffer, cancelling the current clip."""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._pending.clear()
+            self._current = None
+            self._idle.clear()
+        try:
+            self._start(np.asarray(samples, dtype=np.float32).reshape(-1), samplerate, generation)
+        except Exception:
+            self._settle(generation)
+            raise
+
+    def stop(self):
+        with self._lock:
+            self._generation += 1
+            self._pending.clear()
+            self._current = None
+            self._idle.set()
+
+    def cancel(self, generation: int):
+        """stop(), but only if generation is still the one playing."""
+        with self._lock:
+            if generation == self._generation:
+                self.stop()
+
+    # --- Streaming ---
+
+    def begin_stream(self, samplerate: int) -> int:
+        """Cancel the current clip and ready the stream for append(). Returns the stream's generation."""
+        self._ensure_stream(samplerate)
+        with self._lock:
+            self._generation += 1
+            self._pending.clear()
+            self._current = None
+            self._first_sample_time = None
+            return self._generation
+
+    def append(self, samples: np.ndarray, generation: int) -> bool:
+        """Queue a chunk of a stream begun with begin_stream(). False once the stream was cancelled."""
+        samples = np.asarray(samples, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if generation != self._generation:
+                return False
+            if self._current is None:
+                # First chunk, or synthesis fell behind and playback ran dry
+                self._current = samples
+                self._pos = 0
+            else:
+                self._pending.append(samples)
+            self._idle.clear()
+            return True
+
+    def wait_for(self, generation: int, timeout: Optional[float] = None) -> bool:
+        """Block until generation has played out or was cancelled. Returns False on timeout."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            with self._lock:
+                if generation != self._generation or self._idle.is_set():
+                    return True
+            remaining = 0.05 if deadline is None else min(0.05, deadline - time.perf_counter())
+            if remaining <= 0:
+                return False
+            self._idle.wait(remaining)
+
+    def first_sample_time_of(self, generation: int) -> Optional[float]:
+        with self._lock:
+            return self._first_sample_time if generation == self._generation else None
+
+    def is_playing(self) -> bool:
+        return not self._idle.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until playback is idle. Returns False on timeout."""
+        return self._idle.wait(timeout)
+
+    def close(self):
+        self.stop()
+        with self._stream_lock:
+            if self._stream is not None:
+                try:
+                    self._stream.close()
+                except Exception:
+                    pass
+            self._stream = None
+            self._stream_rate = None
+
+    # --- Internals ---
+
+    def _decode_then(self, path: str, generation: int, append: bool, on_error):
+        def work():
+            try:
+                samples, samplerate = self.load(path)
+                if append:
+                    with self._lock:
+                        if generation != self._generation:
+                            return
+                        if self._current is not None or self._pending:
+                            self._pending.append(resample_linear(samples, samplerate, self._stream_rate))
+                            return
+                self._start(samples, samplerate, generation)
+            except Exception as e:
+                # Decoding or opening the device failed: nothing will play
+                self._settle(generation)
+                if on_error:
+                    on_error(e)
+                else:
+                    print(f"DEBUG: Playback failed for {path}: {e}")
+
+        with self._lock:
+            cached = os.path.abspath(path) in self._cache
+        if cached:
+            work()  # Already decoded: start without a thread hop
+        else:
+            threading.Thread(target=work, daemon=True).start()
+
+    def _start(self, samples: np.ndarray, samplerate: int, generation: int):
+        # Never hold _lock while opening/closing a stream: closing waits for
+        # the audio callback, which itself takes _lock.
+        self._ensure_stream(samplerate)
+        with self._lock:
+            # A newer play()/stop() cancelled this clip while it was decoding
+            if generation != self._generation:
+                return
+            self._current = samples
+            self._pos = 0
+            self._first_sample_time = None
+            self._idle.clear()
+
+    def _settle(self, generation: int):
+        """Mark playback idle after generation failed to start, unless something else is playing."""
+        with self._lock:
+            if generation == self._generation and self._current is None and not self._pending:
+                self._idle.set()
+
+    def _ensure_stream(self, samplerate: int):
+        with self._stream_lock:
+            if self._stream is not None and self._stream_rate == samplerate:
+                return
+            if self._stream is not None:
+                try:
+                    self._stream.close()
+                except Exception:
+                    pass
+            self._stream = sd.OutputStream(samplerate=samplerate, channels=1, dtype="float32",
+                                           callback=self._callback)
+            self._stream_rate = samplerate
+            self._stream.start()
+
+    def _callback(self, outdata, frames, time_info, status):
+        out = outdata[:, 0]
+        filled = 0
+        with self._lock:
+            while filled < frames and self._current is not None:
+                n = min(frames - filled, len(self._current) - self._pos)
+                out[filled:filled + n] = self._current[self._pos:self._pos + n]
+                if self._first_sample_time is None:
+                    self._first_sample_time = time.perf_counter()
+                filled += n
+                self._pos += n
+                if self._pos >= len(self._current):
+                    self._current = self._pending.popleft() if self._pending else None
+                    self._pos = 0
+                    if self._current is None:
+                        self._idle.set()
+        out[filled:] = 0
+
+def resample_linear(samples: np.ndarray, src_rate: int, dst_rate: int) -> np.ndarray:
+    """Cheap linear-interpolation resampler for queued clips."""
+    if src_rate == dst_rate or len(samples) == 0:
+        return samples
+    n_out = int(round(len(samples) * dst_rate / src_rate))
+    x_out = np.linspace(0, len(samples) - 1, n_out)
+    return np.interp(x_out, np.arange(len(samples)), samples).astype(np.float32)
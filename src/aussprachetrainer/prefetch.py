@@ -0,0 +1,134 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional
+
+class PrefetchRequest(NamedTuple):
+    text: str
+    online: bool = False
+    voice_id: Optional[str] = None
+    online_voice: Optional[str] = None
+
+class PrefetchPool:
+    """Low-priority background synthesis of phrases the user is likely to request next.
+
+    Candidates are grouped by source (e.g. "suggestion", "history"); groups
+    registered earlier take priority. set_targets() replaces a group, which
+    cancels its pending requests that are no longer relevant. Results land in
+    the backend's audio and IPA caches, so the later foreground request is a
+    cache hit.
+
+    cpu_budget is the fraction of one core prefetching may use: after each
+    request the worker sleeps long enough to stay under it. 0 disables
+    prefetching.
+
+    Online requests are dropped unless allow_online is set: speculative
+    prefetching would otherwise send network requests for text the user
+    never plays.
+    """
+
+    def __init__(self, backend, groups: List[str], cpu_budget: float = 0.25, allow_online: bool = False):
+        self.backend = backend
+        self.cpu_budget = cpu_budget
+        self.allow_online = allow_online
+        self._groups: "OrderedDict[str, List[PrefetchRequest]]" = OrderedDict((g, []) for g in groups)
+        self._cond = threading.Condition()
+        self._suspended = 0
+        self._closed = False
+        self._active: Optional[PrefetchRequest] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def set_targets(self, group: str, requests: List[PrefetchRequest]):
+        """Replace the candidates of group, dropping its stale pending requests."""
+        if self.cpu_budget <= 0:
+            return
+        unique: List[PrefetchRequest] = []
+        for r in requests:
+            if r.online and not self.allow_online:
+                continue
+            if r.text.strip() and r not in unique:
+                unique.append(r)
+        with self._cond:
+            self._groups[group] = unique
+            self._ensure_worker()
+            self._cond.notify()
+
+    def pending(self) -> List[PrefetchRequest]:
+        with self._cond:
+            return [r for reqs in self._groups.values() for r in reqs]
+
+    def suspend(self):
+        """Hold off new prefetch work, e.g. while a foreground generation runs."""
+        with self._cond:
+            self._suspended += 1
+
+    def resume(self):
+        with self._cond:
+            self._suspended = max(0, self._suspended - 1)
+            self._cond.notify()
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Block until nothing is pending or running. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._active is not None or any(self._groups.values()):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def shutdown(self):
+        with self._cond:
+            self._closed = True
+            for group in self._groups:
+                self._groups[group] = []
+            self._cond.notify_all()
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def _next(self) -> Optional[PrefetchRequest]:
+        for requests in self._groups.values():
+            if requests:
+                return requests.pop(0)
+        return None
+
+    def _run(self):
+        try:
+            # Lowest scheduling priority for this thread and the engines it spawns (Linux)
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+        except Exception:
+            pass
+        while True:
+            with self._cond:
+                while not self._closed and (self._suspended or not any(self._groups.values())):
+                    self._cond.wait()
+                if self._closed:
+                    return
+                request = self._next()
+                self._active = request
+
+            start = time.perf_counter()
+            try:
+                self._prefetch(request)
+            except Exception as e:
+                print(f"DEBUG: Prefetch of '{request.text}' failed: {e}")
+            elapsed = time.perf_counter() - start
+
+            with self._cond:
+                self._active = None
+                self._cond.notify_all()
+            if 0 < self.cpu_budget < 1:
+                time.sleep(elapsed * (1 / self.cpu_budget - 1))
+
+    def _prefetch(self, request: PrefetchRequest):
+        if self.backend.is_cached(request.text, request.online, request.voice_id, request.online_voice):
+            return
+        print(f"DEBUG: Prefetching '{request.text}'")
+        self.backend.get_ipa(request.text)
+        self.backend.generate_audio(request.text, online=request.online,
+                                    voice_id=request.voice_id, online_voice=request.online_voice)
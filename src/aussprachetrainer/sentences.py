@@ -0,0 +1,33 @@
+import re
+from typing import List
+
+# Common German abbreviations that end in a period but not a sentence
+ABBREVIATIONS = {
+    "z.b.", "d.h.", "u.a.", "usw.", "bzw.", "ca.", "dr.", "nr.", "str.",
+    "etc.", "vgl.", "evtl.", "ggf.", "inkl.", "bzgl.", "s.", "u.", "o.", "hr.", "fr.",
+}
+
+SENTENCE_END_RE = re.compile(r'(?<=[.!?…])\s+|\n+')
+
+def _ends_mid_sentence(segment: str) -> bool:
+    last = segment.split()[-1].lower()
+    # Abbreviations and ordinals ("am 3. Mai")
+    return last in ABBREVIATIONS or re.fullmatch(r'\d+\.', last) is not None
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, keeping their punctuation."""
+    sentences: List[str] = []
+    carry = ""
+    for part in SENTENCE_END_RE.split(text):
+        part = part.strip()
+        if not part:
+            continue
+        part = f"{carry} {part}" if carry else part
+        if _ends_mid_sentence(part):
+            carry = part
+        else:
+            sentences.append(part)
+            carry = ""
+    if carry:
+        sentences.append(carry)
+    return sentences
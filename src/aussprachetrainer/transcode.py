@@ -0,0 +1,104 @@
+import os
+import queue
+import sys
+import threading
+from typing import Callable, Optional, Tuple
+
+# Only uncompressed audio is worth re-encoding; gTTS MP3s are already small
+COMPRESSIBLE_EXTS = {".wav"}
+
+def transcode_file(path: str) -> str:
+    """Losslessly re-encode a WAV file as FLAC next to it.
+
+    Returns the FLAC path; the WAV is left in place for the caller to remove
+    once nothing references it any more.
+    """
+    import soundfile as sf
+    info = sf.info(path)
+    # FLAC stores at most 24-bit integer PCM
+    subtype = "PCM_16" if info.subtype in ("PCM_16", "PCM_U8", "PCM_S8") else "PCM_24"
+    data, samplerate = sf.read(path, dtype="int16" if subtype == "PCM_16" else "int32", always_2d=True)
+    target = os.path.splitext(path)[0] + ".flac"
+    tmp = target + ".tmp"
+    sf.write(tmp, data, samplerate, format="FLAC", subtype=subtype)
+    os.replace(tmp, target)
+    return target
+
+class AudioTranscoder:
+    """Re-encodes persistent audio to FLAC on a background thread.
+
+    on_done(old_path, new_path) is called from the worker thread after each
+    file; it decides whether the original can be deleted.
+    """
+
+    def __init__(self, on_done: Callable[[str, str], None]):
+        self.on_done = on_done
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(self, path: str):
+        if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTS:
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        self._queue.put(path)
+
+    def _run(self):
+        while True:
+            path = self._queue.get()
+            try:
+                if path is None:
+                    return
+                if not os.path.exists(path):
+                    continue
+                target = transcode_file(path)
+                print(f"DEBUG: Transcoded {os.path.basename(path)} -> {os.path.basename(target)}")
+                self.on_done(path, target)
+            except Exception as e:
+                print(f"DEBUG: Transcoding {path} failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        """Block until every submitted file has been processed."""
+        self._queue.join()
+
+    def shutdown(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._queue.put(None)
+
+def migrate_history_audio(db) -> Tuple[int, int]:
+    """Transcode every WAV referenced by history to FLAC.
+
+    Returns (files converted, bytes saved).
+    """
+    converted = 0
+    saved = 0
+    paths = {entry["audio_path"] for entry in db.get_history() if entry.get("audio_path")}
+    for path in sorted(paths):
+        if os.path.splitext(path)[1].lower() not in COMPRESSIBLE_EXTS or not os.path.exists(path):
+            continue
+        try:
+            before = os.path.getsize(path)
+            target = transcode_file(path)
+            db.replace_audio_path(path, target)
+            os.remove(path)
+            converted += 1
+            saved += before - os.path.getsize(target)
+        except Exception as e:
+            print(f"DEBUG: Failed to migrate {path}: {e}")
+    return converted, saved
+
+def main():
+    """Convert existing history audio: python -m aussprachetrainer.transcode [history.db]"""
+    from aussprachetrainer.database import HistoryManager
+    db = HistoryManager(db_path=sys.argv[1] if len(sys.argv) > 1 else None)
+    converted, saved = migrate_history_audio(db)
+    print(f"Converted {converted} files, saved {saved / (1024 * 1024):.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from unittest.mock import patch
+
+from aussprachetrainer.audio_cache import AudioCache
+
+class TestAudioCache(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _store(self, cache, key, size=100):
+        path = cache.path_for(key, ".wav")
+        with open(path, "wb") as f:
+            f.write(b"\0" * size)
+        return cache.commit(key, path)
+
+    def test_key_is_stable_and_normalised(self):
+        a = AudioCache.make_key("Guten  Tag\n", "espeak-ng", "de+m3", "de-DE", 1.0, "1.51")
+        b = AudioCache.make_key(" Guten Tag", "espeak-ng", "de+m3", "de-DE", 1.0, "1.51")
+        self.assertEqual(a, b)
+        self.assertEqual(len(a), 64)
+        # Any parameter that changes the audio changes the key
+        self.assertNotEqual(a, AudioCache.make_key("Guten Tag", "espeak-ng", "de+m3", "de-AT", 1.0, "1.51"))
+        self.assertNotEqual(a, AudioCache.make_key("Guten Tag", "espeak-ng", "de+m3", "de-DE", 0.8, "1.51"))
+        self.assertNotEqual(a, AudioCache.make_key("Guten Tag", "espeak-ng", "de+m3", "de-DE", 1.0, "1.52"))
+
+    def test_entries_survive_restart(self):
+        cache = AudioCache(cache_dir=self.test_dir)
+        key = AudioCache.make_key("Hallo", "piper", "piper:x", "de-DE")
+        path = self._store(cache, key)
+
+        reopened = AudioCache(cache_dir=self.test_dir)
+        self.assertEqual(reopened.get(key), path)
+        self.assertEqual(reopened.total_bytes, 100)
+
+    def test_missing_file_is_a_miss(self):
+        cache = AudioCache(cache_dir=self.test_dir)
+        path = self._store(cache, "ab" * 32)
+        os.remove(path)
+        self.assertIsNone(cache.get("ab" * 32))
+        self.assertEqual(len(cache), 0)
+
+    def test_lru_eviction(self):
+        cache = AudioCache(cache_dir=self.test_dir, max_bytes=250)
+        first = self._store(cache, "a" * 64)
+        self._store(cache, "b" * 64)
+        cache.get("a" * 64)  # "b" is now least recently used
+        self._store(cache, "c" * 64)
+
+        self.assertIsNotNone(cache.get("a" * 64))
+        self.assertIsNone(cache.get("b" * 64))
+        self.assertIsNotNone(cache.get("c" * 64))
+        self.assertTrue(os.path.exists(first))
+        self.assertEqual(cache.total_bytes, 200)
+
+    def test_lru_order_survives_restart(self):
+        cache = AudioCache(cache_dir=self.test_dir)
+        self._store(cache, "a" * 64)
+        self._store(cache, "b" * 64)
+        cache.get("a" * 64)
+        reopened = AudioCache(cache_dir=self.test_dir, max_bytes=150)
+        self._store(reopened, "c" * 64)
+        self.assertIsNone(reopened.get("b" * 64))
+        self.assertIsNone(reopened.get("a" * 64))
+        self.assertIsNotNone(reopened.get("c" * 64))
+
+    def test_hits_are_written_in_batches(self):
+        cache = AudioCache(cache_dir=self.test_dir)
+        self._store(cache, "a" * 64)
+        self._store(cache, "b" * 64)
+        with patch.object(cache, "_connect", side_effect=AssertionError("write on a hit")):
+            cache.get("a" * 64)
+        cache.flush()
+        # "a" was used after "b", so a restart over budget evicts "b"
+        reopened = AudioCache(cache_dir=self.test_dir, max_bytes=250)
+        self._store(reopened, "c" * 64)
+        self.assertIsNone(reopened.get("b" * 64))
+        self.assertIsNotNone(reopened.get("a" * 64))
+
+    def test_read_only_cache_leaves_the_index_to_its_owner(self):
+        owner = AudioCache(cache_dir=self.test_dir, max_bytes=150)
+        old = self._store(owner, "a" * 64)
+        worker = AudioCache(cache_dir=self.test_dir, max_bytes=150, read_only=True)
+        self.assertEqual(worker.get("a" * 64), old)
+
+        path = self._store(worker, "b" * 64)
+        # Over budget, but a worker neither evicts nor writes index.db
+        self.assertTrue(os.path.exists(old))
+        self.assertIsNone(AudioCache(cache_dir=self.test_dir).get("b" * 64))
+
+        for key, entry_path in worker.take_pending():
+            owner.commit(key, entry_path)
+        self.assertEqual(worker.take_pending(), [])
+        self.assertEqual(owner.get("b" * 64), path)
+        self.assertFalse(os.path.exists(old))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys
+import os
+import unittest
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.audio_processing import Crossfader, crossfade_concat, normalize_loudness, time_stretch, trim_silence
+
+class TestCrossfade(unittest.TestCase):
+    def test_length_and_constant_gain(self):
+        segments = [np.ones(100, dtype=np.float32) for _ in range(3)]
+        out = crossfade_concat(segments, 10)
+
+        self.assertEqual(len(out), 300 - 2 * 10)
+        # Complementary fades keep a constant signal constant across joins
+        np.testing.assert_allclose(out, 1.0, atol=1e-6)
+
+    def test_streaming_matches_whole_file(self):
+        rng = np.random.default_rng(1)
+        segments = [rng.standard_normal(n).astype(np.float32) for n in (50, 5, 80)]
+        fader = Crossfader(8)
+        streamed = np.concatenate([fader.push(s) for s in segments] + [fader.flush()])
+
+        np.testing.assert_array_equal(streamed, crossfade_concat(segments, 8))
+
+    def test_zero_overlap_is_plain_concatenation(self):
+        segments = [np.arange(3, dtype=np.float32), np.arange(4, dtype=np.float32)]
+        np.testing.assert_array_equal(crossfade_concat(segments, 0), np.concatenate(segments))
+
+def dominant_frequency(samples: np.ndarray, sample_rate: int) -> float:
+    spectrum = np.abs(np.fft.rfft(samples * np.hanning(len(samples))))
+    return np.argmax(spectrum) * sample_rate / len(samples)
+
+class TestTimeStretch(unittest.TestCase):
+    def setUp(self):
+        self.sample_rate = 22050
+        t = np.arange(self.sample_rate) / self.sample_rate
+        self.tone = (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+    def test_duration_changes_pitch_does_not(self):
+        for speed in (0.5, 0.75, 1.25):
+            out = time_stretch(self.tone, speed, self.sample_rate)
+            self.assertEqual(len(out), round(len(self.tone) / speed))
+            middle = out[len(out) // 4:3 * len(out) // 4]
+            self.assertAlmostEqual(dominant_frequency(middle, self.sample_rate), 220, delta=5)
+
+    def test_level_is_preserved_when_slowing_down(self):
+        out = time_stretch(self.tone, 0.5, self.sample_rate)
+        rms = np.sqrt(np.mean(out[4000:-4000] ** 2))
+        self.assertAlmostEqual(rms, 0.5 / np.sqrt(2), delta=0.02)
+
+    def test_unit_speed_and_short_input_are_copies(self):
+        np.testing.assert_array_equal(time_stretch(self.tone, 1.0, self.sample_rate), self.tone)
+        short = self.tone[:100]
+        np.testing.assert_array_equal(time_stretch(short, 0.5, self.sample_rate), short)
+
+class TestPostProcessing(unittest.TestCase):
+    def setUp(self):
+        self.sample_rate = 16000
+        t = np.arange(8000) / self.sample_rate
+        tone = (0.1 * np.sin(2 * np.pi * 200 * t)).astype(np.float32)
+        self.silence = np.full(4000, 1e-4, dtype=np.float32)
+        self.phrase = np.concatenate([self.silence, tone, self.silence])
+
+    def test_trim_keeps_padding_around_speech(self):
+        out = trim_silence(self.phrase, self.sample_rate, pad_ms=20)
+        pad = int(self.sample_rate * 0.02)
+        self.assertEqual(len(out), 8000 + 2 * pad)
+        self.assertEqual(len(trim_silence(self.phrase, self.sample_rate, trailing=False)), 8000 + pad + 4000)
+
+    def test_silence_is_returned_unchanged(self):
+        np.testing.assert_array_equal(trim_silence(np.zeros(500, dtype=np.float32), self.sample_rate), 0)
+        np.testing.assert_array_equal(normalize_loudness(np.zeros(500, dtype=np.float32), self.sample_rate), 0)
+
+    def test_normalize_ignores_pauses_and_limits_peak(self):
+        out = normalize_loudness(self.phrase, self.sample_rate, target_db=-20)
+        rms = np.sqrt(np.mean(out[4000:12000] ** 2))
+        self.assertAlmostEqual(20 * np.log10(rms), -20, delta=0.1)
+
+        loud = normalize_loudness(self.phrase, self.sample_rate, target_db=0, peak=0.5)
+        self.assertAlmostEqual(float(np.max(np.abs(loud))), 0.5, places=5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,213 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.database import HistoryManager
+from aussprachetrainer.audio_cache import AudioCache
+from aussprachetrainer.backend import PronunciationBackend
+
+def fake_espeak(cmd, **kwargs):
+    """Stand-in for subprocess.run(espeak-ng ...): writes the -w file and prints IPA."""
+    if "-w" in cmd:
+        with open(cmd[cmd.index("-w") + 1], "wb") as f:
+            f.write(b"RIFF")
+    return MagicMock(returncode=0, stdout="hˈaloː\n", stderr="")
+
+def fake_espeak_wav(cmd, **kwargs):
+    """Like fake_espeak, but writes a real WAV whose length depends on the text."""
+    import numpy as np
+    import soundfile as sf
+    if "-w" in cmd:
+        sf.write(cmd[cmd.index("-w") + 1], np.full(100 * len(cmd[-1]), 0.1, dtype=np.float32), 22050)
+    return MagicMock(returncode=0, stdout="hˈaloː\n", stderr="")
+
+class TestBackendGeneration(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.backend = PronunciationBackend()
+        self.backend.db = HistoryManager(db_path=os.path.join(self.test_dir, "history.db"))
+        self.backend.session_dir = self.test_dir
+        self.backend.audio_cache = AudioCache(cache_dir=os.path.join(self.test_dir, "cache"))
+        self.backend._espeak_version = "test"
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def test_backend_owns_audio_cache(self):
+        backend = PronunciationBackend()
+        self.assertIsInstance(backend.audio_cache, AudioCache)
+        self.assertIsNone(backend._espeak_version)
+
+    @patch("aussprachetrainer.backend.subprocess.run")
+    def test_espeak_voice_uses_single_process(self, mock_run):
+        mock_run.side_effect = fake_espeak
+        ipa, path = self.backend.generate_with_ipa("Hallo", online=False, voice_id="de+m3")
+
+        self.assertEqual(mock_run.call_count, 1)
+        cmd = mock_run.call_args[0][0]
+        self.assertIn("--ipa", cmd)
+        self.assertIn("-w", cmd)
+        self.assertTrue(path.endswith(".wav"))
+        self.assertIn("ˈ", ipa)
+
+    @patch("aussprachetrainer.backend.subprocess.run")
+    def test_dialect_mismatch_runs_separately(self, mock_run):
+        mock_run.side_effect = fake_espeak
+        self.backend.set_dialect("de-AT")
+        self.backend.generate_with_ipa("Hallo", online=False, voice_id="de+m3")
+
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch("aussprachetrainer.backend.subprocess.run")
+    def test_cache_hit_skips_synthesis(self, mock_run):
+        mock_run.side_effect = fake_espeak
+        first = self.backend.generate_audio("Hallo", online=False, voice_id="de+m3")
+        second = self.backend.generate_audio("Hallo", online=False, voice_id="de+m3")
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_run.call_count, 1)
+
+    def test_persistent_storage_is_content_addressed(self):
+        self.backend.audio_dir = os.path.join(self.test_dir, "audio")
+        os.makedirs(self.backend.audio_dir)
+        first = os.path.join(self.test_dir, "first.wav")
+        second = os.path.join(self.test_dir, "second.wav")
+        for path in (first, second):
+            with open(path, "wb") as f:
+                f.write(b"same audio")
+
+        blob1 = self.backend.copy_to_persistent(first)
+        blob2 = self.backend.copy_to_persistent(second)
+
+        self.assertEqual(blob1, blob2)
+        self.assertEqual(os.listdir(self.backend.audio_dir), [os.path.basename(blob1)])
+        # Linked rather than copied
+        self.assertTrue(os.path.samefile(first, blob1))
+
+    def test_history_audio_is_compressed_in_background(self):
+        import numpy as np
+        import soundfile as sf
+        self.backend.audio_dir = os.path.join(self.test_dir, "audio")
+        os.makedirs(self.backend.audio_dir)
+        wav = os.path.join(self.test_dir, "gen.wav")
+        sf.write(wav, np.zeros(1000, dtype=np.int16), 22050, subtype="PCM_16")
+
+        stored = self.backend.store_history_entry("Hallo", "IPA", wav, "Offline", "de+m3")
+        self.backend.transcoder.join()
+
+        path = self.backend.db.get_history()[0]["audio_path"]
+        self.assertEqual(path, os.path.splitext(stored)[0] + ".flac")
+        self.assertFalse(os.path.exists(stored))
+        # The same audio generated again resolves to the compressed blob
+        self.assertEqual(self.backend.copy_to_persistent(wav), path)
+
+    @patch("aussprachetrainer.backend.subprocess.run")
+    def test_prefetched_request_is_a_cache_hit(self, mock_run):
+        mock_run.side_effect = fake_espeak
+        self.backend.get_ipa("Hallo")
+        self.backend.generate_audio("Hallo", online=False, voice_id="de+m3")
+        self.assertTrue(self.backend.is_cached("Hallo", False, "de+m3"))
+        calls = mock_run.call_count
+
+        ipa, path = self.backend.generate_with_ipa("Hallo", online=False, voice_id="de+m3")
+
+        self.assertEqual(mock_run.call_count, calls)
+        self.assertIn("ˈ", ipa)
+        self.assertTrue(os.path.exists(path))
+
+    @patch("aussprachetrainer.backend.subprocess.run")
+    def test_editing_one_sentence_only_resynthesizes_it(self, mock_run):
+        mock_run.side_effect = fake_espeak_wav
+        def synthesized():
+            return [c[0][0][-1] for c in mock_run.call_args_list if "-w" in c[0][0]]
+
+        first = self.backend.generate_audio("Guten Morgen. Wie geht es? Danke gut.", voice_id="de+m3")
+        self.assertCountEqual(synthesized(), ["Guten Morgen.", "Wie geht es?", "Danke gut."])
+
+        mock_run.reset_mock()
+        second = self.backend.generate_audio("Guten Morgen. Wie geht es dir? Danke gut.", voice_id="de+m3")
+        self.assertEqual(synthesized(), ["Wie geht es dir?"])
+        self.assertNotEqual(first, second)
+
+        import soundfile as sf
+        overlap = int(22050 * self.backend.crossfade_ms / 1000)
+        pause = int(22050 * self.backend.sentence_pause_ms / 1000)
+        expected = 100 * sum(len(t) for t in ["Guten Morgen.", "Wie geht es dir?", "Danke gut."]) + 2 * (pause - overlap)
+        self.assertEqual(sf.info(second).frames, expected)
+
+    def test_streaming_reuses_cached_sentences(self):
+        import numpy as np
+        fed = []
+        class FakePlayer:
+            first_sample_time = None
+            def __init__(self, manager): pass
+            def feed(self, samples, rate): fed.append(len(samples))
+            def finish(self, wait=True): pass
+            def stop(self): pass
+        synthesized = []
+        def fake_segment(text, voice_id):
+            synthesized.append(text)
+            return np.full(1000, 0.1, dtype=np.float32), 22050
+
+        self.backend._synthesize_segment = fake_segment
+        with patch("aussprachetrainer.playback.StreamingPlayer", FakePlayer):
+            path = self.backend.generate_audio_streaming("Eins. Zwei.", "piper:test")
+            self.backend.generate_audio_streaming("Zwei.", "piper:test")
+
+        self.assertEqual(synthesized, ["Eins.", "Zwei."])
+        self.assertTrue(os.path.exists(path))
+        pause = int(22050 * self.backend.sentence_pause_ms / 1000)
+        self.assertEqual(sum(fed[:3]), 2000 + pause - int(22050 * self.backend.crossfade_ms / 1000))
+
+    def test_stream_failure_falls_back_to_the_file(self):
+        import numpy as np
+        from aussprachetrainer import playback
+        self.backend._synthesize_segment = lambda text, voice_id: (np.full(1000, 0.1, dtype=np.float32), 22050)
+        fake_sd = MagicMock()
+        fake_sd.OutputStream.side_effect = RuntimeError("no device")
+        with patch.object(playback, "sd", fake_sd), \
+                patch.object(self.backend, "play_file") as mock_play:
+            path = self.backend.generate_audio_streaming("Eins. Zwei.", "piper:test")
+        mock_play.assert_called_once_with(path)
+        self.assertTrue(os.path.exists(path))
+
+    @patch("aussprachetrainer.backend.subprocess.run")
+    def test_generated_audio_is_trimmed_and_normalized(self, mock_run):
+        import numpy as np
+        import soundfile as sf
+        def espeak_with_silence(cmd, **kwargs):
+            tone = 0.05 * np.sin(2 * np.pi * 200 * np.arange(11025) / 22050)
+            sf.write(cmd[cmd.index("-w") + 1], np.concatenate([np.zeros(11025), tone, np.zeros(11025)]), 22050)
+            return MagicMock(returncode=0, stdout="", stderr="")
+        mock_run.side_effect = espeak_with_silence
+
+        path = self.backend.generate_audio("Hallo", voice_id="de+m3")
+        samples, _ = sf.read(path)
+        # Tone plus 20 ms padding each side, give or take one 10 ms analysis frame
+        self.assertLess(len(samples), 11025 + 2 * (441 + 220))
+        rms_db = 20 * np.log10(np.sqrt(np.mean(samples ** 2)))
+        self.assertAlmostEqual(rms_db, self.backend.target_loudness_db, delta=0.5)
+
+    def test_speed_variant_is_stretched_once(self):
+        import numpy as np
+        import soundfile as sf
+        source = os.path.join(self.test_dir, "phrase.wav")
+        sf.write(source, np.full(22050, 0.1, dtype=np.float32), 22050)
+
+        from aussprachetrainer import audio_processing
+        with patch.object(audio_processing, "time_stretch", wraps=audio_processing.time_stretch) as stretch:
+            slow = self.backend.speed_variant(source, 0.5)
+            self.assertEqual(self.backend.speed_variant(source, 0.5), slow)
+        self.assertEqual(stretch.call_count, 1)
+        self.assertEqual(sf.info(slow).frames, 44100)
+        self.assertEqual(self.backend.speed_variant(source, 1.0), source)
+
+if __name__ == "__main__":
+    unittest.main()
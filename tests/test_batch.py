@@ -0,0 +1,97 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer import batch
+from aussprachetrainer.batch import BatchProgress, load_phrases, run_batch
+
+class FakeCache:
+    def __init__(self):
+        self.pending = []
+
+    def take_pending(self):
+        pending, self.pending = self.pending, []
+        return pending
+
+class FakeBackend:
+    def __init__(self):
+        self.calls = []
+        self.audio_cache = FakeCache()
+
+    def generate_with_ipa(self, text, online=False, voice_id=None, online_voice=None):
+        self.calls.append(text)
+        if text == "kaputt":
+            raise RuntimeError("engine error")
+        path = os.path.join(self.cache_dir, f"{text}.wav")
+        with open(path, "wb") as f:
+            f.write(b"RIFF")
+        self.audio_cache.pending.append((text, path))
+        return f"[{text}]", path
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.backend = FakeBackend()
+        self.backend.cache_dir = self.test_dir
+        batch._backend = self.backend
+
+    def tearDown(self):
+        batch._backend = None
+        shutil.rmtree(self.test_dir)
+
+    def test_load_phrases(self):
+        path = os.path.join(self.test_dir, "deck.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("# Deck\nGuten  Morgen\n\nStraße\tstreet\nGuten Morgen\n")
+
+        self.assertEqual(load_phrases(path), ["Guten Morgen", "Straße"])
+
+    def test_run_is_resumable(self):
+        progress_path = os.path.join(self.test_dir, "deck.progress")
+        stored = []
+        with ThreadPoolExecutor(2) as executor:
+            stats = run_batch(["eins", "kaputt", "zwei"], BatchProgress(progress_path), executor,
+                              store=lambda p, ipa, path: stored.append((p, ipa, path)), voice_id="de+m3")
+
+        self.assertEqual(stats["done"], 2)
+        self.assertEqual(stats["failed"], 1)
+        self.assertIn(("eins", "[eins]", os.path.join(self.test_dir, "eins.wav")), stored)
+
+        # A second run only retries what did not finish
+        self.backend.calls = []
+        with ThreadPoolExecutor(2) as executor:
+            stats = run_batch(["eins", "kaputt", "zwei"], BatchProgress(progress_path), executor)
+        self.assertEqual(self.backend.calls, ["kaputt"])
+        self.assertEqual(stats["skipped"], 2)
+
+    def test_worker_cache_entries_are_indexed_by_the_parent(self):
+        from aussprachetrainer.audio_cache import AudioCache
+        cache = AudioCache(cache_dir=os.path.join(self.test_dir, "cache"))
+        with ThreadPoolExecutor(2) as executor:
+            run_batch(["eins", "zwei"], BatchProgress(os.path.join(self.test_dir, "p")), executor, cache=cache)
+        self.assertEqual(cache.get("zwei"), os.path.join(self.test_dir, "zwei.wav"))
+        self.assertEqual(len(cache), 2)
+
+    def test_worker_backend_is_synthesis_only(self):
+        from unittest.mock import patch
+        from aussprachetrainer import kokoro_engine
+        workers = max(2, os.cpu_count() or 1)
+        with patch.object(kokoro_engine, "_engine", None), \
+                patch("aussprachetrainer.backend.HistoryManager", side_effect=AssertionError("history opened")):
+            batch._init_worker("de-DE", None, workers)
+            engine = kokoro_engine.get_kokoro_engine(batch._backend.models_dir)
+        backend = batch._backend
+        self.addCleanup(backend.shutdown)
+        self.assertIsNone(backend.db)
+        self.assertTrue(backend.audio_cache.read_only)
+        self.assertEqual(engine.session_settings.intra_op_threads, max(1, (os.cpu_count() or 1) // workers))
+        self.assertEqual(backend.segment_threads, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,199 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+import wave
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.capture import CaptureBuffer, VoiceActivityDetector
+
+RATE = 16000
+
+def take(lead=0.5, speech=1.0, tail=1.2, seed=0):
+    """Room noise, a voiced tone, then room noise again, as int16."""
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(0, 0.003, int((lead + speech + tail) * RATE))
+    t = np.arange(int(speech * RATE)) / RATE
+    start = int(lead * RATE)
+    noise[start:start + len(t)] += 0.3 * np.sin(2 * np.pi * 180 * t)
+    return (noise * 32767).astype(np.int16)
+
+def feed(vad, samples, block=333):
+    for i in range(0, len(samples), block):
+        if vad.push(samples[i:i + block].reshape(-1, 1)):
+            return i + block
+    return None
+
+class TestCaptureBuffer(unittest.TestCase):
+    def test_blocks_are_stored_in_place(self):
+        buf = CaptureBuffer(sample_rate=1000, initial_seconds=1)
+        storage = buf._buf
+        for i in range(5):
+            buf.write(np.full((100, 1), i, dtype=np.int16))
+        self.assertIs(buf._buf, storage)
+        take = buf.view()
+        self.assertTrue(np.shares_memory(take, storage))
+        np.testing.assert_array_equal(take, np.repeat(np.arange(5), 100))
+
+    def test_float_blocks_are_clipped_and_scaled(self):
+        buf = CaptureBuffer(sample_rate=1000, initial_seconds=1)
+        buf.write(np.array([[0.5], [-1.5], [2.0], [0.0]], dtype=np.float32))
+        np.testing.assert_array_equal(buf.view(), [16383, -32767, 32767, 0])
+
+    def test_grows_then_wraps_at_max(self):
+        buf = CaptureBuffer(sample_rate=10, initial_seconds=1, max_seconds=4)
+        buf.write(np.arange(25, dtype=np.int16))
+        self.assertEqual(buf.capacity, 25)
+        buf.write(np.arange(25, 45, dtype=np.int16))
+        # Capped at 40 samples: the oldest five were overwritten
+        self.assertEqual(buf.capacity, 40)
+        np.testing.assert_array_equal(buf.view(), np.arange(5, 45))
+
+        buf.clear()
+        buf.write(np.arange(3, dtype=np.int16))
+        np.testing.assert_array_equal(buf.view(), [0, 1, 2])
+
+class TestVoiceActivityDetector(unittest.TestCase):
+    def test_finds_speech_and_ends_after_trailing_silence(self):
+        vad = VoiceActivityDetector(RATE, silence_ms=800)
+        stopped_at = feed(vad, take())
+        self.assertIsNotNone(stopped_at)
+        # Ended 0.8 s after the speech, well before the recording ran out
+        self.assertAlmostEqual(stopped_at / RATE, 2.3, delta=0.05)
+        self.assertAlmostEqual(vad.speech_start / RATE, 0.5, delta=0.02)
+        self.assertAlmostEqual(vad.speech_end / RATE, 1.5, delta=0.02)
+        start, end = vad.segment(pad_ms=150)
+        self.assertAlmostEqual(start / RATE, 0.35, delta=0.02)
+        self.assertAlmostEqual(end / RATE, 1.65, delta=0.02)
+
+    def test_quiet_fricative_counts_as_speech(self):
+        rng = np.random.default_rng(1)
+        samples = take(speech=0.0, tail=0.5).astype(np.float32) / 32767
+        hiss = rng.normal(0, 0.006, int(0.3 * RATE))  # /s/: quiet but noisy
+        hiss = np.diff(hiss, prepend=0.0)  # high-passed, so it crosses zero a lot
+        block = np.concatenate([samples, hiss, samples]).astype(np.float32)
+        vad = VoiceActivityDetector(RATE)
+        feed(vad, block)
+        self.assertIsNotNone(vad.speech_start)
+        self.assertAlmostEqual(vad.speech_start / RATE, 1.0, delta=0.05)
+
+    def test_noise_alone_is_not_speech(self):
+        vad = VoiceActivityDetector(RATE)
+        self.assertIsNone(feed(vad, take(speech=0.0, tail=3.0)))
+        self.assertIsNone(vad.segment())
+
+    def test_push_reuses_its_scratch_buffers(self):
+        vad = VoiceActivityDetector(RATE)
+        samples = take()
+        vad.push(samples[:333])
+        scratch = vad._buf
+        feed(vad, samples[333:])
+        self.assertIs(vad._buf, scratch)
+        self.assertTrue(vad.ended)
+
+class TestRecordingOutput(unittest.TestCase):
+    def test_stop_recording_writes_16khz_int16_wav(self):
+        from aussprachetrainer.backend import PronunciationBackend
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        backend = PronunciationBackend()
+        backend.session_dir = test_dir
+        backend.capture = CaptureBuffer(backend.fs)
+        samples = (np.sin(np.arange(1600) / 5) * 10000).astype(np.int16)
+        backend.capture.write(samples.reshape(-1, 1))
+
+        path = backend.stop_recording()
+        with wave.open(path, "rb") as wf:
+            self.assertEqual(wf.getframerate(), 16000)
+            self.assertEqual(wf.getsampwidth(), 2)
+            data = np.frombuffer(wf.readframes(wf.getnframes()), dtype="<i2")
+        np.testing.assert_array_equal(data, samples)
+
+    def test_stop_recording_trims_to_detected_speech(self):
+        from aussprachetrainer.backend import PronunciationBackend
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        backend = PronunciationBackend()
+        backend.session_dir = test_dir
+        backend.capture = CaptureBuffer(backend.fs)
+        backend.vad = VoiceActivityDetector(backend.fs)
+        samples = take()
+        backend.capture.write(samples)
+        feed(backend.vad, samples)
+
+        path = backend.stop_recording()
+        with wave.open(path, "rb") as wf:
+            duration = wf.getnframes() / wf.getframerate()
+        # 1 s of speech plus 150 ms either side, instead of 2.7 s
+        self.assertAlmostEqual(duration, 1.3, delta=0.04)
+
+class TestInMemoryTake(unittest.TestCase):
+    def setUp(self):
+        from aussprachetrainer.backend import PronunciationBackend
+        self.test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.test_dir)
+        self.backend = PronunciationBackend()
+        self.backend.session_dir = self.test_dir
+        self.backend.recordings_dir = os.path.join(self.test_dir, "recordings")
+        self.backend.capture = CaptureBuffer(self.backend.fs)
+        self.samples = (np.sin(np.arange(1600) / 5) * 10000).astype(np.int16)
+        self.backend.capture.write(self.samples)
+
+    def test_take_goes_to_the_recogniser_without_a_file(self):
+        from unittest.mock import patch
+        import speech_recognition as sr
+        take = self.backend.stop_capture()
+        self.assertIsInstance(take, sr.AudioData)
+        self.assertEqual(take.sample_rate, 16000)
+        self.assertEqual(take.frame_data, self.samples.tobytes())
+        self.assertEqual(os.listdir(self.test_dir), [])
+
+        with patch.object(sr.Recognizer, "recognize_google", return_value="hallo") as recognize, \
+                patch.object(sr, "AudioFile", side_effect=AssertionError("read from disk")):
+            result = self.backend.assess_pronunciation("hallo", take, online=True)
+        self.assertIs(recognize.call_args[0][0], take)
+        self.assertEqual(result["actual"], "hallo")
+
+    def test_device_rate_take_is_resampled_once(self):
+        import types
+        from unittest.mock import MagicMock, patch
+        opened = []
+        def input_stream(samplerate, channels, dtype, callback):
+            if samplerate != 48000:
+                raise RuntimeError("Invalid sample rate")
+            opened.append(callback)
+            return MagicMock()
+        fake_sd = types.SimpleNamespace(InputStream=input_stream,
+                                        query_devices=lambda kind: {"default_samplerate": 48000.0})
+        with patch.dict(sys.modules, {"sounddevice": fake_sd}):
+            self.backend.start_recording()
+        self.assertEqual(self.backend.capture.sample_rate, 48000)
+        self.assertEqual(self.backend.vad.sample_rate, 48000)
+
+        tone = (np.sin(2 * np.pi * 200 * np.arange(4800) / 48000) * 10000).astype(np.int16)
+        opened[0](tone.reshape(-1, 1), len(tone), None, None)
+        take = self.backend.stop_capture()
+        self.assertEqual(take.sample_rate, 16000)
+        data = np.frombuffer(take.frame_data, dtype=np.int16)
+        self.assertEqual(len(data), 1600)
+        self.assertAlmostEqual(np.sqrt(np.mean(data.astype(float) ** 2)), 10000 / np.sqrt(2), delta=100)
+
+    def test_save_recordings_writes_in_the_background(self):
+        import time
+        self.backend.save_recordings = True
+        take = self.backend.stop_capture()
+        deadline = time.monotonic() + 5
+        while self.backend.last_recording_path is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        path = self.backend.last_recording_path
+        self.assertTrue(path.startswith(self.backend.recordings_dir))
+        with wave.open(path, "rb") as wf:
+            self.assertEqual(wf.readframes(wf.getnframes()), take.frame_data)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys
+import os
+import queue
+import socket
+import threading
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.connectivity import ConnectivityMonitor, parse_target
+
+class TestConnectivityMonitor(unittest.TestCase):
+    def setUp(self):
+        # Local stand-in for the public DNS server
+        self.server = socket.socket()
+        self.server.bind(("127.0.0.1", 0))
+        self.server.listen(8)
+        self.port = self.server.getsockname()[1]
+
+    def tearDown(self):
+        self.server.close()
+
+    def _closed_port(self):
+        s = socket.socket()
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+        s.close()
+        return port
+
+    def test_parse_target(self):
+        self.assertEqual(parse_target("8.8.8.8:53"), ("8.8.8.8", 53))
+        self.assertEqual(parse_target("example.org"), ("example.org", 53))
+        self.assertEqual(parse_target("[::1]:8080"), ("::1", 8080))
+
+    def test_reachable_target(self):
+        monitor = ConnectivityMonitor("127.0.0.1", self.port, timeout=1)
+        self.assertFalse(monitor.known)
+        self.assertTrue(monitor.check_now())
+        self.assertEqual(monitor.next_interval(), monitor.ttl)
+
+    def test_backoff_while_offline(self):
+        changes = []
+        monitor = ConnectivityMonitor("127.0.0.1", self._closed_port(), timeout=1,
+                                      retry_interval=1, max_backoff=4, on_change=changes.append)
+        intervals = []
+        for _ in range(4):
+            monitor.check_now()
+            intervals.append(monitor.next_interval())
+
+        self.assertEqual(intervals, [1, 2, 4, 4])
+        self.assertEqual(changes, [False])
+
+    def test_background_thread_tracks_changes(self):
+        changes = queue.Queue()
+        monitor = ConnectivityMonitor("127.0.0.1", self.port, timeout=1, ttl=60, on_change=changes.put)
+        monitor.start()
+        self.assertTrue(changes.get(timeout=5))
+        self.assertTrue(monitor.is_online)
+
+        # A failed request flips the flag at once; the next probe restores it
+        monitor.mark_offline()
+        self.assertFalse(changes.get(timeout=5))
+        self.assertTrue(changes.get(timeout=5))
+        self.assertTrue(monitor.is_online)
+        monitor.stop()
+
+    def test_refresh_during_probe_is_not_lost(self):
+        probes = queue.Queue()
+        release = threading.Event()
+        monitor = ConnectivityMonitor("127.0.0.1", self.port, timeout=1, ttl=60)
+
+        def slow_probe():
+            probes.put(True)
+            release.wait(5)
+            return True
+        monitor.probe = slow_probe
+        monitor.start()
+        self.assertTrue(probes.get(timeout=5))
+        # Arrives while the first probe is still running
+        monitor.refresh()
+        release.set()
+        self.assertTrue(probes.get(timeout=5))
+        monitor.stop()
+
+if __name__ == "__main__":
+    unittest.main()
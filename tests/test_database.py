@@ -162,5 +162,41 @@ class TestHistoryManager(unittest.TestCase):
         self.assertTrue(os.path.exists(audio2))
         self.assertFalse(os.path.exists(orphan))
 
+    def test_shared_audio_is_refcounted(self):
+        """Audio shared by several entries is removed with its last reference."""
+        blob = os.path.join(self.audio_dir, "blob.wav")
+        with open(blob, "w") as f:
+            f.write("dummy audio")
+        
+        self.db.add_entry("Eins", "IPA1", blob, "Offline", "de")
+        self.db.add_entry("Zwei", "IPA2", blob, "Offline", "de")
+        # Re-practising the same phrase keeps a single reference for it
+        self.db.add_entry("Eins", "IPA1", blob, "Offline", "de")
+        self.assertEqual(self.db.audio_refcount(blob), 2)
+        
+        history = self.db.get_history()
+        self.db.delete_entry(history[0]["id"])
+        self.assertTrue(os.path.exists(blob))
+        self.assertEqual(self.db.audio_refcount(blob), 1)
+        
+        self.db.delete_entry(history[1]["id"])
+        self.assertFalse(os.path.exists(blob))
+        self.assertEqual(self.db.audio_refcount(blob), 0)
+
+    def test_refcounts_migrated_for_existing_history(self):
+        """Opening an older database counts references from existing rows."""
+        import sqlite3
+        legacy_path = os.path.join(self.test_dir, "legacy.db")
+        with sqlite3.connect(legacy_path) as conn:
+            conn.execute("CREATE TABLE history (id INTEGER PRIMARY KEY AUTOINCREMENT, text TEXT NOT NULL, "
+                         "ipa TEXT, audio_path TEXT, mode TEXT, voice_id TEXT, "
+                         "created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+            conn.executemany("INSERT INTO history (text, audio_path) VALUES (?, ?)",
+                             [("A", "/a.wav"), ("B", "/a.wav"), ("C", "/c.wav")])
+        
+        db = HistoryManager(db_path=legacy_path)
+        self.assertEqual(db.audio_refcount("/a.wav"), 2)
+        self.assertEqual(db.audio_refcount("/c.wav"), 1)
+
 if __name__ == "__main__":
     unittest.main()
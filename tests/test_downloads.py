@@ -0,0 +1,180 @@
+import sys
+import os
+import hashlib
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from unittest.mock import patch
+
+from aussprachetrainer import downloads
+from aussprachetrainer.downloads import ChecksumError, DownloadManager, DownloadTask, PART_SUFFIX
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves server.files, honouring Range; drops the connection after server.cut_after bytes once."""
+
+    def do_GET(self):
+        data = self.server.files.get(self.path)
+        if data is None:
+            self.send_error(404)
+            return
+        self.server.ranges.append(self.headers.get("Range"))
+        start = 0
+        if self.headers.get("Range"):
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+            if start >= len(data):
+                self.send_error(416)
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+        else:
+            self.send_response(200)
+        body = data[start:]
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.server.cut_after is not None:
+            cut, self.server.cut_after = self.server.cut_after, None
+            self.wfile.write(body[:cut])
+            self.wfile.flush()
+            self.connection.shutdown(2)
+            return
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        # Like Hugging Face for LFS files: a redirect that carries the sha256
+        sha256 = self.server.linked.get(self.path)
+        if sha256 is None:
+            self.send_response(200)
+        else:
+            self.send_response(302)
+            self.send_header("Location", "/storage" + self.path)
+            self.send_header("X-Linked-Etag", f'"{sha256}"')
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+class TestDownloadManager(unittest.TestCase):
+    def setUp(self):
+        self.models_dir = tempfile.mkdtemp()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RangeHandler)
+        self.server.files = {
+            "/model.onnx": os.urandom(300_000),
+            "/model.onnx.json": b'{"audio": {"sample_rate": 22050}}',
+        }
+        self.server.ranges = []
+        self.server.linked = {}
+        self.server.cut_after = None
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.manager = DownloadManager(self.models_dir, chunk_size=16 * 1024, retries=2)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.models_dir)
+
+    def task(self, name: str, sha256: str = None) -> DownloadTask:
+        if sha256 is None:
+            sha256 = hashlib.sha256(self.server.files["/" + name]).hexdigest()
+        return DownloadTask(f"http://127.0.0.1:{self.server.server_port}/{name}",
+                            os.path.join(self.models_dir, name), sha256)
+
+    def test_concurrent_download_with_progress(self):
+        progress = []
+        results = self.manager.download([self.task("model.onnx"), self.task("model.onnx.json")],
+                                        lambda done, total, name: progress.append((done, total)))
+        self.assertEqual(list(results.values()), [None, None])
+        for name in ("model.onnx", "model.onnx.json"):
+            with open(os.path.join(self.models_dir, name), "rb") as f:
+                self.assertEqual(f.read(), self.server.files["/" + name])
+            self.assertFalse(os.path.exists(os.path.join(self.models_dir, name + PART_SUFFIX)))
+            self.assertTrue(self.manager.is_present(name))
+        total = sum(len(d) for d in self.server.files.values())
+        self.assertEqual(progress[-1], (total, total))
+
+    def test_resumes_partial_file_with_range(self):
+        data = self.server.files["/model.onnx"]
+        with open(os.path.join(self.models_dir, "model.onnx" + PART_SUFFIX), "wb") as f:
+            f.write(data[:100_000])
+        self.manager.fetch(self.task("model.onnx"))
+        self.assertEqual(self.server.ranges, ["bytes=100000-"])
+        with open(os.path.join(self.models_dir, "model.onnx"), "rb") as f:
+            self.assertEqual(f.read(), data)
+
+    def test_interrupted_transfer_resumes(self):
+        self.server.cut_after = 50_000
+        self.manager.fetch(self.task("model.onnx"))
+        self.assertEqual(self.server.ranges[0], None)
+        self.assertTrue(self.server.ranges[1].startswith("bytes="))
+        with open(os.path.join(self.models_dir, "model.onnx"), "rb") as f:
+            self.assertEqual(f.read(), self.server.files["/model.onnx"])
+
+    def test_checksum_mismatch_is_not_installed(self):
+        with self.assertRaises(ChecksumError):
+            self.manager.fetch(self.task("model.onnx", sha256="0" * 64))
+        self.assertFalse(os.path.exists(os.path.join(self.models_dir, "model.onnx")))
+        self.assertFalse(os.path.exists(os.path.join(self.models_dir, "model.onnx" + PART_SUFFIX)))
+
+    def test_partial_or_truncated_models_are_missing(self):
+        from aussprachetrainer.backend import PronunciationBackend
+        backend = PronunciationBackend()
+        backend.models_dir = self.models_dir
+        backend.downloads = self.manager
+        name = "de_DE-karlsson-low"
+        for suffix in (".onnx", ".onnx.json"):
+            self.server.files[f"/{name}{suffix}"] = os.urandom(1000)
+            self.manager.fetch(self.task(name + suffix))
+        self.assertNotIn(f"piper:{name}", backend.get_missing_models())
+
+        with open(os.path.join(self.models_dir, "kokoro-v0_19.onnx" + PART_SUFFIX), "wb") as f:
+            f.write(b"half")
+        with open(os.path.join(self.models_dir, f"{name}.onnx"), "r+b") as f:
+            f.truncate(10)
+        missing = backend.get_missing_models()
+        self.assertIn("kokoro:model", missing)
+        self.assertIn(f"piper:{name}", missing)
+
+    def test_unlisted_file_is_kept_unless_it_contradicts_its_pin(self):
+        dest = os.path.join(self.models_dir, "model.onnx")
+        with open(dest, "wb") as f:
+            f.write(b"from an install before the manifest")
+        digest = hashlib.sha256(b"from an install before the manifest").hexdigest()
+        self.assertTrue(self.manager.is_present("model.onnx"))
+        self.assertEqual(self.manager.manifest.entries["model.onnx"]["sha256"], digest)
+
+        os.remove(os.path.join(self.models_dir, downloads.MANIFEST_FILE))
+        manager = DownloadManager(self.models_dir)
+        with patch.dict(downloads.KNOWN_SHA256, {"model.onnx": "0" * 64}):
+            self.assertFalse(manager.is_present("model.onnx"))
+
+    def test_published_sha256_is_read_from_the_redirect(self):
+        data = self.server.files["/model.onnx"]
+        self.server.linked["/model.onnx"] = hashlib.sha256(data).hexdigest()
+        self.assertEqual(downloads.remote_sha256(self.task("model.onnx").url), self.server.linked["/model.onnx"])
+        self.assertIsNone(downloads.remote_sha256(self.task("model.onnx.json").url))
+
+        # The download is checked against it: a corrupted transfer is rejected
+        self.server.files["/model.onnx"] = b"x" + data[1:]
+        with self.assertRaises(ChecksumError):
+            self.manager.fetch(self.task("model.onnx", sha256=""))
+        self.server.files["/model.onnx"] = data
+        self.manager.fetch(self.task("model.onnx", sha256=""))
+        self.assertEqual(self.manager.manifest.entries["model.onnx"]["sha256"], self.server.linked["/model.onnx"])
+
+    def test_piper_urls_follow_the_voices_repository_layout(self):
+        self.assertEqual(downloads.piper_url("de_DE-thorsten-high", "de_DE-thorsten-high.onnx.json"),
+                         downloads.PIPER_BASE_URL + "de/de_DE/thorsten/high/de_DE-thorsten-high.onnx.json")
+
+    def test_manifest_entry_must_match_the_pin(self):
+        self.manager.fetch(self.task("model.onnx"))
+        with patch.dict(downloads.KNOWN_SHA256, {"model.onnx": "0" * 64}):
+            self.assertFalse(self.manager.is_present("model.onnx"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import sys
+import os
+import base64
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.audio_cache import AudioCache
+from aussprachetrainer.backend import PronunciationBackend
+from test_backend_generation import fake_espeak
+
+FAKE_MP3 = b"ID3fake-mp3-bytes"
+
+class FakeGoogleHandler(BaseHTTPRequestHandler):
+    """Answers like translate.google's batchexecute endpoint after server.delay seconds."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(self.server.delay)
+        audio = base64.b64encode(FAKE_MP3).decode("ascii")
+        body = f')]}}\'\n\n[["wrb.fr","jQ1olc","[\\"{audio}\\"]",null,null,null,"generic"]]\n'.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.requests += 1
+
+    def log_message(self, *args):
+        pass
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    """HTTPS proxy that terminates the tunnel itself and hands it to FakeGoogleHandler.
+
+    gTTS sends its requests through the system proxy with certificate checks
+    off, so pointing HTTPS_PROXY here reroutes the real request path to localhost.
+    """
+
+    def do_CONNECT(self):
+        self.send_response(200)
+        self.end_headers()
+        try:
+            tunnel = self.server.tls.wrap_socket(self.connection, server_side=True)
+            FakeGoogleHandler(tunnel, self.client_address, self.server)
+        except (OSError, ssl.SSLError):
+            pass  # The client gave up (timeout) mid-request
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+class TestHedgedSynthesis(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.cert_dir = tempfile.mkdtemp()
+        cls.cert = os.path.join(cls.cert_dir, "cert.pem")
+        cls.key = os.path.join(cls.cert_dir, "key.pem")
+        try:
+            subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                            "-subj", "/CN=localhost", "-keyout", cls.key, "-out", cls.cert],
+                           check=True, capture_output=True)
+        except (OSError, subprocess.CalledProcessError) as e:
+            shutil.rmtree(cls.cert_dir)
+            raise unittest.SkipTest(f"openssl unavailable: {e}")
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.cert_dir, ignore_errors=True)
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), ProxyHandler)
+        self.server.tls = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self.server.tls.load_cert_chain(self.cert, self.key)
+        self.server.delay = 0.0
+        self.server.requests = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.use_proxy(self.server.server_port)
+
+        self.backend = PronunciationBackend()
+        self.backend.audio_cache = AudioCache(cache_dir=os.path.join(self.test_dir, "cache"))
+        self.backend._espeak_version = "test"
+
+    def use_proxy(self, port: int):
+        env = {k: v for k, v in os.environ.items() if k.lower() not in ("no_proxy", "https_proxy", "all_proxy")}
+        env["https_proxy"] = f"http://127.0.0.1:{port}"
+        patcher = patch.dict(os.environ, env, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_online_result_within_budget(self):
+        path = self.backend.generate_audio("Hallo", online=True, online_voice="de")
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), FAKE_MP3)
+
+        with patch("aussprachetrainer.backend.subprocess.run") as mock_run:
+            mock_run.side_effect = fake_espeak
+            path, used_online = self.backend.generate_hedged("Guten Tag", "de", "de+m3", budget=2.0)
+        self.assertTrue(used_online)
+        self.assertTrue(path.endswith(".mp3"))
+        mock_run.assert_not_called()
+
+    @patch("aussprachetrainer.backend.subprocess.run")
+    def test_offline_wins_when_online_is_slow(self, mock_run):
+        mock_run.side_effect = fake_espeak
+        self.server.delay = 1.0
+        path, used_online = self.backend.generate_hedged("Hallo", "de", "de+m3", budget=0.1)
+        self.assertFalse(used_online)
+        self.assertTrue(path.endswith(".wav"))
+
+        # The slow online result still lands in the cache for next time
+        key = self.backend._audio_cache_key("Hallo", True, None, "de")
+        deadline = time.time() + 5
+        while self.backend.audio_cache.get(key) is None and time.time() < deadline:
+            time.sleep(0.05)
+        path, used_online = self.backend.generate_hedged("Hallo", "de", "de+m3", budget=0.1)
+        self.assertTrue(used_online)
+        self.assertEqual(self.server.requests, 1)
+
+    @patch("aussprachetrainer.backend.subprocess.run")
+    def test_online_failure_falls_back_without_waiting(self, mock_run):
+        mock_run.side_effect = fake_espeak
+        # Nothing listens on a closed socket's port
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            port = s.getsockname()[1]
+        self.use_proxy(port)
+        start = time.perf_counter()
+        path, used_online = self.backend.generate_hedged("Hallo", "de", "de+m3", budget=5.0)
+        self.assertFalse(used_online)
+        self.assertIsNotNone(path)
+        self.assertLess(time.perf_counter() - start, 5.0)
+
+    def test_request_timeout_gives_up(self):
+        self.server.delay = 2.0
+        self.backend.online_timeout = 0.3
+        start = time.perf_counter()
+        self.assertIsNone(self.backend.generate_audio("Hallo", online=True, online_voice="de"))
+        self.assertLess(time.perf_counter() - start, 1.5)
+
+if __name__ == '__main__':
+    unittest.main()
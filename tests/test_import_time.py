@@ -0,0 +1,58 @@
+import sys
+import os
+import subprocess
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+# Loaded on first use, never at startup
+HEAVY_MODULES = ["numpy", "sounddevice", "speech_recognition", "gtts", "pyttsx3", "kokoro_onnx", "onnxruntime"]
+# The backend (stdlib and project modules only) must import well within the
+# time of a bare `import numpy`; with its old eager imports it took several times that
+BACKEND_BUDGET_VS_NUMPY = 1.5
+
+def import_times(module: str):
+    """Import module in a fresh interpreter with -X importtime. Returns {module: cumulative_us}."""
+    env = dict(os.environ, PYTHONPATH=os.path.join(os.getcwd(), "src"))
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          capture_output=True, text=True, env=env, timeout=60)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+def best_import_time(module: str, runs: int = 3) -> int:
+    """Fastest of a few cold imports (us), to keep scheduler noise out of the comparison."""
+    return min(import_times(module)[module] for _ in range(runs))
+
+class TestImportTime(unittest.TestCase):
+    def test_backend_defers_heavy_dependencies(self):
+        times = import_times("aussprachetrainer.backend")
+        self.assertEqual([m for m in HEAVY_MODULES if m in times], [])
+
+    def test_gui_defers_heavy_dependencies(self):
+        try:
+            times = import_times("aussprachetrainer.gui")
+        except RuntimeError as e:
+            self.skipTest(f"GUI toolkit unavailable: {e}")
+        self.assertEqual([m for m in HEAVY_MODULES if m in times], [])
+
+    def test_backend_import_budget(self):
+        backend = best_import_time("aussprachetrainer.backend")
+        numpy = best_import_time("numpy")
+        self.assertLess(backend, BACKEND_BUDGET_VS_NUMPY * numpy,
+                        f"backend import took {backend / 1000:.0f} ms, numpy alone {numpy / 1000:.0f} ms")
+
+    def test_kokoro_engine_defers_onnxruntime(self):
+        times = import_times("aussprachetrainer.kokoro_engine")
+        self.assertNotIn("kokoro_onnx", times)
+        self.assertNotIn("onnxruntime", times)
+
+if __name__ == '__main__':
+    unittest.main()
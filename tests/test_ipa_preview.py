@@ -0,0 +1,76 @@
+import sys
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.ipa_preview import LiveIPAPreview
+
+class FakeBackend:
+    def __init__(self, delay=0.0):
+        self.dialect = "de-DE"
+        self.calls = []
+        self.delay = delay
+
+    def get_ipa(self, text):
+        self.calls.append(text)
+        if self.delay:
+            time.sleep(self.delay)
+        return f"<{text.lower()}>"
+
+class TestLiveIPAPreview(unittest.TestCase):
+    def test_split_words(self):
+        self.assertEqual(LiveIPAPreview.split_words("Guten Tag, wie geht's?"),
+                         ["Guten", "Tag", "wie", "geht's"])
+
+    def test_only_changed_words_are_transcribed(self):
+        backend = FakeBackend()
+        preview = LiveIPAPreview(backend)
+        self.assertEqual(preview.transcribe("Hallo Welt"), "<hallo> <welt>")
+        backend.calls.clear()
+        self.assertEqual(preview.transcribe("Hallo Welt wie"), "<hallo> <welt> <wie>")
+        self.assertEqual(backend.calls, ["wie"])
+
+    def test_dialect_is_part_of_cache_key(self):
+        backend = FakeBackend()
+        preview = LiveIPAPreview(backend)
+        preview.transcribe("Tag")
+        backend.dialect = "de-AT"
+        preview.transcribe("Tag")
+        self.assertEqual(backend.calls, ["Tag", "Tag"])
+
+    def test_failed_transcription_is_retried(self):
+        backend = FakeBackend()
+        preview = LiveIPAPreview(backend)
+        with patch.object(backend, "get_ipa", return_value=""):
+            self.assertEqual(preview.transcribe("Hallo"), "")
+        self.assertEqual(preview.transcribe("Hallo"), "<hallo>")
+
+    def test_cache_is_bounded(self):
+        backend = FakeBackend()
+        preview = LiveIPAPreview(backend, cache_size=2)
+        preview.transcribe("eins zwei drei")
+        self.assertEqual(len(preview._cache), 2)
+
+    def test_stale_requests_are_dropped(self):
+        backend = FakeBackend(delay=0.05)
+        preview = LiveIPAPreview(backend)
+        results = []
+        done = threading.Event()
+
+        def on_result(ipa):
+            results.append(ipa)
+            done.set()
+
+        preview.request("eins zwei drei vier", on_result)
+        preview.request("fünf", on_result)
+        self.assertTrue(done.wait(2))
+        time.sleep(0.1)
+        self.assertEqual(results, ["<fünf>"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import sys
+import os
+import threading
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.jobs import JobScheduler, PRIORITY_HIGH, PRIORITY_LOW
+
+class TestJobScheduler(unittest.TestCase):
+    def setUp(self):
+        self.dispatches = []
+        self.scheduler = JobScheduler(max_workers=1)
+        self.scheduler.set_dispatcher(self.dispatches.append)
+
+    def tearDown(self):
+        self.scheduler.shutdown()
+
+    def _blocker(self):
+        """Occupy the single worker until the returned event is set."""
+        release = threading.Event()
+        started = threading.Event()
+        def block(job):
+            started.set()
+            release.wait(5)
+        self.scheduler.submit("block", block)
+        started.wait(5)
+        return release
+
+    def test_newest_generate_wins(self):
+        release = self._blocker()
+        ran = []
+        def make(n):
+            def work(job):
+                ran.append(n)
+                job.post(lambda: shown.append(n))
+            return work
+        shown = []
+        jobs = [self.scheduler.submit("generate", make(n)) for n in range(3)]
+        release.set()
+        jobs[-1].done.wait(5)
+        for d in self.dispatches:
+            d()
+
+        self.assertEqual(ran, [2])
+        self.assertEqual(shown, [2])
+        self.assertTrue(jobs[0].is_cancelled() and jobs[1].is_cancelled())
+
+    def test_results_of_superseded_running_job_are_dropped(self):
+        go = threading.Event()
+        shown = []
+        def slow(job):
+            go.wait(5)
+            job.post(lambda: shown.append("old"))
+        old = self.scheduler.submit("generate", slow)
+        self.scheduler.submit("generate", lambda job: job.post(lambda: shown.append("new")))
+        go.set()
+        old.done.wait(5)
+        self.scheduler.submit("other", lambda job: None).done.wait(5)
+        self.scheduler.drain()
+
+        self.assertEqual(shown, ["new"])
+
+    def test_priority_order_and_coalesced_dispatch(self):
+        release = self._blocker()
+        order = []
+        self.scheduler.submit("low", lambda job: job.post(lambda: order.append("low")), priority=PRIORITY_LOW)
+        last = self.scheduler.submit("high", lambda job: job.post(lambda: order.append("high")), priority=PRIORITY_HIGH)
+        release.set()
+        last.done.wait(5)
+        self.scheduler.submit("sync", lambda job: None).done.wait(5)
+
+        # Both results arrive through a single scheduled drain
+        self.assertEqual(len(self.dispatches), 1)
+        self.dispatches[0]()
+        self.assertEqual(order, ["high", "low"])
+
+if __name__ == "__main__":
+    unittest.main()
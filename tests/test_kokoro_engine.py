@@ -0,0 +1,85 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer import kokoro_engine
+from aussprachetrainer.kokoro_engine import KokoroEngine, get_kokoro_engine
+
+class TestKokoroEngine(unittest.TestCase):
+    def setUp(self):
+        self.models_dir = tempfile.mkdtemp()
+        with open(os.path.join(self.models_dir, kokoro_engine.MODEL_FILE), "wb") as f:
+            f.write(b"onnx")
+        self.kokoro_cls = MagicMock()
+        self.kokoro_cls.return_value.create.return_value = ([0.0], 24000)
+        patcher = patch.object(kokoro_engine, "Kokoro", self.kokoro_cls)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.models_dir)
+
+    def test_model_is_loaded_once(self):
+        engine = KokoroEngine(self.models_dir)
+        engine.create("Hallo", "kokoro:de_female")
+        engine.create("Welt", "kokoro:de_female")
+        self.assertEqual(self.kokoro_cls.call_count, 1)
+        self.kokoro_cls.return_value.create.assert_called_with("Welt", voice="de_female", speed=1.0, lang="de")
+
+    def test_release_drops_model(self):
+        engine = KokoroEngine(self.models_dir)
+        engine.create("Hallo")
+        engine.release()
+        self.assertFalse(engine.is_loaded())
+        engine.create("Hallo")
+        self.assertEqual(self.kokoro_cls.call_count, 2)
+
+    def test_warm_up_runs_dummy_inference(self):
+        engine = KokoroEngine(self.models_dir)
+        engine.warm_up_async()
+        engine._warm_thread.join(2)
+        self.assertTrue(engine.is_loaded())
+        self.assertEqual(self.kokoro_cls.return_value.create.call_count, 1)
+
+    def test_release_before_warm_up_runs(self):
+        engine = KokoroEngine(self.models_dir)
+        with engine._lock:
+            engine.warm_up_async()
+            engine.release()
+        engine._warm_thread.join(2)
+        self.assertFalse(engine.is_loaded())
+
+    def test_release_does_not_wait_for_synthesis(self):
+        import threading
+        started, finish = threading.Event(), threading.Event()
+        def slow_create(*args, **kwargs):
+            started.set()
+            finish.wait(5)
+            return [0.0], 24000
+        self.kokoro_cls.return_value.create.side_effect = slow_create
+        engine = KokoroEngine(self.models_dir)
+        worker = threading.Thread(target=engine.create, args=("Hallo",))
+        worker.start()
+        self.assertTrue(started.wait(2))
+
+        released = threading.Thread(target=engine.release)
+        released.start()
+        released.join(1)
+        self.assertFalse(released.is_alive())
+        # The synthesis in progress finishes, then the model goes
+        self.assertTrue(engine.is_loaded())
+        finish.set()
+        worker.join(2)
+        self.assertFalse(engine.is_loaded())
+
+    def test_engine_is_process_wide(self):
+        self.assertIs(get_kokoro_engine(self.models_dir), get_kokoro_engine(self.models_dir))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from importlib.util import find_spec
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.offline_asr import (DEFAULT_SEARCH, SphinxDecoder, build_jsgf, mispronunciations,
+                                           sphinx_model_paths, target_words)
+
+HAS_POCKETSPHINX = find_spec("pocketsphinx") is not None
+
+def english_model():
+    """pocketsphinx's bundled en-us model; German is not shipped with the wheel."""
+    import pocketsphinx
+    root = os.path.join(pocketsphinx.get_model_path(), "en-us")
+    return (os.path.join(root, "en-us"), os.path.join(root, "en-us.lm.bin"), os.path.join(root, "cmudict-en-us.dict"))
+
+def room_noise(seconds=1.0):
+    return np.random.default_rng(0).normal(0, 30, int(16000 * seconds)).astype("<i2").tobytes()
+
+class TestTargetGrammar(unittest.TestCase):
+    def test_learner_variants(self):
+        self.assertEqual(target_words("Grüß Gott, Welt!"), ["grüß", "gott", "welt"])
+        self.assertIn("bucher", mispronunciations("bücher"))
+        self.assertIn("büker", mispronunciations("bücher"))
+        self.assertIn("velt", mispronunciations("welt"))
+        self.assertEqual(mispronunciations("hallo"), [])
+
+    def test_jsgf_allows_variants_and_dropped_words(self):
+        jsgf = build_jsgf("g", [["welt", "velt"], ["hallo"]])
+        self.assertIn("grammar g;", jsgf)
+        self.assertIn("public <utt> = [ ( welt | velt ) ] [ ( hallo ) ] ;", jsgf)
+
+    def test_model_lookup_uses_speech_recognition_layout(self):
+        base = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, base)
+        root = os.path.join(base, "de")
+        os.makedirs(os.path.join(root, "acoustic-model"))
+        for name in ("language-model.lm.bin", "pronounciation-dictionary.dict"):
+            open(os.path.join(root, name), "w").close()
+        self.assertIsNone(sphinx_model_paths(["de-AT"], [base]))
+        self.assertEqual(sphinx_model_paths(["de-AT", "de"], ["/nonexistent", base])[0], os.path.join(root, "acoustic-model"))
+
+@unittest.skipUnless(HAS_POCKETSPHINX, "pocketsphinx not installed")
+class TestSphinxDecoder(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.decoder = SphinxDecoder(english_model(), max_searches=2)
+
+    def test_alternatives_only_use_dictionary_words(self):
+        self.assertEqual(self.decoder.alternatives("This wine"), [["this", "tis"], ["wine", "vine"]])
+        self.assertIsNone(self.decoder.alternatives("wine qqzx"))
+
+    def test_searches_are_built_once_and_evicted(self):
+        first = self.decoder._search_for("this wine", "grammar")
+        self.assertEqual(self.decoder._search_for("this wine", "grammar"), first)
+        self.decoder._search_for("this wine", "keyword")
+        self.decoder._search_for("good morning", "grammar")
+        self.assertNotIn(first, self.decoder._searches)
+        self.assertEqual(len(self.decoder._searches), 2)
+        # Unknown words or no target: the general language model
+        self.assertEqual(self.decoder._search_for("qqzx", "grammar"), DEFAULT_SEARCH)
+        self.assertEqual(self.decoder._search_for("this wine", "lm"), DEFAULT_SEARCH)
+
+    def test_noise_is_not_recognised_in_any_mode(self):
+        for mode in ("lm", "grammar", "keyword"):
+            self.assertIsNone(self.decoder.decode(room_noise(), "this wine", mode), mode)
+
+@unittest.skipUnless(HAS_POCKETSPHINX, "pocketsphinx not installed")
+class TestBackendOfflineASR(unittest.TestCase):
+    def test_decoder_is_loaded_once_and_shared(self):
+        import speech_recognition as sr
+        from aussprachetrainer.backend import PronunciationBackend
+        models = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, models)
+        # Lay the English model out like a German one would be installed
+        root = os.path.join(models, "pocketsphinx", "de")
+        os.makedirs(root)
+        hmm, lm, dictionary = english_model()
+        os.symlink(hmm, os.path.join(root, "acoustic-model"))
+        os.symlink(lm, os.path.join(root, "language-model.lm.bin"))
+        os.symlink(dictionary, os.path.join(root, "pronounciation-dictionary.dict"))
+
+        backend = PronunciationBackend()
+        backend.models_dir = models
+        decoder = backend.get_sphinx_decoder()
+        backend.set_dialect("de-AT")
+        self.assertIs(backend.get_sphinx_decoder(), decoder)
+
+        take = sr.AudioData(room_noise(), 16000, 2)
+        result = backend._transcribe_offline(take, "this wine")
+        self.assertTrue(result.startswith("[Offline ASR: No speech"), result)
+        self.assertIs(backend.get_sphinx_decoder(), decoder)
+
+    def test_constrained_decoding_is_opt_in(self):
+        import speech_recognition as sr
+        from unittest.mock import MagicMock, patch
+        from aussprachetrainer.backend import PronunciationBackend
+        backend = PronunciationBackend()
+        self.assertEqual(backend.offline_asr_mode, "lm")
+        decoder = MagicMock()
+        decoder.decode.return_value = "this wine"
+        take = sr.AudioData(room_noise(), 16000, 2)
+        with patch.object(backend, "get_sphinx_decoder", return_value=decoder):
+            backend._transcribe_offline(take, "this wine")
+            self.assertEqual(decoder.decode.call_args[0][2], "lm")
+            backend.offline_asr_mode = "grammar"
+            backend._transcribe_offline(take, "this wine")
+            self.assertEqual(decoder.decode.call_args[0][2], "grammar")
+
+    def test_missing_model_is_reported(self):
+        import speech_recognition as sr
+        from aussprachetrainer.backend import PronunciationBackend
+        backend = PronunciationBackend()
+        backend.models_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, backend.models_dir)
+        backend.set_dialect("de-CH")
+        result = backend._transcribe_offline(sr.AudioData(room_noise(), 16000, 2), "hallo")
+        self.assertEqual(result, "[Offline ASR: Pocketsphinx error (missing de-CH model?)]")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.onnx_session import SessionSettings, create_session, optimized_model_path
+
+class TestOnnxSession(unittest.TestCase):
+    def setUp(self):
+        try:
+            import numpy as np
+            import onnxruntime.datasets
+        except ImportError:
+            self.skipTest("onnxruntime not installed")
+        self.np = np
+        self.test_dir = tempfile.mkdtemp()
+        # Tiny model shipped with onnxruntime: y = sigmoid(x), x of shape [3, 4, 5]
+        self.model_path = os.path.join(self.test_dir, "sigmoid.onnx")
+        shutil.copy(onnxruntime.datasets.get_example("sigmoid.onnx"), self.model_path)
+        self.cache_dir = os.path.join(self.test_dir, "optimized")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def run_model(self, session):
+        x = self.np.zeros((3, 4, 5), dtype=self.np.float32)
+        return session.run(None, {session.get_inputs()[0].name: x})[0]
+
+    def test_optimized_model_is_cached_and_reused(self):
+        settings = SessionSettings(intra_op_threads=2)
+        first = create_session(self.model_path, settings, self.cache_dir)
+        cached = optimized_model_path(self.model_path, settings, self.cache_dir)
+        self.assertTrue(os.path.exists(cached))
+        self.assertEqual(os.listdir(self.cache_dir), [os.path.basename(cached)])
+
+        second = create_session(self.model_path, settings, self.cache_dir)
+        self.assertEqual(second._model_path, cached)
+        self.assertEqual(second.get_session_options().intra_op_num_threads, 2)
+        self.assertTrue(self.np.allclose(self.run_model(first), self.run_model(second)))
+        self.assertTrue(self.np.allclose(self.run_model(second), 0.5))
+
+    def test_cache_key_follows_settings_and_model(self):
+        basic = optimized_model_path(self.model_path, SessionSettings(graph_optimization="basic"), self.cache_dir)
+        full = optimized_model_path(self.model_path, SessionSettings(graph_optimization="all"), self.cache_dir)
+        self.assertNotEqual(basic, full)
+        os.utime(self.model_path, ns=(0, 0))
+        self.assertNotEqual(full, optimized_model_path(self.model_path, SessionSettings(), self.cache_dir))
+
+    def test_uncached_and_corrupt_cache(self):
+        session = create_session(self.model_path, SessionSettings(cache_optimized=False), self.cache_dir)
+        self.assertFalse(os.path.exists(self.cache_dir))
+        self.assertEqual(session._model_path, self.model_path)
+
+        cached = optimized_model_path(self.model_path, SessionSettings(), self.cache_dir)
+        os.makedirs(self.cache_dir)
+        with open(cached, "wb") as f:
+            f.write(b"garbage")
+        session = create_session(self.model_path, SessionSettings(), self.cache_dir)
+        self.assertTrue(self.np.allclose(self.run_model(session), 0.5))
+        self.assertGreater(os.path.getsize(cached), len(b"garbage"))
+
+if __name__ == '__main__':
+    unittest.main()
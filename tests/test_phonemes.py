@@ -0,0 +1,93 @@
+import sys
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.phonemes import PhonemeInventory, _distance_matrix, align, tokenize_ipa
+
+def naive_distance(sub, dele, ins):
+    n, m = sub.shape
+    d = np.zeros((n + 1, m + 1))
+    d[0, 1:] = np.cumsum(ins)
+    d[1:, 0] = np.cumsum(dele)
+    for i in range(1, n + 1):
+        for j in range(1, m + 1):
+            d[i, j] = min(d[i - 1, j - 1] + sub[i - 1, j - 1], d[i - 1, j] + dele[i - 1], d[i, j - 1] + ins[j - 1])
+    return d
+
+class TestTokenize(unittest.TestCase):
+    def test_diacritics_stay_with_their_segment(self):
+        symbols = [s.symbol for s in tokenize_ipa("ˈʔaɪ̯nə ˈvɛlt̩ b̥uːx tʰaːk")]
+        self.assertEqual(symbols, ["ʔ", "aɪ̯", "n", "ə", "v", "ɛ", "l", "t̩", "b̥", "uː", "x", "tʰ", "aː", "k"])
+
+    def test_affricates_words_and_spans(self):
+        segments = tokenize_ipa("ˈtsaɪ̯t ˈpfɛʁt")
+        self.assertEqual([s.symbol for s in segments], ["ts", "aɪ̯", "t", "pf", "ɛ", "ʁ", "t"])
+        self.assertEqual([s.word for s in segments], [0, 0, 0, 1, 1, 1, 1])
+        self.assertEqual((segments[3].start, segments[3].end), (9, 11))
+
+class TestAlign(unittest.TestCase):
+    def test_costs_follow_articulatory_features(self):
+        voicing = align("pa", "ba").distance
+        place = align("pa", "ta").distance
+        vowel = align("pa", "aa").distance
+        self.assertLess(voicing, place)
+        self.assertLess(place, vowel)
+        self.assertEqual(vowel, 1.0)
+        # Length and aspiration are small differences, not extra characters
+        self.assertLess(align("ˈhaloː", "ˈhalo").distance, 0.3)
+        self.assertLess(align("tʰak", "tak").distance, 0.2)
+
+    def test_ops_report_each_segment(self):
+        result = align("ˈbʏçɐ ˈhaːbn̩", "ˈbuxɐ ˈaːbənt")
+        ops = [(op.op, op.target, op.actual) for op in result.ops]
+        self.assertEqual(ops[:4], [("match", "b", "b"), ("sub", "ʏ", "u"), ("sub", "ç", "x"), ("match", "ɐ", "ɐ")])
+        self.assertIn(("del", "h", None), ops)
+        self.assertEqual(ops[-1], ("ins", None, "t"))
+        self.assertEqual(result.ops[-1].word, 1)
+        self.assertEqual(align("ab", "ab").score, 1.0)
+
+    def test_vectorised_table_matches_naive_recurrence(self):
+        rng = np.random.default_rng(3)
+        for n, m in [(0, 4), (5, 0), (7, 9), (12, 5)]:
+            sub = rng.random((n, m))
+            dele, ins = rng.random(n) + 0.2, rng.random(m) + 0.2
+            np.testing.assert_allclose(_distance_matrix(sub, dele, ins), naive_distance(sub, dele, ins))
+
+    def test_inventory_reuses_ids(self):
+        inventory = PhonemeInventory()
+        first = inventory.encode(tokenize_ipa("ʃtat"))
+        second = inventory.encode(tokenize_ipa("tat"))
+        self.assertEqual(len(inventory), 3)
+        np.testing.assert_array_equal(second, first[1:])
+
+    def test_multi_sentence_target_is_fast(self):
+        target = "ˈʔaɪ̯nə ˈʃøːnə ˈʃtʊndə ˈɪn deːɐ̯ ˈʃtat ˈbʏçɐ " * 20
+        actual = "ˈaɪ̯nə ˈʃoːnə ˈʃtundə ˈɪn deːɐ̯ ˈstat ˈbuxɐ " * 20
+        align(target, actual)
+        start = time.perf_counter()
+        result = align(target, actual)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertGreater(result.score, 0.9)
+
+class TestAssessment(unittest.TestCase):
+    def test_assessment_returns_phoneme_ops(self):
+        import speech_recognition as sr
+        from aussprachetrainer.backend import PronunciationBackend
+        backend = PronunciationBackend()
+        ipa = {"Bücher": "ˈbyːçɐ", "Bucher": "ˈbuːxɐ"}
+        with patch.object(backend, "_transcribe_online", return_value="Bucher"), \
+                patch.object(backend, "get_ipa", side_effect=lambda text: ipa[text]):
+            result = backend.assess_pronunciation("Bücher", sr.AudioData(b"\0\0" * 1600, 16000, 2), online=True)
+        self.assertEqual([op["op"] for op in result["phonemes"]], ["match", "sub", "sub", "match"])
+        self.assertEqual(result["phonemes"][1]["target_span"], (2, 4))
+        self.assertGreater(result["score"], 70)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import sys
+import os
+import json
+import shutil
+import tempfile
+import textwrap
+import time
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.piper_worker import PiperWorker, PiperWorkerPool
+
+# Stand-in for `piper --json-input`: writes each output_file and echoes its path.
+# The text "crash" makes it exit without answering.
+FAKE_PIPER = textwrap.dedent("""
+    import json, sys
+    for line in sys.stdin:
+        req = json.loads(line)
+        if req["text"] == "crash":
+            sys.exit(3)
+        with open(req["output_file"], "w") as f:
+            f.write(req["text"])
+        print(req["output_file"], flush=True)
+""")
+
+class TestPiperWorker(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.script = os.path.join(self.test_dir, "fake_piper.py")
+        with open(self.script, "w") as f:
+            f.write(FAKE_PIPER)
+        self.model = os.path.join(self.test_dir, "de_DE-test.onnx")
+        self.command = [sys.executable, self.script]
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _out(self, name):
+        return os.path.join(self.test_dir, name)
+
+    def test_process_is_reused(self):
+        worker = PiperWorker(self.model, command=self.command, idle_timeout=0)
+        worker.synthesize("Hallo", self._out("a.wav"))
+        pid = worker.proc.pid
+        worker.synthesize("Welt", self._out("b.wav"))
+        self.assertEqual(worker.proc.pid, pid)
+        with open(self._out("b.wav")) as f:
+            self.assertEqual(f.read(), "Welt")
+        worker.stop()
+        self.assertFalse(worker.is_alive())
+
+    def test_stale_idle_timer_does_not_stop_a_busy_worker(self):
+        worker = PiperWorker(self.model, command=self.command, idle_timeout=60)
+        self.addCleanup(worker.stop)
+        worker.synthesize("Hallo", self._out("a.wav"))
+        stale = worker._idle_timer
+        worker.synthesize("Welt", self._out("b.wav"))
+        worker._stop_if_idle(stale)  # Fired while the second request was starting
+        self.assertTrue(worker.is_alive())
+        worker._stop_if_idle(worker._idle_timer)  # Current, but not idle long enough
+        self.assertTrue(worker.is_alive())
+
+    def test_idle_worker_is_stopped(self):
+        worker = PiperWorker(self.model, command=self.command, idle_timeout=0.2)
+        worker.synthesize("Hallo", self._out("a.wav"))
+        deadline = time.time() + 5
+        while worker.proc is not None and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertIsNone(worker.proc)
+
+    def test_broken_pipe_restarts_the_worker(self):
+        worker = PiperWorker(self.model, command=self.command, idle_timeout=0)
+        self.addCleanup(worker.stop)
+        worker.synthesize("Hallo", self._out("a.wav"))
+        worker.proc.stdin.close()
+        self.assertEqual(worker.synthesize("Welt", self._out("b.wav")), self._out("b.wav"))
+
+    def test_restart_after_crash(self):
+        worker = PiperWorker(self.model, command=self.command, idle_timeout=0)
+        worker.synthesize("Hallo", self._out("a.wav"))
+        with self.assertRaises(RuntimeError):
+            worker.synthesize("crash", self._out("c.wav"))
+        self.assertEqual(worker.synthesize("wieder da", self._out("d.wav")), self._out("d.wav"))
+        worker.stop()
+
+    def test_idle_shutdown(self):
+        worker = PiperWorker(self.model, command=self.command, idle_timeout=0.1)
+        worker.synthesize("Hallo", self._out("a.wav"))
+        deadline = time.time() + 3
+        while worker.is_alive() and time.time() < deadline:
+            time.sleep(0.05)
+        self.assertFalse(worker.is_alive())
+
+    def test_pool_keeps_one_worker_per_model(self):
+        pool = PiperWorkerPool(command=self.command, idle_timeout=0)
+        self.assertIs(pool.get(self.model), pool.get(self.model))
+        pool.synthesize(self.model, "Hallo", self._out("a.wav"))
+        pool.shutdown()
+        self.assertEqual(pool.workers, {})
+
+    def test_pool_adds_workers_only_when_busy(self):
+        pool = PiperWorkerPool(command=self.command, idle_timeout=0, workers_per_model=2)
+        pool.synthesize(self.model, "eins", self._out("a.wav"))
+        pool.synthesize(self.model, "zwei", self._out("b.wav"))
+        self.assertEqual(len(pool.workers[self.model]), 1)
+
+        busy = pool._acquire(self.model)
+        second = pool._acquire(self.model)
+        self.assertIsNot(busy, second)
+        self.assertEqual(second.synthesize("drei", self._out("c.wav")), self._out("c.wav"))
+        pool._release(busy)
+        pool._release(second)
+        pool.shutdown()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer import playback
+from aussprachetrainer.playback import PlaybackManager, StreamingPlayer, resample_linear
+
+class FakeOutputStream:
+    instances = []
+
+    def __init__(self, samplerate, channels, dtype, callback=None):
+        self.samplerate = samplerate
+        self.callback = callback
+        self.closed = False
+        FakeOutputStream.instances.append(self)
+
+    def start(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def pull(self, frames):
+        """Simulate the audio device requesting frames from the callback."""
+        out = np.full((frames, 1), -1.0, dtype=np.float32)
+        self.callback(out, frames, None, None)
+        return out[:, 0]
+
+
+class TestStreamingPlayer(unittest.TestCase):
+    def setUp(self):
+        FakeOutputStream.instances = []
+        fake_sd = MagicMock()
+        fake_sd.OutputStream = FakeOutputStream
+        patcher = patch.object(playback, "sd", fake_sd)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_chunks_play_on_the_shared_stream(self):
+        manager = PlaybackManager()
+        manager.play_samples(np.ones(10), 22050)
+        player = StreamingPlayer(manager)
+        player.feed(np.ones(3000, dtype=np.float32), 22050)
+        player.feed(np.zeros(100, dtype=np.float32), 22050)
+
+        self.assertEqual(len(FakeOutputStream.instances), 1)
+        stream = FakeOutputStream.instances[0]
+        played = stream.pull(3200)
+        self.assertTrue(np.all(played[:3000] == 1.0))
+        self.assertTrue(np.all(played[3000:] == 0))
+        player.finish(wait=True)
+        self.assertIsNotNone(player.first_sample_time)
+
+    def test_underrun_resumes_with_the_next_chunk(self):
+        manager = PlaybackManager()
+        player = StreamingPlayer(manager)
+        player.feed(np.ones(100), 22050)
+        stream = FakeOutputStream.instances[0]
+        stream.pull(200)
+        player.feed(np.full(50, 0.5), 22050)
+        self.assertTrue(np.allclose(stream.pull(50), 0.5))
+        self.assertTrue(manager.wait_for(player._generation, timeout=1))
+
+    def test_samplerate_change_is_rejected(self):
+        player = StreamingPlayer(PlaybackManager())
+        player.feed(np.zeros(10), 22050)
+        with self.assertRaises(ValueError):
+            player.feed(np.zeros(10), 24000)
+        player.stop()
+        player.finish()
+
+    def test_stop_discards_pending_chunks(self):
+        manager = PlaybackManager()
+        player = StreamingPlayer(manager)
+        player.feed(np.ones(100), 22050)
+        player.stop()
+        player.feed(np.ones(100), 22050)
+        self.assertFalse(manager.is_playing())
+        self.assertTrue(np.all(FakeOutputStream.instances[0].pull(10) == 0))
+
+    def test_open_failure_is_raised_from_finish(self):
+        player = StreamingPlayer(PlaybackManager())
+        with patch.object(playback.sd, "OutputStream", side_effect=RuntimeError("no device")):
+            player.feed(np.zeros(10), 22050)
+        with self.assertRaises(RuntimeError):
+            player.finish()
+
+class TestPlaybackManager(unittest.TestCase):
+    def setUp(self):
+        import soundfile as sf
+        FakeOutputStream.instances = []
+        fake_sd = MagicMock()
+        fake_sd.OutputStream = FakeOutputStream
+        patcher = patch.object(playback, "sd", fake_sd)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.test_dir = tempfile.mkdtemp()
+        self.wav = os.path.join(self.test_dir, "a.wav")
+        sf.write(self.wav, np.full(1000, 0.5, dtype=np.float32), 16000)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def test_decoded_audio_is_cached(self):
+        manager = PlaybackManager()
+        with patch("soundfile.read", wraps=__import__("soundfile").read) as mock_read:
+            manager.load(self.wav)
+            manager.load(self.wav)
+        self.assertEqual(mock_read.call_count, 1)
+
+    def test_lru_evicts_by_size(self):
+        manager = PlaybackManager(cache_bytes=4000)
+        other = os.path.join(self.test_dir, "b.wav")
+        shutil.copy(self.wav, other)
+        manager.load(self.wav)
+        manager.load(other)
+        self.assertEqual(list(manager._cache), [os.path.abspath(other)])
+
+    def test_play_is_non_blocking_and_finishes(self):
+        manager = PlaybackManager()
+        manager.load(self.wav)
+        manager.play(self.wav)
+        self.assertTrue(manager.is_playing())
+        stream = FakeOutputStream.instances[0]
+        first = stream.pull(600)
+        self.assertTrue(np.allclose(first, 0.5, atol=1e-3))
+        rest = stream.pull(600)
+        self.assertTrue(np.allclose(rest[:400], 0.5, atol=1e-3))
+        self.assertTrue(np.all(rest[400:] == 0))
+        self.assertTrue(manager.wait(0))
+
+    def test_new_clip_cancels_current(self):
+        manager = PlaybackManager()
+        manager.play_samples(np.ones(1000), 16000)
+        stream = FakeOutputStream.instances[0]
+        stream.pull(100)
+        manager.play_samples(np.full(50, 0.25), 16000)
+        out = stream.pull(100)
+        self.assertTrue(np.allclose(out[:50], 0.25))
+        self.assertTrue(np.all(out[50:] == 0))
+
+    def test_queue_plays_after_current(self):
+        manager = PlaybackManager()
+        manager.load(self.wav)
+        manager.play_samples(np.ones(100), 16000)
+        manager.queue(self.wav)
+        out = FakeOutputStream.instances[0].pull(1100)
+        self.assertTrue(np.all(out[:100] == 1.0))
+        self.assertTrue(np.allclose(out[100:], 0.5, atol=1e-3))
+
+    def test_stop(self):
+        manager = PlaybackManager()
+        manager.play_samples(np.ones(1000), 16000)
+        manager.stop()
+        self.assertFalse(manager.is_playing())
+        self.assertTrue(np.all(FakeOutputStream.instances[0].pull(10) == 0))
+
+    def test_samplerate_change_reopens_stream(self):
+        manager = PlaybackManager()
+        manager.play_samples(np.ones(10), 16000)
+        manager.play_samples(np.ones(10), 22050)
+        self.assertEqual(len(FakeOutputStream.instances), 2)
+        self.assertTrue(FakeOutputStream.instances[0].closed)
+
+    def test_device_failure_goes_to_on_error(self):
+        manager = PlaybackManager()
+        manager.load(self.wav)
+        errors = []
+        with patch.object(playback.sd, "OutputStream", side_effect=RuntimeError("no device")):
+            manager.play(self.wav, on_error=errors.append)
+            self.assertEqual([str(e) for e in errors], ["no device"])
+            self.assertFalse(manager.is_playing())
+            with self.assertRaises(RuntimeError):
+                manager.play_samples(np.ones(10), 16000)
+        self.assertFalse(manager.is_playing())
+
+    def test_resample_linear(self):
+        out = resample_linear(np.ones(100, dtype=np.float32), 16000, 32000)
+        self.assertEqual(len(out), 200)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import sys
+import os
+import threading
+import time
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.prefetch import PrefetchPool, PrefetchRequest
+
+class FakeBackend:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.generated = []
+        self.cached = set()
+        self.started = threading.Event()
+
+    def is_cached(self, text, online, voice_id, online_voice):
+        return text in self.cached
+
+    def get_ipa(self, text):
+        return text
+
+    def generate_audio(self, text, online=False, voice_id=None, online_voice=None):
+        self.started.set()
+        time.sleep(self.delay)
+        self.generated.append(text)
+        self.cached.add(text)
+        return text
+
+class TestPrefetchPool(unittest.TestCase):
+    def test_groups_run_in_priority_order(self):
+        backend = FakeBackend()
+        pool = PrefetchPool(backend, ["suggestion", "history"], cpu_budget=1.0)
+        pool.suspend()
+        pool.set_targets("history", [PrefetchRequest("Eins"), PrefetchRequest("Zwei")])
+        pool.set_targets("suggestion", [PrefetchRequest("Hallo")])
+        pool.resume()
+
+        self.assertTrue(pool.wait_idle(5))
+        self.assertEqual(backend.generated, ["Hallo", "Eins", "Zwei"])
+        pool.shutdown()
+
+    def test_replacing_targets_cancels_pending_work(self):
+        backend = FakeBackend(delay=0.2)
+        pool = PrefetchPool(backend, ["suggestion"], cpu_budget=1.0)
+        pool.set_targets("suggestion", [PrefetchRequest("A"), PrefetchRequest("B")])
+        backend.started.wait(5)
+        # The user moved on: B is no longer relevant
+        pool.set_targets("suggestion", [PrefetchRequest("C")])
+
+        self.assertTrue(pool.wait_idle(5))
+        self.assertEqual(backend.generated, ["A", "C"])
+        pool.shutdown()
+
+    def test_cached_requests_and_zero_budget_are_skipped(self):
+        backend = FakeBackend()
+        backend.cached.add("Hallo")
+        pool = PrefetchPool(backend, ["history"], cpu_budget=1.0)
+        pool.set_targets("history", [PrefetchRequest("Hallo")])
+        self.assertTrue(pool.wait_idle(5))
+        self.assertEqual(backend.generated, [])
+
+        disabled = PrefetchPool(backend, ["history"], cpu_budget=0)
+        disabled.set_targets("history", [PrefetchRequest("Neu")])
+        self.assertEqual(disabled.pending(), [])
+
+    def test_online_requests_need_opt_in(self):
+        backend = FakeBackend()
+        pool = PrefetchPool(backend, ["suggestion"], cpu_budget=1.0)
+        pool.suspend()
+        pool.set_targets("suggestion", [PrefetchRequest("Hallo", True, None, "de"), PrefetchRequest("Welt")])
+        self.assertEqual(pool.pending(), [PrefetchRequest("Welt")])
+        pool.shutdown()
+
+        online = PrefetchPool(backend, ["suggestion"], cpu_budget=1.0, allow_online=True)
+        online.suspend()
+        online.set_targets("suggestion", [PrefetchRequest("Hallo", True, None, "de")])
+        self.assertEqual(online.pending(), [PrefetchRequest("Hallo", True, None, "de")])
+        online.shutdown()
+
+if __name__ == "__main__":
+    unittest.main()
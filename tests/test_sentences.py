@@ -0,0 +1,27 @@
+import sys
+import os
+import unittest
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.sentences import split_sentences
+
+class TestSplitSentences(unittest.TestCase):
+    def test_basic_split(self):
+        self.assertEqual(split_sentences("Guten Tag. Wie geht es dir? Gut!"),
+                         ["Guten Tag.", "Wie geht es dir?", "Gut!"])
+
+    def test_single_sentence(self):
+        self.assertEqual(split_sentences("Hallo Welt"), ["Hallo Welt"])
+        self.assertEqual(split_sentences("   "), [])
+
+    def test_abbreviations_and_ordinals(self):
+        self.assertEqual(split_sentences("Wir kommen z.B. am 3. Mai. Dann gehen wir."),
+                         ["Wir kommen z.B. am 3. Mai.", "Dann gehen wir."])
+
+    def test_newlines_separate_sentences(self):
+        self.assertEqual(split_sentences("Erste Zeile\nZweite Zeile"), ["Erste Zeile", "Zweite Zeile"])
+
+if __name__ == "__main__":
+    unittest.main()
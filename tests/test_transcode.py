@@ -0,0 +1,67 @@
+import sys
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+import soundfile as sf
+
+# Add src to path
+sys.path.append(os.path.join(os.getcwd(), "src"))
+
+from aussprachetrainer.database import HistoryManager
+from aussprachetrainer.transcode import AudioTranscoder, migrate_history_audio, transcode_file
+
+class TestTranscode(unittest.TestCase):
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.db = HistoryManager(db_path=os.path.join(self.test_dir, "history.db"))
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir)
+
+    def _write_wav(self, name):
+        t = np.arange(22050) / 22050.0
+        samples = (0.3 * np.sin(2 * np.pi * 220 * t) * 32767).astype(np.int16)
+        path = os.path.join(self.test_dir, name)
+        sf.write(path, samples, 22050, subtype="PCM_16")
+        return path, samples
+
+    def test_flac_is_lossless_and_smaller(self):
+        wav, samples = self._write_wav("a.wav")
+        flac = transcode_file(wav)
+
+        self.assertTrue(flac.endswith("a.flac"))
+        self.assertLess(os.path.getsize(flac), os.path.getsize(wav))
+        decoded, sr = sf.read(flac, dtype="int16")
+        self.assertEqual(sr, 22050)
+        np.testing.assert_array_equal(decoded, samples)
+
+    def test_background_transcoder_reports_result(self):
+        wav, _ = self._write_wav("b.wav")
+        done = []
+        transcoder = AudioTranscoder(lambda old, new: done.append((old, new)))
+        transcoder.submit(wav)
+        transcoder.submit(os.path.join(self.test_dir, "skip.mp3"))
+        transcoder.join()
+        transcoder.shutdown()
+
+        self.assertEqual(done, [(wav, os.path.join(self.test_dir, "b.flac"))])
+
+    def test_migration_updates_history(self):
+        wav, _ = self._write_wav("c.wav")
+        self.db.add_entry("Eins", "IPA", wav, "Offline", "de")
+        self.db.add_entry("Zwei", "IPA", wav, "Offline", "de")
+
+        converted, saved = migrate_history_audio(self.db)
+
+        flac = os.path.join(self.test_dir, "c.flac")
+        self.assertEqual(converted, 1)
+        self.assertGreater(saved, 0)
+        self.assertFalse(os.path.exists(wav))
+        self.assertEqual({h["audio_path"] for h in self.db.get_history()}, {flac})
+        self.assertEqual(self.db.audio_refcount(flac), 2)
+
+if __name__ == "__main__":
+    unittest.main()